@@ -0,0 +1,80 @@
+"""
+Micro-benchmark of camelize_dict on a large create_scene payload.
+
+Run from the repository root:
+    python -m benchmarks.bench_camelize_dict
+"""
+import functools
+import re
+import timeit
+from typing import Any, Dict, List, Union
+
+from src.dirigera.hub.utils import camelize_dict
+
+
+def legacy_camelize_dict(
+    data: Union[Dict[str, Any], List[Any]]
+) -> Union[Dict[str, Any], List[Any]]:
+    """
+    The recursive implementation camelize_dict replaced, kept for comparison
+    """
+    camelize = functools.partial(re.sub, r"_([a-z])", lambda m: m.group(1).upper())
+
+    if isinstance(data, list):
+        return [legacy_camelize_dict(i) if isinstance(i, (dict, list)) else i for i in data]
+    return {
+        camelize(a): legacy_camelize_dict(b) if isinstance(b, (dict, list)) else b
+        for a, b in data.items()
+    }
+
+
+def scene_payload(actions: int) -> Dict[str, Any]:
+    """
+    Payload in the shape create_scene sends, before camelizing
+    """
+    return {
+        "info": {"name": "Evening", "icon": "scenes_moon"},
+        "type": "userScene",
+        "triggers": [
+            {
+                "type": "time",
+                "disabled": False,
+                "trigger": {"days": ["Mon", "Tue", "Wed"], "time": "20:00"},
+                "end_trigger_event": {
+                    "type": "time",
+                    "trigger": {"days": ["Mon"], "time": "23:00", "offset": 0},
+                },
+            }
+        ],
+        "actions": [
+            {
+                "id": f"device-{i}",
+                "type": "device",
+                "enabled": True,
+                "attributes": {
+                    "is_on": True,
+                    "light_level": i % 100 + 1,
+                    "color_temperature": 2700,
+                    "color_hue": 120.0,
+                    "color_saturation": 0.5,
+                },
+            }
+            for i in range(actions)
+        ],
+    }
+
+
+def main() -> None:
+    payload = scene_payload(actions=1000)
+    assert camelize_dict(payload) == legacy_camelize_dict(payload)
+    number = 50
+    legacy = min(timeit.repeat(lambda: legacy_camelize_dict(payload), number=number, repeat=5))
+    current = min(timeit.repeat(lambda: camelize_dict(payload), number=number, repeat=5))
+    print(f"camelize_dict, create_scene payload with 1000 actions, {number} runs")
+    print(f"  legacy recursive: {legacy / number * 1000:8.3f} ms/call")
+    print(f"  current:          {current / number * 1000:8.3f} ms/call")
+    print(f"  speedup:          {legacy / current:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
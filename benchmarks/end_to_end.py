@@ -0,0 +1,122 @@
+"""
+The real Hub against the local hub simulator, over HTTPS and WSS.
+
+    python -m benchmarks.end_to_end                          # 1000 devices, no added latency
+    python -m benchmarks.end_to_end --size 200 --latency 0.02 --error-rate 0.01 --max-connections 4
+
+Unlike benchmarks.run this includes TLS, HTTP and the websocket, so the numbers depend on the machine
+and are only comparable between runs on the same one. The Hub retries injected errors and rejected
+connections with its default RetryPolicy, the requests that still fail are left out of the timings.
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from src.dirigera.devices.outlet import Outlet
+from src.dirigera.hub.events import EventType
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.simulator import HubSimulator
+
+from .fleet import generate_fleet, generate_scenes
+from .run import measure
+
+
+def report(name: str, timings: List[float], ops: int) -> Dict[str, float]:
+    per_op = statistics.median(timings) / ops
+    print(name.ljust(28), f"{per_op * 1e6:12.2f} us/op", f"{len(timings):6d} runs", flush=True)
+    return {"per_op_us": per_op * 1e6, "ops_per_s": 1 / per_op, "runs": len(timings)}
+
+
+def bench_patches(outlets: List[Outlet], workers: int) -> Callable[[], Any]:
+    def toggle(outlet: Outlet) -> None:
+        try:
+            outlet.set_on(not outlet.attributes.is_on)
+        except requests.HTTPError:
+            pass  # counted by the simulator
+
+    def patch_all() -> None:
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(toggle, outlets))
+
+    return patch_all
+
+
+def event_latency(hub: Hub, outlets: List[Outlet]) -> List[float]:
+    """
+    Seconds from sending each PATCH to the deviceStateChanged event being dispatched by the Hub
+    """
+    received = threading.Event()
+    hub.events.subscribe(lambda event: received.set(), event_type=EventType.DEVICE_STATE_CHANGED)
+    timings = []
+    for outlet in outlets:
+        received.clear()
+        started = time.perf_counter()
+        try:
+            outlet.set_on(not outlet.attributes.is_on)
+        except requests.HTTPError:
+            continue
+        if received.wait(timeout=5):
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run(simulator: HubSimulator, min_time: float, workers: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    hub = simulator.create_hub(pool_maxsize=workers)
+    hub.enable_retries()
+    results["get_all_devices"] = report("get_all_devices", measure(hub.get_all_devices, min_time, 5), 1)
+    results["get_scenes"] = report("get_scenes", measure(hub.get_scenes, min_time, 5), 1)
+    outlets = hub.get_outlets()[:100]
+    if outlets:
+        timings = measure(bench_patches(outlets, workers), min_time, 3)
+        results["patch_outlets"] = report(f"patch_outlets[{workers} workers]", timings, len(outlets))
+        hub.start_event_listener()
+        deadline = time.monotonic() + 5
+        while not simulator.listeners and time.monotonic() < deadline:
+            time.sleep(0.01)
+        timings = event_latency(hub, outlets[:20])
+        if timings:
+            results["event_latency"] = report("event_latency", timings, 1)
+        else:
+            print("event_latency".ljust(28), "no events received, is the websocket over max_connections?")
+        hub.stop_event_listener()
+    hub.close()
+    print(
+        f"requests {simulator.stats.requests}, injected errors {simulator.stats.injected_errors}, "
+        f"rejected connections {simulator.stats.rejected_connections}, events {simulator.stats.events}"
+    )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4, help="threads sending PATCH requests")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per benchmark")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-connections", type=int)
+    args = parser.parse_args(argv)
+    fleet = generate_fleet(args.size)
+    with HubSimulator(
+        fleet,
+        generate_scenes(fleet, max(1, args.size // 50)),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        max_connections=args.max_connections,
+        seed=0,
+    ) as simulator:
+        run(simulator, args.min_time, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
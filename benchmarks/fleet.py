@@ -0,0 +1,218 @@
+"""
+Synthetic fleets of hub payloads and a Hub that serves them from memory through FakeDirigeraHub.
+"""
+import datetime
+import itertools
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.dirigera.hub.abstract_smart_home_hub import FakeDirigeraHub
+from src.dirigera.hub.hub import Hub
+
+NAME_CAPABILITIES = ["customName"]
+
+# type, deviceType, share of the fleet, capabilities.canReceive, attributes
+DEVICE_KINDS: List[Tuple[str, str, float, List[str], Dict[str, Any]]] = [
+    (
+        "light",
+        "light",
+        0.38,
+        ["isOn", "lightLevel", "colorTemperature", "colorHue", "colorSaturation"],
+        {
+            "isOn": True,
+            "startupOnOff": "startPrevious",
+            "lightLevel": 80,
+            "colorTemperature": 2700,
+            "colorTemperatureMin": 4000,
+            "colorTemperatureMax": 2202,
+            "colorHue": 30.0,
+            "colorSaturation": 0.5,
+        },
+    ),
+    (
+        "outlet",
+        "outlet",
+        0.1,
+        ["isOn"],
+        {
+            "isOn": False,
+            "startupOnOff": "startOn",
+            "statusLight": True,
+            "currentActivePower": 12.5,
+            "currentAmps": 0.05,
+            "currentVoltage": 231.0,
+            "totalEnergyConsumed": 4.2,
+            "totalEnergyConsumedLastUpdated": "2023-10-28T04:42:14.000Z",
+        },
+    ),
+    (
+        "blinds",
+        "blinds",
+        0.08,
+        ["blindsTargetLevel", "blindsState"],
+        {"blindsCurrentLevel": 0, "blindsTargetLevel": 0, "blindsState": "stopped", "batteryPercentage": 88},
+    ),
+    (
+        "controller",
+        "lightController",
+        0.12,
+        [],
+        {"isOn": False, "batteryPercentage": 70, "switchLabel": "On/Off"},
+    ),
+    ("sensor", "motionSensor", 0.06, [], {"isOn": True, "batteryPercentage": 90, "isDetected": False}),
+    ("sensor", "openCloseSensor", 0.06, [], {"isOpen": False, "batteryPercentage": 95}),
+    (
+        "sensor",
+        "environmentSensor",
+        0.04,
+        [],
+        {
+            "currentTemperature": 21.4,
+            "currentRH": 45,
+            "currentPM25": 3,
+            "maxMeasuredPM25": 999,
+            "minMeasuredPM25": 0,
+            "vocIndex": 102,
+        },
+    ),
+    ("sensor", "waterSensor", 0.03, [], {"batteryPercentage": 100, "waterLeakDetected": False}),
+    ("sensor", "lightSensor", 0.02, [], {"batteryPercentage": 100, "illuminance": 300}),
+    ("sensor", "occupancySensor", 0.03, [], {"batteryPercentage": 100, "isDetected": True}),
+    (
+        "airPurifier",
+        "airPurifier",
+        0.02,
+        ["fanMode", "motorState", "childLock", "statusLight"],
+        {
+            "fanMode": "auto",
+            "fanModeSequence": "lowMediumHighAuto",
+            "motorState": 10,
+            "childLock": False,
+            "statusLight": True,
+            "motorRuntime": 300,
+            "filterAlarmStatus": False,
+            "filterElapsedTime": 1000,
+            "filterLifetime": 259200,
+            "currentPM25": 4,
+        },
+    ),
+    ("speaker", "speaker", 0.06, ["playback", "volume"], {"playback": "playbackIdle", "volume": 20}),
+]
+
+
+def device_payload(index: int, kind: Tuple[str, str, float, List[str], Dict[str, Any]], room: int) -> Dict[str, Any]:
+    type_, device_type, _, can_receive, attributes = kind
+    return {
+        "id": f"{device_type}-{index:05d}-0000-4eeb-99c2-5c4f2d6e8f10_1",
+        "type": type_,
+        "deviceType": device_type,
+        "createdAt": "2023-01-07T20:07:19.000Z",
+        "isReachable": True,
+        "lastSeen": "2023-10-28T04:42:14.000Z",
+        "attributes": {
+            "customName": f"{device_type} {index}",
+            "model": f"{device_type.upper()} model",
+            "manufacturer": "IKEA of Sweden",
+            "firmwareVersion": "2.3.087",
+            "hardwareVersion": "1",
+            "serialNumber": f"{index:016X}",
+            "productCode": "LED2003G10",
+            "otaStatus": "upToDate",
+            "otaState": "readyToCheck",
+            "otaProgress": 0,
+            "otaPolicy": "autoUpdate",
+            "otaScheduleStart": "00:00",
+            "otaScheduleEnd": "00:00",
+            **attributes,
+        },
+        "capabilities": {"canSend": [], "canReceive": NAME_CAPABILITIES + can_receive},
+        "room": {"id": f"room-{room}", "name": f"Room {room}", "color": "ikea_green_no_65", "icon": "rooms_sofa"},
+        "deviceSet": [],
+        "remoteLinks": [],
+        "isHidden": False,
+    }
+
+
+def generate_fleet(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Payload of GET /devices for a fleet of size devices. Every kind is present (for sizes >= the number of kinds),
+    the rest is drawn with the shares of DEVICE_KINDS. The same size and seed always give the same fleet.
+    """
+    rng = random.Random(seed)
+    kinds = DEVICE_KINDS[:size] + rng.choices(
+        DEVICE_KINDS, weights=[kind[2] for kind in DEVICE_KINDS], k=max(0, size - len(DEVICE_KINDS))
+    )
+    rooms = max(1, size // 8)
+    return [device_payload(index, kind, rng.randrange(rooms)) for index, kind in enumerate(kinds)]
+
+
+def scene_payload(id_: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": id_,
+        "createdAt": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commands": [],
+        "undoAllowedDuration": 30,
+        **data,
+    }
+
+
+def generate_scenes(fleet: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    lights = [device["id"] for device in fleet if device["type"] == "light"]
+    return [
+        scene_payload(
+            f"scene-{index}",
+            {
+                "type": "userScene",
+                "info": {"name": f"Scene {index}", "icon": "scenes_moon"},
+                "triggers": [{"id": f"trigger-{index}", "type": "app", "disabled": False}],
+                "actions": [
+                    {"id": id_, "type": "device", "enabled": True, "attributes": {"isOn": True}}
+                    for id_ in lights[index : index + 5]
+                ],
+            },
+        )
+        for index in range(count)
+    ]
+
+
+class FleetHub(Hub):
+    """
+    Hub whose requests are answered by a FakeDirigeraHub holding a synthetic fleet, so the benchmarks measure
+    the library and not the network
+    """
+
+    def __init__(self, fleet: List[Dict[str, Any]], scenes: Optional[List[Dict[str, Any]]] = None) -> None:
+        super().__init__(token="token", ip_address="127.0.0.1")
+        self.fake = FakeDirigeraHub()
+        self._scene_ids = itertools.count(len(scenes or []))
+        replies = self.fake.get_action_replys
+        replies["/devices"] = fleet
+        replies.update({f"/devices/{device['id']}": device for device in fleet})
+        replies["/scenes"] = list(scenes or [])
+        replies.update({f"/scenes/{scene['id']}": scene for scene in scenes or []})
+
+    def get(self, route: str) -> Any:
+        return self.fake.get(route)
+
+    def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
+        return self.fake.patch(route, data)
+
+    def post(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        self.fake.post(route, data)
+        if route == "/scenes/" and data is not None:
+            scene = scene_payload(f"scene-{next(self._scene_ids)}", data)
+            self.fake.get_action_replys[f"/scenes/{scene['id']}"] = scene
+            return {"id": scene["id"]}
+        return None
+
+    def delete(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        return self.fake.delete(route, data)
+
+    def reset(self) -> None:
+        """
+        Forgets the recorded requests, called between benchmark runs to keep memory flat
+        """
+        self.fake.patch_actions.clear()
+        self.fake.post_actions.clear()
+        self.fake.get_actions.clear()
+        self.fake.delete_actions.clear()
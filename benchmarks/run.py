@@ -0,0 +1,221 @@
+"""
+Benchmarks of the hot paths on synthetic fleets.
+
+    python -m benchmarks.run                               # all benchmarks for 10, 1k and 10k devices
+    python -m benchmarks.run --sizes 10 1000 --output head.json
+    python -m benchmarks.run --compare base.json --tolerance 0.2
+
+Results are the median time per operation, saved as JSON to compare commits on the same machine:
+with --compare the run fails if any benchmark got slower than the baseline by more than the tolerance.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.dirigera.devices.device_factory import dict_to_device, parse_devices
+from src.dirigera.devices.light import Light
+from src.dirigera.devices.outlet import Outlet
+from src.dirigera.devices.scene import Action, ActionAttributes, Info, Trigger
+from src.dirigera.hub.device_registry import DeviceRegistry
+from src.dirigera.hub.utils import camelize_dict
+
+from .fleet import FleetHub, generate_fleet, generate_scenes
+
+DEFAULT_SIZES = [10, 1000, 10000]
+
+# A benchmark prepares its state for a fleet and returns the function to time and the operations per call
+Benchmark = Callable[[FleetHub], Tuple[Callable[[], Any], int]]
+
+
+def bench_parse_devices(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    payload = hub.fake.get_action_replys["/devices"]
+    return lambda: parse_devices(payload, hub), len(payload)
+
+
+def bench_dict_to_device(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    payload = hub.fake.get_action_replys["/devices"]
+    return lambda: [dict_to_device(device, hub) for device in payload], len(payload)
+
+
+def bench_get_lights(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    return hub.get_lights, 1
+
+
+def bench_get_light_by_name(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    name = hub.get_lights()[-1].attributes.custom_name
+    return lambda: hub.get_light_by_name(name), 1
+
+
+def bench_registry_lookup(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    registry = DeviceRegistry(hub.get_all_devices())
+    names = [device.attributes.custom_name for device in registry.all()]
+    lookups = random.Random(0).choices(names, k=1000)
+
+    def lookup() -> None:
+        for name in lookups:
+            registry.by_name(name)
+
+    return lookup, len(lookups)
+
+
+def bench_setters(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    devices = hub.get_all_devices()
+    lights = [device for device in devices if isinstance(device, Light)][:500]
+    outlets = [device for device in devices if isinstance(device, Outlet)][:500]
+
+    def set_all() -> None:
+        hub.reset()
+        for level, light in enumerate(lights):
+            light.set_light_level(level % 100 + 1)
+        for outlet in outlets:
+            outlet.set_on(not outlet.attributes.is_on)
+
+    return set_all, len(lights) + len(outlets)
+
+
+def bench_camelize_dict(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    snake = [device.model_dump(mode="json", exclude={"dirigera_client"}) for device in hub.get_all_devices()[:1000]]
+    return lambda: [camelize_dict(device) for device in snake], len(snake)
+
+
+def bench_create_scene(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    lights = hub.get_lights()[:20]
+    info = Info(name="Benchmark", icon="scenes_moon")
+    triggers = [Trigger(type="app", disabled=False)]
+    actions = [
+        Action(id=light.id, type="device", enabled=True, attributes=ActionAttributes(is_on=True)) for light in lights
+    ]
+
+    def create() -> None:
+        hub.reset()
+        hub.create_scene(info, triggers=triggers, actions=actions)
+
+    return create, 1
+
+
+def bench_event_dispatch(hub: FleetHub) -> Tuple[Callable[[], Any], int]:
+    hub.enable_device_cache(max_age=None)
+    hub.enable_device_registry()
+    hub.events.subscribe(lambda event: None, event_type=None)
+    devices = hub.fake.get_action_replys["/devices"]
+    rng = random.Random(0)
+    messages = [
+        json.dumps(
+            {
+                "id": f"event-{index}",
+                "type": "deviceStateChanged",
+                "time": "2023-10-28T04:42:14.000Z",
+                "specversion": "1.1.0",
+                "source": "urn:com:ikea:homesmart:iotc:zigbee",
+                "data": {"id": device["id"], "attributes": {"customName": f"renamed {index}"}},
+            }
+        )
+        for index, device in enumerate(rng.choices(devices, k=1000))
+    ]
+
+    def dispatch() -> None:
+        for message in messages:
+            hub._handle_message(message)  # pylint: disable=protected-access
+
+    return dispatch, len(messages)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "parse_devices": bench_parse_devices,
+    "dict_to_device": bench_dict_to_device,
+    "get_lights": bench_get_lights,
+    "get_light_by_name": bench_get_light_by_name,
+    "registry_lookup": bench_registry_lookup,
+    "setters": bench_setters,
+    "camelize_dict": bench_camelize_dict,
+    "create_scene": bench_create_scene,
+    "event_dispatch": bench_event_dispatch,
+}
+
+
+def measure(fn: Callable[[], Any], min_time: float, min_runs: int, max_runs: int = 1000) -> List[float]:
+    """
+    Runs fn once to warm up, then until min_time has passed and at least min_runs timings were taken
+    """
+    fn()
+    timings: List[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def run(
+    sizes: List[int], names: List[str], min_time: float = 0.5, min_runs: int = 5
+) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        fleet = generate_fleet(size)
+        scenes = generate_scenes(fleet, max(1, size // 50))
+        for name in names:
+            fn, ops = BENCHMARKS[name](FleetHub(fleet, scenes))
+            timings = measure(fn, min_time, min_runs)
+            per_op = statistics.median(timings) / ops
+            results[f"{name}[{size}]"] = {"per_op_us": per_op * 1e6, "ops_per_s": 1 / per_op, "runs": len(timings)}
+            print(f"{name}[{size}]".ljust(28), f"{per_op * 1e6:12.2f} us/op", f"{len(timings):6d} runs", flush=True)
+    return results
+
+
+def metadata() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {"commit": commit, "python": platform.python_version(), "machine": platform.platform()}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Returns the benchmarks that are slower than the baseline by more than tolerance
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            continue
+        ratio = result["per_op_us"] / base["per_op_us"]
+        marker = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(key.ljust(28), f"{ratio:6.2f}x baseline", marker)
+        if marker:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark and size")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", help="JSON results of a baseline run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+    results = run(args.sizes, args.only, min_time=args.min_time)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"meta": metadata(), "results": results}, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
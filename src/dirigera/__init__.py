@@ -1 +1,20 @@
-from .hub.hub import Hub
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .hub.hub import Hub
+    from .hub.async_hub import AsyncHub
+
+__all__ = ["Hub", "AsyncHub"]
+
+
+def __getattr__(name: str) -> Any:
+    # Hub and AsyncHub are imported on first access, a script using Hub never loads aiohttp
+    if name == "Hub":
+        from .hub.hub import Hub  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        return Hub
+    if name == "AsyncHub":
+        from .hub.async_hub import AsyncHub  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+        return AsyncHub
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
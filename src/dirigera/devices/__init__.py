@@ -0,0 +1,40 @@
+"""
+Device models, each device module is imported on first access of one of its names,
+so a script that only uses outlets never builds the light or sensor models.
+"""
+import importlib
+from typing import Any, Dict, List
+
+_MODULES: Dict[str, List[str]] = {
+    "air_purifier": ["AirPurifier", "dict_to_air_purifier"],
+    "blinds": ["Blind", "dict_to_blind"],
+    "controller": ["Controller", "dict_to_controller"],
+    "device_factory": ["dict_to_device", "parse_devices", "parse_devices_as"],
+    "environment_sensor": ["EnvironmentSensor", "dict_to_environment_sensor"],
+    "lazy_device": ["LazyDevice", "dict_to_lazy_device"],
+    "light": ["Light", "dict_to_light"],
+    "light_sensor": ["LightSensor", "dict_to_light_sensor"],
+    "motion_sensor": ["MotionSensor", "dict_to_motion_sensor"],
+    "occupancy_sensor": ["OccupancySensor", "dict_to_occupancy_sensor"],
+    "open_close_sensor": ["OpenCloseSensor", "dict_to_open_close_sensor"],
+    "outlet": ["Outlet", "dict_to_outlet"],
+    "scene": ["Action", "Info", "Scene", "SceneType", "Trigger", "dict_to_scene"],
+    "water_sensor": ["WaterSensor", "dict_to_water_sensor"],
+}
+
+_LAZY_NAMES: Dict[str, str] = {name: module for module, names in _MODULES.items() for name in names}
+
+__all__ = sorted(_LAZY_NAMES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_LAZY_NAMES])
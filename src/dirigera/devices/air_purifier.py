@@ -34,18 +34,26 @@ class AirPurifier(Device):
         data = self.dirigera_client.get(route=f"/devices/{self.id}")
         return AirPurifier(dirigeraClient=self.dirigera_client, **data)
 
+    async def async_reload(self) -> AirPurifier:
+        data = await self.dirigera_client.get(route=f"/devices/{self.id}")
+        return AirPurifier(dirigeraClient=self.dirigera_client, **data)
+
     def set_name(self, name: str) -> None:
+        self._patch_attributes(self._name_attributes(name))
+
+    async def async_set_name(self, name: str) -> None:
+        await self._async_patch_attributes(self._name_attributes(name))
+
+    def _name_attributes(self, name: str) -> Dict[str, Any]:
         if "customName" not in self.capabilities.can_receive:
             raise AssertionError("This airpurifier does not support the set_name function")
-
-        data = [{"attributes": {"customName": name}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.custom_name = name
+        return {"customName": name}
 
     def set_fan_mode(self, fan_mode: FanModeEnum) -> None:
-        data = [{"attributes": {"fanMode": fan_mode.value}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.fan_mode = fan_mode
+        self._patch_attributes({"fanMode": fan_mode.value})
+
+    async def async_set_fan_mode(self, fan_mode: FanModeEnum) -> None:
+        await self._async_patch_attributes({"fanMode": fan_mode.value})
 
     def set_motor_state(self, motor_state: int) -> None:
         """
@@ -54,26 +62,33 @@ class AirPurifier(Device):
         0 == off
         1 == auto
         """
+        self._patch_attributes(self._motor_state_attributes(motor_state))
+
+    async def async_set_motor_state(self, motor_state: int) -> None:
+        await self._async_patch_attributes(self._motor_state_attributes(motor_state))
+
+    def _motor_state_attributes(self, motor_state: int) -> Dict[str, Any]:
         desired_motor_state = int(motor_state)
         if desired_motor_state < 0 or desired_motor_state > 50:
             raise ValueError("Motor state must be a value between 0 and 50")
-
-        data = [{"attributes": {"motorState": desired_motor_state}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.motor_state = desired_motor_state
+        return {"motorState": desired_motor_state}
 
     def set_child_lock(self, child_lock: bool) -> None:
+        self._patch_attributes(self._child_lock_attributes(child_lock))
+
+    async def async_set_child_lock(self, child_lock: bool) -> None:
+        await self._async_patch_attributes(self._child_lock_attributes(child_lock))
+
+    def _child_lock_attributes(self, child_lock: bool) -> Dict[str, Any]:
         if "childLock" not in self.capabilities.can_receive:
             raise AssertionError("This air-purifier does not support the child lock function")
-
-        data = [{"attributes": {"childLock": child_lock}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.child_lock = child_lock
+        return {"childLock": child_lock}
 
     def set_status_light(self, light_state: bool) -> None:
-        data = [{"attributes": {"statusLight": light_state}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.status_light = light_state
+        self._patch_attributes({"statusLight": light_state})
+
+    async def async_set_status_light(self, light_state: bool) -> None:
+        await self._async_patch_attributes({"statusLight": light_state})
 
 def dict_to_air_purifier(data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> AirPurifier:
     return AirPurifier(
@@ -1,3 +1,6 @@
+import functools
+from typing import Any, Collection, Dict, Set, Type
+
 from pydantic import BaseModel
 
 
@@ -6,5 +9,33 @@ def to_camel(string: str) -> str:
     return string_split[0] + "".join(word.capitalize() for word in string_split[1:])
 
 
+@functools.lru_cache(maxsize=None)
+def _field_names_by_alias(model: Type[BaseModel]) -> Dict[str, str]:
+    return {field.alias or name: name for name, field in model.model_fields.items()}
+
+
 class BaseIkeaModel(BaseModel, arbitrary_types_allowed=True, alias_generator=to_camel):
-    pass
+    def apply_changes(self, data: Dict[str, Any], exclude: Collection[str] = ()) -> Set[str]:
+        """
+        Assigns the camelCase values of a hub payload to the fields of this instance and returns the names
+        of the fields that changed. Values equal to the current one are not validated again, nested models
+        are updated in place the same way. Unknown keys and the excluded field names are ignored.
+        """
+        names = _field_names_by_alias(type(self))
+        validator = type(self).__pydantic_validator__
+        changed = set()
+        for key, value in data.items():
+            name = names.get(key)
+            if name is None or name in exclude:
+                continue
+            current = getattr(self, name)
+            if value == current:
+                continue
+            if isinstance(current, BaseIkeaModel) and isinstance(value, dict):
+                if current.apply_changes(value):
+                    changed.add(name)
+                continue
+            validator.validate_assignment(self, name, value)
+            if getattr(self, name) != current:
+                changed.add(name)
+        return changed
@@ -19,15 +19,28 @@ class Blind(Device):
         data = self.dirigera_client.get(route=f"/devices/{self.id}")
         return Blind(dirigeraClient=self.dirigera_client, **data)
 
+    async def async_reload(self) -> Blind:
+        data = await self.dirigera_client.get(route=f"/devices/{self.id}")
+        return Blind(dirigeraClient=self.dirigera_client, **data)
+
     def set_name(self, name: str) -> None:
+        self._patch_attributes(self._name_attributes(name))
+
+    async def async_set_name(self, name: str) -> None:
+        await self._async_patch_attributes(self._name_attributes(name))
+
+    def _name_attributes(self, name: str) -> Dict[str, Any]:
         if "customName" not in self.capabilities.can_receive:
             raise AssertionError("This blind does not support the customName function")
-
-        data = [{"attributes": {"customName": name}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.custom_name = name
+        return {"customName": name}
 
     def set_target_level(self, target_level: int) -> None:
+        self._patch_attributes(self._target_level_attributes(target_level))
+
+    async def async_set_target_level(self, target_level: int) -> None:
+        await self._async_patch_attributes(self._target_level_attributes(target_level))
+
+    def _target_level_attributes(self, target_level: int) -> Dict[str, Any]:
         if "blindsTargetLevel" not in self.capabilities.can_receive:
             raise AssertionError(
                 "This blind does not support the target level function"
@@ -35,10 +48,7 @@ class Blind(Device):
 
         if target_level < 0 or target_level > 100:
             raise AssertionError("target_level must be a value between 0 and 100")
-
-        data = [{"attributes": {"blindsTargetLevel": target_level}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.blinds_target_level = target_level
+        return {"blindsTargetLevel": target_level}
 
 
 def dict_to_blind(data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> Blind:
@@ -1,8 +1,11 @@
 from __future__ import annotations
 import datetime
+import functools
+from concurrent.futures import Future
 from enum import Enum
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Generic, Optional, List, Set, TypeVar
 from .base_ikea_model import BaseIkeaModel
+from ..hub.abstract_smart_home_hub import AbstractAsyncSmartHomeHub, AbstractSmartHomeHub
 
 
 class StartupEnum(Enum):
@@ -40,7 +43,42 @@ class Room(BaseIkeaModel):
     icon: str
 
 
+DeviceT = TypeVar("DeviceT", bound="Device")
+
+
+class AttributeBatch(Generic[DeviceT]):
+    """
+    Collects the attribute changes of the device setters called inside the block and sends them as one PATCH
+    when the block is left without an error. The local model is only updated once that PATCH succeeded.
+    """
+
+    # pylint: disable=protected-access
+
+    def __init__(self, device: DeviceT) -> None:
+        self.device = device
+
+    def __enter__(self) -> DeviceT:
+        self.device._start_batch()
+        return self.device
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        attributes = self.device._end_batch()
+        if exc_type is None and attributes:
+            self.device._patch_attributes(attributes)
+
+    async def __aenter__(self) -> DeviceT:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type: Any, *args: Any) -> None:
+        attributes = self.device._end_batch()
+        if exc_type is None and attributes:
+            await self.device._async_patch_attributes(attributes)
+
+
 class Device(BaseIkeaModel):
+    _pending_attributes: Optional[Dict[str, Any]] = None
+    _last_write: Optional[Future] = None
+    dirigera_client: Optional[AbstractSmartHomeHub] = None
     id: str
     relation_id: Optional[str] = None
     type: str
@@ -57,3 +95,99 @@ class Device(BaseIkeaModel):
 
     def _reload(self, data: Dict[str, Any]) -> Device:
         return Device(**data)
+
+    def batch(self: DeviceT) -> AttributeBatch[DeviceT]:
+        """
+        Merges the changes of all setters called in the block into a single PATCH:
+
+        with light.batch():
+            light.set_light(True)
+            light.set_light_level(80)
+
+        Use "async with" for devices of an AsyncHub.
+        """
+        return AttributeBatch(self)
+
+    @property
+    def last_write(self) -> Optional[Future]:
+        """
+        Future of the latest setter call while the hub has write-behind enabled,
+        it resolves once the (coalesced) write reached the hub
+        """
+        return self._last_write
+
+    def _start_batch(self) -> None:
+        if self._pending_attributes is not None:
+            raise AssertionError("A batch is already in progress for this device")
+        self._pending_attributes = {}
+
+    def _end_batch(self) -> Dict[str, Any]:
+        attributes = self._pending_attributes or {}
+        self._pending_attributes = None
+        return attributes
+
+    def apply_attributes(self, attributes: Dict[str, Any]) -> Set[str]:
+        """
+        Validates camelCase attributes as sent by the hub and assigns them to the local model, unknown keys are ignored.
+        Returns the names of the attributes that changed.
+        """
+        return self.attributes.apply_changes(attributes)
+
+    def apply_state(self, data: Dict[str, Any]) -> Set[str]:
+        """
+        Applies a (partial) device payload as sent by the hub, e.g. the data of a deviceStateChanged event.
+        Returns the names of the fields that changed, changed attributes as "attributes.<name>".
+        """
+        changed = self.apply_changes(data, exclude=("id", "attributes", "dirigera_client"))
+        if "attributes" in data:
+            changed.update(f"attributes.{name}" for name in self.apply_attributes(data["attributes"]))
+        return changed
+
+    def refresh(self) -> Set[str]:
+        """
+        Fetches the device and updates this instance in place, unlike reload() which returns a new model.
+        Only changed fields are validated again. Returns the names of the fields that changed.
+        """
+        if self.dirigera_client is None:
+            raise AssertionError("This device is not bound to a hub")
+        if isinstance(self.dirigera_client, AbstractAsyncSmartHomeHub):
+            raise TypeError("This device is bound to an async hub, use async_refresh")
+        return self.apply_state(self.dirigera_client.get(route=f"/devices/{self.id}"))
+
+    async def async_refresh(self) -> Set[str]:
+        if not isinstance(self.dirigera_client, AbstractAsyncSmartHomeHub):
+            raise TypeError("This device is not bound to an async hub")
+        return self.apply_state(await self.dirigera_client.get(route=f"/devices/{self.id}"))
+
+    def _patch_attributes(self, attributes: Dict[str, Any]) -> None:
+        """
+        Sends the attributes to the hub and applies them to the local model once the request succeeded
+        """
+        if self._pending_attributes is not None:
+            self._pending_attributes.update(attributes)
+            return
+        if self.dirigera_client is None:
+            raise AssertionError("This device is not bound to a hub")
+        if isinstance(self.dirigera_client, AbstractAsyncSmartHomeHub):
+            raise TypeError("This device is bound to an async hub, use the async_* methods")
+        future = self.dirigera_client.submit_write(
+            self.id, attributes, functools.partial(self.apply_attributes, attributes)
+        )
+        if future is not None:
+            self._last_write = future
+            return
+        self.dirigera_client.patch(
+            route=f"/devices/{self.id}", data=[{"attributes": attributes}]
+        )
+        self.apply_attributes(attributes)
+
+    async def _async_patch_attributes(self, attributes: Dict[str, Any]) -> None:
+        if self._pending_attributes is not None:
+            self._pending_attributes.update(attributes)
+            return
+        if not isinstance(self.dirigera_client, AbstractAsyncSmartHomeHub):
+            raise TypeError("This device is not bound to an async hub")
+        await self.dirigera_client.patch(
+            route=f"/devices/{self.id}", data=[{"attributes": attributes}]
+        )
+        self.apply_attributes(attributes)
@@ -0,0 +1,129 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, TypeVar
+from pydantic_core import SchemaValidator, core_schema
+from .device import Device
+from .air_purifier import AirPurifier, dict_to_air_purifier
+from .blinds import Blind, dict_to_blind
+from .controller import Controller, dict_to_controller
+from .environment_sensor import EnvironmentSensor, dict_to_environment_sensor
+from .light import Light, dict_to_light
+from .light_sensor import LightSensor, dict_to_light_sensor
+from .motion_sensor import MotionSensor, dict_to_motion_sensor
+from .occupancy_sensor import OccupancySensor, dict_to_occupancy_sensor
+from .open_close_sensor import OpenCloseSensor, dict_to_open_close_sensor
+from .outlet import Outlet, dict_to_outlet
+from .water_sensor import WaterSensor, dict_to_water_sensor
+from ..hub.abstract_smart_home_hub import AbstractSmartHomeHub
+
+DeviceT = TypeVar("DeviceT", bound=Device)
+DeviceFactory = Callable[[Dict[str, Any], AbstractSmartHomeHub], Device]
+
+# Sensors all share the generic "sensor" type and are told apart by deviceType,
+# so deviceType is looked up first and type is the fallback.
+DEVICE_TYPE_FACTORIES: Dict[str, DeviceFactory] = {
+    "environmentSensor": dict_to_environment_sensor,
+    "motionSensor": dict_to_motion_sensor,
+    "openCloseSensor": dict_to_open_close_sensor,
+    "waterSensor": dict_to_water_sensor,
+    "lightSensor": dict_to_light_sensor,
+    "occupancySensor": dict_to_occupancy_sensor,
+}
+
+TYPE_FACTORIES: Dict[str, DeviceFactory] = {
+    "airPurifier": dict_to_air_purifier,
+    "blinds": dict_to_blind,
+    "controller": dict_to_controller,
+    "light": dict_to_light,
+    "outlet": dict_to_outlet,
+}
+
+DEVICE_TYPE_MODELS: Dict[str, Type[Device]] = {
+    "environmentSensor": EnvironmentSensor,
+    "motionSensor": MotionSensor,
+    "openCloseSensor": OpenCloseSensor,
+    "waterSensor": WaterSensor,
+    "lightSensor": LightSensor,
+    "occupancySensor": OccupancySensor,
+}
+
+TYPE_MODELS: Dict[str, Type[Device]] = {
+    "airPurifier": AirPurifier,
+    "blinds": Blind,
+    "controller": Controller,
+    "light": Light,
+    "outlet": Outlet,
+}
+
+
+def _device_tag(data: Any) -> str:
+    """
+    Discriminator of the device union, same lookup order as get_device_factory
+    """
+    device_type = data.get("deviceType")
+    if device_type in DEVICE_TYPE_MODELS:
+        return device_type
+    type_ = data.get("type")
+    if type_ in TYPE_MODELS:
+        return type_
+    return "device"
+
+
+# pydantic 2.4 has no callable Discriminator, so the tagged union is built directly as a pydantic-core schema.
+# deviceType and type values do not overlap, so both can share one choices mapping.
+_DEVICES_VALIDATOR = SchemaValidator(
+    core_schema.list_schema(
+        core_schema.tagged_union_schema(
+            {
+                **{tag: model.__pydantic_core_schema__ for tag, model in DEVICE_TYPE_MODELS.items()},
+                **{tag: model.__pydantic_core_schema__ for tag, model in TYPE_MODELS.items()},
+                "device": Device.__pydantic_core_schema__,
+            },
+            discriminator=_device_tag,
+        )
+    )
+)
+
+_LIST_VALIDATORS: Dict[Type[Device], SchemaValidator] = {
+    model: SchemaValidator(core_schema.list_schema(model.__pydantic_core_schema__))
+    for model in [*DEVICE_TYPE_MODELS.values(), *TYPE_MODELS.values()]
+}
+
+
+def _with_client(data: Sequence[Dict[str, Any]], dirigera_client: AbstractSmartHomeHub) -> List[Dict[str, Any]]:
+    return [{**device, "dirigeraClient": dirigera_client} for device in data]
+
+
+def parse_devices(data: Sequence[Dict[str, Any]], dirigera_client: AbstractSmartHomeHub) -> List[Device]:
+    """
+    Validates a /devices payload into the matching device models in a single validation pass,
+    devices of unknown types are returned as plain Device
+    """
+    return _DEVICES_VALIDATOR.validate_python(_with_client(data, dirigera_client))
+
+
+def parse_devices_as(
+    model: Type[DeviceT], data: Sequence[Dict[str, Any]], dirigera_client: AbstractSmartHomeHub
+) -> List[DeviceT]:
+    """
+    Validates device payloads that are all of the given model in a single validation pass
+    """
+    return _LIST_VALIDATORS[model].validate_python(_with_client(data, dirigera_client))
+
+
+def get_device_factory(data: Dict[str, Any]) -> Optional[DeviceFactory]:
+    """
+    Returns the dict_to_* factory matching the devices deviceType or type, None for unknown devices
+    """
+    factory = DEVICE_TYPE_FACTORIES.get(data.get("deviceType", ""))
+    if factory is None:
+        factory = TYPE_FACTORIES.get(data.get("type", ""))
+    return factory
+
+
+def dict_to_device(data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> Device:
+    """
+    Builds the matching device model, devices of unknown types are returned as plain Device
+    """
+    factory = get_device_factory(data)
+    if factory is None:
+        return Device(dirigeraClient=dirigera_client, **data)
+    return factory(data, dirigera_client)
@@ -0,0 +1,70 @@
+from typing import Any, Dict, Optional
+from .device import Device
+from .device_factory import dict_to_device
+from ..hub.abstract_smart_home_hub import AbstractSmartHomeHub
+
+
+class LazyDevice:
+    """
+    Lightweight proxy over a raw device dict from the hub.
+
+    id, type, device_type, relation_id, is_reachable and custom_name are read straight from the dict.
+    Any other field or method builds and validates the full model on first access, it is reused afterwards.
+    """
+
+    __slots__ = ("data", "dirigera_client", "_model")
+
+    def __init__(self, data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> None:
+        self.data = data
+        self.dirigera_client = dirigera_client
+        self._model: Optional[Device] = None
+
+    def __repr__(self) -> str:
+        return f"LazyDevice(id={self.id!r}, device_type={self.device_type!r}, validated={self.is_validated})"
+
+    @property
+    def id(self) -> str:  # pylint: disable=invalid-name
+        return self.data["id"]
+
+    @property
+    def type(self) -> str:
+        return self.data["type"]
+
+    @property
+    def device_type(self) -> str:
+        return self.data["deviceType"]
+
+    @property
+    def relation_id(self) -> Optional[str]:
+        return self.data.get("relationId")
+
+    @property
+    def is_reachable(self) -> bool:
+        return self.data["isReachable"]
+
+    @property
+    def custom_name(self) -> str:
+        return self.data["attributes"]["customName"]
+
+    @property
+    def is_validated(self) -> bool:
+        return self._model is not None
+
+    def model(self) -> Device:
+        """
+        Returns the validated device model, built with the matching dict_to_* factory on first call
+        """
+        if self._model is None:
+            self._model = dict_to_device(self.data, self.dirigera_client)
+        return self._model
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.model(), name)
+
+
+def dict_to_lazy_device(
+    data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub
+) -> LazyDevice:
+    return LazyDevice(data, dirigera_client)
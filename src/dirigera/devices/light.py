@@ -23,35 +23,56 @@ class Light(Device):
         data = self.dirigera_client.get(route=f"/devices/{self.id}")
         return Light(dirigeraClient=self.dirigera_client, **data)
 
+    async def async_reload(self) -> Light:
+        data = await self.dirigera_client.get(route=f"/devices/{self.id}")
+        return Light(dirigeraClient=self.dirigera_client, **data)
+
     def set_name(self, name: str) -> None:
+        self._patch_attributes(self._name_attributes(name))
+
+    async def async_set_name(self, name: str) -> None:
+        await self._async_patch_attributes(self._name_attributes(name))
+
+    def _name_attributes(self, name: str) -> Dict[str, Any]:
         if "customName" not in self.capabilities.can_receive:
             raise AssertionError("This lamp does not support the swith-off function")
-
-        data = [{"attributes": {"customName": name}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.custom_name = name
+        return {"customName": name}
 
     def set_light(self, lamp_on: bool) -> None:
+        self._patch_attributes(self._light_attributes(lamp_on))
+
+    async def async_set_light(self, lamp_on: bool) -> None:
+        await self._async_patch_attributes(self._light_attributes(lamp_on))
+
+    def _light_attributes(self, lamp_on: bool) -> Dict[str, Any]:
         if "isOn" not in self.capabilities.can_receive:
             raise AssertionError("This lamp does not support the swith-off function")
-
-        data = [{"attributes": {"isOn": lamp_on}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.is_on = lamp_on
+        return {"isOn": lamp_on}
 
     def set_light_level(self, light_level: int) -> None:
+        self._patch_attributes(self._light_level_attributes(light_level))
+
+    async def async_set_light_level(self, light_level: int) -> None:
+        await self._async_patch_attributes(self._light_level_attributes(light_level))
+
+    def _light_level_attributes(self, light_level: int) -> Dict[str, Any]:
         if "lightLevel" not in self.capabilities.can_receive:
             raise AssertionError(
                 "This lamp does not support the set lightLevel function"
             )
         if light_level < 1 or light_level > 100:
             raise ValueError("light_level must be a value between 1 and 100")
-
-        data = [{"attributes": {"lightLevel": light_level}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.light_level = light_level
+        return {"lightLevel": light_level}
 
     def set_color_temperature(self, color_temp: int) -> None:
+        self._patch_attributes(self._color_temperature_attributes(color_temp))
+
+    async def async_set_color_temperature(self, color_temp: int) -> None:
+        await self._async_patch_attributes(
+            self._color_temperature_attributes(color_temp)
+        )
+
+    def _color_temperature_attributes(self, color_temp: int) -> Dict[str, Any]:
         if "colorTemperature" not in self.capabilities.can_receive:
             raise AssertionError(
                 "This lamp does not support the set colorTemperature function"
@@ -69,12 +90,17 @@ class Light(Device):
                 "color_temperature must be a value between "
                 f"{self.attributes.color_temperature_max} and {self.attributes.color_temperature_min}"
             )
-
-        data = [{"attributes": {"colorTemperature": color_temp}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.color_temperature = color_temp
+        return {"colorTemperature": color_temp}
 
     def set_light_color(self, hue: float, saturation: float) -> None:
+        self._patch_attributes(self._light_color_attributes(hue, saturation))
+
+    async def async_set_light_color(self, hue: float, saturation: float) -> None:
+        await self._async_patch_attributes(
+            self._light_color_attributes(hue, saturation)
+        )
+
+    def _light_color_attributes(self, hue: float, saturation: float) -> Dict[str, Any]:
         if (
             "colorHue" not in self.capabilities.can_receive
             or "colorSaturation" not in self.capabilities.can_receive
@@ -86,11 +112,7 @@ class Light(Device):
             raise ValueError("hue must be a value between 0 and 360")
         if saturation < 0.0 or saturation > 1.0:
             raise ValueError("saturation must be a value between 0.0 and 1.0")
-
-        data = [{"attributes": {"colorHue": hue, "colorSaturation": saturation}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.color_hue = hue
-        self.attributes.color_saturation = saturation
+        return {"colorHue": hue, "colorSaturation": saturation}
 
     def set_startup_behaviour(self, behaviour: StartupEnum) -> None:
         """
@@ -100,9 +122,10 @@ class Light(Device):
         When set to START_PREVIOUS the lamp will resume its state at power outage.
         When set to START_TOGGLE, a sequence of power-off -> power-on, will toggle the lamp state
         """
-        data = [{"attributes": {"startupOnOff": behaviour.value}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.startup_on_off = behaviour
+        self._patch_attributes({"startupOnOff": behaviour.value})
+
+    async def async_set_startup_behaviour(self, behaviour: StartupEnum) -> None:
+        await self._async_patch_attributes({"startupOnOff": behaviour.value})
 
 
 def dict_to_light(data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> Light:
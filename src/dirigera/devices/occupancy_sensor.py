@@ -16,13 +16,20 @@ class OccupancySensor(Device):
         data = self.dirigera_client.get(route=f"/devices/{self.id}")
         return OccupancySensor(dirigeraClient=self.dirigera_client, **data)
 
+    async def async_reload(self) -> OccupancySensor:
+        data = await self.dirigera_client.get(route=f"/devices/{self.id}")
+        return OccupancySensor(dirigeraClient=self.dirigera_client, **data)
+
     def set_name(self, name: str) -> None:
+        self._patch_attributes(self._name_attributes(name))
+
+    async def async_set_name(self, name: str) -> None:
+        await self._async_patch_attributes(self._name_attributes(name))
+
+    def _name_attributes(self, name: str) -> Dict[str, Any]:
         if "customName" not in self.capabilities.can_receive:
             raise AssertionError("This sensor does not support the set_name function")
-
-        data = [{"attributes": {"customName": name}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.custom_name = name
+        return {"customName": name}
 
 
 def dict_to_occupancy_sensor(
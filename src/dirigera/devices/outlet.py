@@ -33,23 +33,33 @@ class Outlet(Device):
         data = self.dirigera_client.get(route=f"/devices/{self.id}")
         return Outlet(dirigeraClient=self.dirigera_client, **data)
 
+    async def async_reload(self) -> Outlet:
+        data = await self.dirigera_client.get(route=f"/devices/{self.id}")
+        return Outlet(dirigeraClient=self.dirigera_client, **data)
+
     def set_name(self, name: str) -> None:
+        self._patch_attributes(self._name_attributes(name))
+
+    async def async_set_name(self, name: str) -> None:
+        await self._async_patch_attributes(self._name_attributes(name))
+
+    def _name_attributes(self, name: str) -> Dict[str, Any]:
         if "customName" not in self.capabilities.can_receive:
             raise AssertionError(
                 "This device does not support the customName capability"
             )
-
-        data = [{"attributes": {"customName": name}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.custom_name = name
+        return {"customName": name}
 
     def set_on(self, outlet_on: bool) -> None:
+        self._patch_attributes(self._on_attributes(outlet_on))
+
+    async def async_set_on(self, outlet_on: bool) -> None:
+        await self._async_patch_attributes(self._on_attributes(outlet_on))
+
+    def _on_attributes(self, outlet_on: bool) -> Dict[str, Any]:
         if "isOn" not in self.capabilities.can_receive:
             raise AssertionError("This device does not support the isOn function")
-
-        data = [{"attributes": {"isOn": outlet_on}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.is_on = outlet_on
+        return {"isOn": outlet_on}
 
     def set_startup_behaviour(self, behaviour: StartupEnum) -> None:
         """
@@ -59,9 +69,10 @@ class Outlet(Device):
         When set to START_PREVIOUS the device will resume its state at power outage.
         When set to START_TOGGLE, a sequence of power-off -> power-on, will toggle the device state
         """
-        data = [{"attributes": {"startupOnOff": behaviour.value}}]
-        self.dirigera_client.patch(route=f"/devices/{self.id}", data=data)
-        self.attributes.startup_on_off = behaviour
+        self._patch_attributes({"startupOnOff": behaviour.value})
+
+    async def async_set_startup_behaviour(self, behaviour: StartupEnum) -> None:
+        await self._async_patch_attributes({"startupOnOff": behaviour.value})
 
 
 def dict_to_outlet(
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import datetime
 from enum import Enum
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Set, Union
 from .base_ikea_model import BaseIkeaModel
 from .device import Attributes
 from ..hub.abstract_smart_home_hub import AbstractSmartHomeHub
@@ -137,12 +137,33 @@ class Scene(BaseIkeaModel):
         data = self.dirigera_client.get(route=f"/scenes/{self.id}")
         return Scene(dirigeraClient=self.dirigera_client, **data)
 
+    async def async_reload(self) -> Scene:
+        data = await self.dirigera_client.get(route=f"/scenes/{self.id}")
+        return Scene(dirigeraClient=self.dirigera_client, **data)
+
+    def refresh(self) -> Set[str]:
+        """
+        Fetches the scene and updates this instance in place, returns the names of the fields that changed
+        """
+        data = self.dirigera_client.get(route=f"/scenes/{self.id}")
+        return self.apply_changes(data, exclude=("id", "dirigera_client"))
+
+    async def async_refresh(self) -> Set[str]:
+        data = await self.dirigera_client.get(route=f"/scenes/{self.id}")
+        return self.apply_changes(data, exclude=("id", "dirigera_client"))
+
     def trigger(self) -> None:
         self.dirigera_client.post(route=f"/scenes/{self.id}/trigger")
 
+    async def async_trigger(self) -> None:
+        await self.dirigera_client.post(route=f"/scenes/{self.id}/trigger")
+
     def undo(self) -> None:
         self.dirigera_client.post(route=f"/scenes/{self.id}/undo")
 
+    async def async_undo(self) -> None:
+        await self.dirigera_client.post(route=f"/scenes/{self.id}/undo")
+
 
 def dict_to_scene(data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> Scene:
     return Scene(dirigeraClient=dirigera_client, **data)
@@ -1,8 +1,20 @@
 import abc
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
 
 
 class AbstractSmartHomeHub(abc.ABC):
+    def submit_write(  # pylint: disable=unused-argument
+        self,
+        device_id: str,
+        attributes: Dict[str, Any],
+        on_success: Optional[Callable[[], Any]] = None,
+    ) -> Optional[Future]:
+        """
+        Hands an attribute write to the write-behind queue, returns None if writes are sent directly
+        """
+        return None
+
     @abc.abstractmethod
     def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
         raise NotImplementedError
@@ -20,6 +32,31 @@ class AbstractSmartHomeHub(abc.ABC):
         raise NotImplementedError
 
 
+class AbstractAsyncSmartHomeHub(AbstractSmartHomeHub):
+    """
+    Hub whose transport methods are coroutines.
+    Models bound to it are controlled through their async_* methods.
+    """
+
+    # pylint: disable=invalid-overridden-method
+
+    @abc.abstractmethod
+    async def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def get(self, route: str) -> Any:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def post(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        raise NotImplementedError
+
+
 class FakeDirigeraHub(AbstractSmartHomeHub):
     def __init__(self) -> None:
         self.patch_actions: List = []
@@ -41,3 +78,26 @@ class FakeDirigeraHub(AbstractSmartHomeHub):
 
     def delete(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
         self.delete_actions.append({"route": route, "data": data})
+
+
+class FakeAsyncDirigeraHub(AbstractAsyncSmartHomeHub):
+    def __init__(self) -> None:
+        self.patch_actions: List = []
+        self.post_actions: List = []
+        self.get_actions: List = []
+        self.get_action_replys: Dict = {}
+        self.delete_actions: List = []
+
+    async def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
+        self.patch_actions.append({"route": route, "data": data})
+        return {"route": route, "data": data}
+
+    async def get(self, route: str) -> Any:
+        self.get_actions.append({"route": route})
+        return self.get_action_replys[route]
+
+    async def post(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        self.post_actions.append({"route": route, "data": data})
+
+    async def delete(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        self.delete_actions.append({"route": route, "data": data})
@@ -0,0 +1,323 @@
+# pylint:disable=too-many-public-methods
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, TypeVar, Union
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+from .utils import camelize_dict
+from .device_group import DeviceGroup
+from .deadlines import request_timeout
+from .abstract_smart_home_hub import AbstractAsyncSmartHomeHub
+from ..devices.device import Device
+from ..devices.device_factory import parse_devices, parse_devices_as
+from ..devices.air_purifier import AirPurifier, dict_to_air_purifier
+from ..devices.light import Light, dict_to_light
+from ..devices.blinds import Blind, dict_to_blind
+from ..devices.controller import Controller, dict_to_controller
+from ..devices.outlet import Outlet, dict_to_outlet
+from ..devices.environment_sensor import EnvironmentSensor, dict_to_environment_sensor
+from ..devices.motion_sensor import MotionSensor, dict_to_motion_sensor
+from ..devices.open_close_sensor import OpenCloseSensor, dict_to_open_close_sensor
+from ..devices.scene import Action, Info, Scene, SceneType, Trigger, dict_to_scene
+from ..devices.water_sensor import WaterSensor, dict_to_water_sensor
+from ..devices.occupancy_sensor import OccupancySensor, dict_to_occupancy_sensor
+from ..devices.light_sensor import LightSensor, dict_to_light_sensor
+
+DeviceT = TypeVar("DeviceT", bound=Device)
+
+
+class AsyncHub(AbstractAsyncSmartHomeHub):
+    def __init__(
+        self,
+        token: str,
+        ip_address: str,
+        port: str = "8443",
+        api_version: str = "v1",
+        pool_maxsize: int = 10,
+        timeout: float = 10.0,
+    ) -> None:
+        """
+        Initializes a new instance of the AsyncHub class.
+        Requires the optional aiohttp dependency (pip install dirigera[async]).
+
+        Args:
+            token (str): The authentication token for the hub.
+            ip_address (str): The IP address of the hub.
+            port (str, optional): The port number for the hub API. Defaults to "8443".
+            api_version (str, optional): The version of the API to use. Defaults to "v1".
+            pool_maxsize (int, optional): Number of keep-alive connections kept open to the hub. Defaults to 10.
+            timeout (float, optional): Timeout of a single request in seconds, shortened to the current deadline.
+                Defaults to 10.
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncHub requires aiohttp, install it with: pip install dirigera[async]")
+        self.api_base_url = f"https://{ip_address}:{port}/{api_version}"
+        self.token = token
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> AsyncHub:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def headers(self) -> Dict[str, Any]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        The session is created lazily since aiohttp binds it to the running event loop
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize, ssl=False)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _timeout(self) -> aiohttp.ClientTimeout:
+        """
+        Request timeout, shortened to the current deadline (see resilience.deadline)
+        """
+        return aiohttp.ClientTimeout(total=request_timeout(self.timeout))
+
+    def device_group(
+        self,
+        devices: Sequence[Union[Device, str]],
+        max_concurrency: Optional[int] = None,
+        device_set_id: Optional[str] = None,
+    ) -> DeviceGroup:
+        """
+        Creates a DeviceGroup to send one command to many devices concurrently.
+        max_concurrency defaults to the connection pool size.
+        """
+        return DeviceGroup(
+            self,
+            devices,
+            max_concurrency=max_concurrency or self.pool_maxsize,
+            device_set_id=device_set_id,
+        )
+
+    async def close(self) -> None:
+        """
+        Closes all pooled connections
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
+        async with self._get_session().patch(
+            f"{self.api_base_url}{route}", json=data, timeout=self._timeout()
+        ) as response:
+            response.raise_for_status()
+            return await response.text()
+
+    async def get(self, route: str) -> Any:
+        async with self._get_session().get(
+            f"{self.api_base_url}{route}", timeout=self._timeout()
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def post(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        async with self._get_session().post(
+            f"{self.api_base_url}{route}", json=data, timeout=self._timeout()
+        ) as response:
+            response.raise_for_status()
+            content = await response.read()
+            if len(content) == 0:
+                return None
+            return await response.json()
+
+    async def delete(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        async with self._get_session().delete(
+            f"{self.api_base_url}{route}", json=data, timeout=self._timeout()
+        ) as response:
+            response.raise_for_status()
+            content = await response.read()
+            if len(content) == 0:
+                return None
+            return await response.json()
+
+    async def _get_device_data_by_id(self, id_: str) -> Dict:
+        """
+        Fetches device data by its id
+        """
+        try:
+            return await self.get("/devices/" + id_)
+        except aiohttp.ClientResponseError as err:
+            if err.status == 404:
+                raise ValueError("Device id not found") from err
+            raise err
+
+    async def _get_devices(self, key: str, value: str, model: Type[DeviceT]) -> List[DeviceT]:
+        devices = await self.get("/devices")
+        return parse_devices_as(model, [device for device in devices if device[key] == value], self)
+
+    async def _get_device_by_id(
+        self,
+        id_: str,
+        key: str,
+        value: str,
+        factory: Callable[[Dict[str, Any], AsyncHub], DeviceT],
+        error: str,
+    ) -> DeviceT:
+        device = await self._get_device_data_by_id(id_)
+        if device[key] != value:
+            raise ValueError(error)
+        return factory(device, self)
+
+    @staticmethod
+    def _first_by_name(devices: List[DeviceT], name: str, kind: str) -> DeviceT:
+        matches = [x for x in devices if x.attributes.custom_name == name]
+        if len(matches) == 0:
+            raise AssertionError(f"No {kind} found with name {name}")
+        return matches[0]
+
+    async def get_air_purifiers(self) -> List[AirPurifier]:
+        return await self._get_devices("type", "airPurifier", AirPurifier)
+
+    async def get_air_purifier_by_id(self, id_: str) -> AirPurifier:
+        return await self._get_device_by_id(
+            id_, "deviceType", "airPurifier", dict_to_air_purifier, "Device is not an Air Purifier"
+        )
+
+    async def get_lights(self) -> List[Light]:
+        return await self._get_devices("type", "light", Light)
+
+    async def get_light_by_name(self, lamp_name: str) -> Light:
+        return self._first_by_name(await self.get_lights(), lamp_name, "light")
+
+    async def get_light_by_id(self, id_: str) -> Light:
+        return await self._get_device_by_id(id_, "type", "light", dict_to_light, "Device is not a light")
+
+    async def get_outlets(self) -> List[Outlet]:
+        return await self._get_devices("type", "outlet", Outlet)
+
+    async def get_outlet_by_name(self, outlet_name: str) -> Outlet:
+        return self._first_by_name(await self.get_outlets(), outlet_name, "outlet")
+
+    async def get_outlet_by_id(self, id_: str) -> Outlet:
+        return await self._get_device_by_id(id_, "type", "outlet", dict_to_outlet, "Device is not an outlet")
+
+    async def get_environment_sensors(self) -> List[EnvironmentSensor]:
+        return await self._get_devices("deviceType", "environmentSensor", EnvironmentSensor)
+
+    async def get_environment_sensor_by_id(self, id_: str) -> EnvironmentSensor:
+        return await self._get_device_by_id(
+            id_, "deviceType", "environmentSensor", dict_to_environment_sensor, "Device is not an EnvironmentSensor"
+        )
+
+    async def get_motion_sensors(self) -> List[MotionSensor]:
+        return await self._get_devices("deviceType", "motionSensor", MotionSensor)
+
+    async def get_motion_sensor_by_name(self, motion_sensor_name: str) -> MotionSensor:
+        return self._first_by_name(await self.get_motion_sensors(), motion_sensor_name, "motion sensor")
+
+    async def get_motion_sensor_by_id(self, id_: str) -> MotionSensor:
+        return await self._get_device_by_id(
+            id_, "deviceType", "motionSensor", dict_to_motion_sensor, "Device is not an MotionSensor"
+        )
+
+    async def get_open_close_sensors(self) -> List[OpenCloseSensor]:
+        return await self._get_devices("deviceType", "openCloseSensor", OpenCloseSensor)
+
+    async def get_open_close_by_id(self, id_: str) -> OpenCloseSensor:
+        return await self._get_device_by_id(
+            id_, "deviceType", "openCloseSensor", dict_to_open_close_sensor, "Device is not an OpenCloseSensor"
+        )
+
+    async def get_blinds(self) -> List[Blind]:
+        return await self._get_devices("type", "blinds", Blind)
+
+    async def get_blind_by_name(self, blind_name: str) -> Blind:
+        return self._first_by_name(await self.get_blinds(), blind_name, "blind")
+
+    async def get_blinds_by_id(self, id_: str) -> Blind:
+        return await self._get_device_by_id(id_, "deviceType", "blinds", dict_to_blind, "Device is not a Blind")
+
+    async def get_controllers(self) -> List[Controller]:
+        return await self._get_devices("type", "controller", Controller)
+
+    async def get_controller_by_name(self, controller_name: str) -> Controller:
+        return self._first_by_name(await self.get_controllers(), controller_name, "controller")
+
+    async def get_controller_by_id(self, id_: str) -> Controller:
+        return await self._get_device_by_id(
+            id_, "type", "controller", dict_to_controller, "Device is not a controller"
+        )
+
+    async def get_water_sensors(self) -> List[WaterSensor]:
+        return await self._get_devices("deviceType", "waterSensor", WaterSensor)
+
+    async def get_water_sensor_by_id(self, id_: str) -> WaterSensor:
+        return await self._get_device_by_id(
+            id_, "deviceType", "waterSensor", dict_to_water_sensor, "Device is not a WaterSensor"
+        )
+
+    async def get_light_sensors(self) -> List[LightSensor]:
+        return await self._get_devices("deviceType", "lightSensor", LightSensor)
+
+    async def get_light_sensor_by_id(self, id_: str) -> LightSensor:
+        return await self._get_device_by_id(
+            id_, "deviceType", "lightSensor", dict_to_light_sensor, "Device is not a LightSensor"
+        )
+
+    async def get_occupancy_sensors(self) -> List[OccupancySensor]:
+        return await self._get_devices("deviceType", "occupancySensor", OccupancySensor)
+
+    async def get_occupancy_sensor_by_id(self, id_: str) -> OccupancySensor:
+        return await self._get_device_by_id(
+            id_, "deviceType", "occupancySensor", dict_to_occupancy_sensor, "Device is not an OccupancySensor"
+        )
+
+    async def get_all_devices(self) -> List[Device]:
+        """
+        Fetches all devices registered in the Hub with a single request
+        devices of unknown types are returned as plain Device
+        """
+        return parse_devices(await self.get("/devices"), self)
+
+    async def get_scenes(self) -> List[Scene]:
+        scenes: List = await self.get("/scenes")
+        return [dict_to_scene(scene, self) for scene in scenes]
+
+    async def get_scene_by_id(self, scene_id: str) -> Scene:
+        data = await self.get(f"/scenes/{scene_id}")
+        return dict_to_scene(data, self)
+
+    async def get_scene_by_name(self, scene_name: str) -> Scene:
+        scenes = [x for x in await self.get_scenes() if x.info.name == scene_name]
+        if len(scenes) == 0:
+            raise AssertionError(f"No Scene found with name {scene_name}")
+        return scenes[0]
+
+    async def create_scene(
+        self,
+        info: Info,
+        scene_type: SceneType = SceneType.USER_SCENE,
+        triggers: Optional[List[Trigger]] = None,
+        actions: Optional[List[Action]] = None,
+    ) -> Scene:
+        """
+        Creates a new scene, see Hub.create_scene
+        """
+        data = {
+            "info": info.model_dump(mode="json", exclude_none=True),
+            "type": scene_type.value,
+            "triggers": [x.model_dump(mode="json", exclude_none=True) for x in triggers or []],
+            "actions": [x.model_dump(mode="json", exclude_none=True) for x in actions or []],
+        }
+        response_dict = await self.post("/scenes/", data=camelize_dict(data))  # type: ignore
+        return await self.get_scene_by_id(response_dict["id"])
+
+    async def delete_scene(self, scene_id: str) -> None:
+        await self.delete(f"/scenes/{scene_id}")
@@ -36,8 +36,8 @@ def code_challenge(code_verifier: str) -> str:
     return sha256_hash_as_base64
 
 
-def send_challenge(ip_address: str, code_verifier: str) -> str:
-    auth_url = f"https://{ip_address}:8443/v1/oauth/authorize"
+def send_challenge(ip_address: str, code_verifier: str, port: int = 8443) -> str:
+    auth_url = f"https://{ip_address}:{port}/v1/oauth/authorize"
     params = {
         "audience": "homesmart.local",
         "response_type": "code",
@@ -49,7 +49,9 @@ def send_challenge(ip_address: str, code_verifier: str) -> str:
     return response.json()["code"]
 
 
-def get_token(ip_address: str, code: str, code_verifier: str) -> str:
+def get_token(
+    ip_address: str, code: str, code_verifier: str, port: int = 8443
+) -> str:
     data = str(
         "code="
         + code
@@ -61,7 +63,7 @@ def get_token(ip_address: str, code: str, code_verifier: str) -> str:
         + code_verifier
     )
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    token_url = f"https://{ip_address}:8443/v1/oauth/token"
+    token_url = f"https://{ip_address}:{port}/v1/oauth/token"
 
     response = requests.post(
         token_url, headers=headers, data=data, verify=False, timeout=10
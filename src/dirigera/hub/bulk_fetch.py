@@ -0,0 +1,72 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from requests import HTTPError
+
+from .abstract_smart_home_hub import AbstractSmartHomeHub
+from ..devices.device import Device
+
+
+@dataclass
+class FetchResult:
+    """
+    Outcome of a bulk fetch: the typed models of the devices found, the ids the hub does not know
+    and the errors of failed requests or invalid payloads, keyed by device id
+    """
+
+    devices: Dict[str, Device] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    changed: Dict[str, Set[str]] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.errors
+
+
+def use_device_list(requested: int, fleet_size: Optional[int], ratio: float, max_concurrency: int) -> bool:
+    """
+    True if one GET /devices is cheaper than a GET /devices/{id} per requested device.
+    Without a known fleet size, per id requests are used as long as they fit into one round of max_concurrency.
+    """
+    if fleet_size is None:
+        return requested > max_concurrency
+    return requested >= fleet_size * ratio
+
+
+def fetch_device_data(
+    dirigera_client: AbstractSmartHomeHub,
+    ids: Sequence[str],
+    use_list: bool,
+    max_concurrency: int = 10,
+) -> Tuple[Dict[str, Dict[str, Any]], FetchResult]:
+    """
+    Fetches the device payloads either from one GET /devices or with concurrent GET /devices/{id} requests.
+    Returns the payloads found and a result with the missing ids and errors, its devices are left to the caller.
+    A failing /devices request raises, failing per id requests are reported in the result.
+    """
+    ids = list(dict.fromkeys(ids))
+    result = FetchResult()
+    data: Dict[str, Any] = {}
+    if use_list:
+        by_id = {device["id"]: device for device in dirigera_client.get("/devices")}
+        data = {id_: by_id[id_] for id_ in ids if id_ in by_id}
+    elif ids:
+        workers = max(1, min(max_concurrency, len(ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                id_: executor.submit(contextvars.copy_context().run, dirigera_client.get, f"/devices/{id_}")
+                for id_ in ids
+            }
+        for id_, future in futures.items():
+            error = future.exception()
+            if error is None:
+                data[id_] = future.result()
+            elif isinstance(error, HTTPError) and error.response is not None and error.response.status_code == 404:
+                continue
+            else:
+                result.errors[id_] = error  # type: ignore
+    result.missing = [id_ for id_ in ids if id_ not in data and id_ not in result.errors]
+    return data, result
@@ -0,0 +1,49 @@
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional
+
+import requests
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("dirigera_deadline", default=None)
+
+
+class DeadlineExceeded(requests.Timeout):
+    pass
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    All requests sent in the block, including those of group operations and the command executor,
+    have to finish within seconds. Nested deadlines can only shorten the outer one.
+    """
+    expires_at = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Seconds left until the current deadline, None without deadline
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def request_timeout(default: float) -> float:
+    """
+    Timeout for the next request, raises DeadlineExceeded if the current deadline has passed
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return default
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+    return min(default, remaining)
@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+DEVICES_ROUTE = "/devices"
+DEVICE_ROUTE_PREFIX = "/devices/"
+
+
+class DeviceCache:
+    """
+    In-memory copy of the /devices payload kept current by the websocket event stream.
+
+    Cached device dicts are replaced, never mutated, when changes are applied,
+    so payloads handed out stay consistent. Callers must treat them as read-only.
+    Events arrive on the websocket thread, all access is guarded by a lock.
+    """
+
+    def __init__(self, max_age: Optional[float] = 60) -> None:
+        """
+        Args:
+            max_age (float, optional): Seconds the snapshot is trusted without a new snapshot or event.
+                None trusts it forever. Defaults to 60.
+        """
+        self.max_age = max_age
+        self._devices: Optional[Dict[str, Dict[str, Any]]] = None
+        self._updated_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_fresh(self) -> bool:
+        if self._devices is None:
+            return False
+        if self.max_age is None:
+            return True
+        return time.monotonic() - self._updated_at <= self.max_age
+
+    def clear(self) -> None:
+        with self._lock:
+            self._devices = None
+
+    def set_snapshot(self, devices: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._devices = {device["id"]: device for device in devices}
+            self._updated_at = time.monotonic()
+
+    def get_devices(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the cached /devices payload or None if the snapshot is missing or stale
+        """
+        with self._lock:
+            if self._devices is None or not self.is_fresh():
+                return None
+            return list(self._devices.values())
+
+    def get_device(self, id_: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached /devices/{id} payload or None if it is unknown or the snapshot is stale
+        """
+        with self._lock:
+            if self._devices is None or not self.is_fresh():
+                return None
+            return self._devices.get(id_)
+
+    def lookup(self, route: str) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Serves a GET route from memory, returns None when it has to go to the hub
+        """
+        if route == DEVICES_ROUTE:
+            return self.get_devices()
+        if route.startswith(DEVICE_ROUTE_PREFIX) and "/" not in route[len(DEVICE_ROUTE_PREFIX):]:
+            return self.get_device(route[len(DEVICE_ROUTE_PREFIX):])
+        return None
+
+    def store(self, route: str, data: Any) -> None:
+        """
+        Feeds a GET response fetched over HTTP back into the cache
+        """
+        if route == DEVICES_ROUTE:
+            self.set_snapshot(data)
+        elif route.startswith(DEVICE_ROUTE_PREFIX) and "/" not in route[len(DEVICE_ROUTE_PREFIX):]:
+            with self._lock:
+                if self._devices is not None:
+                    self._devices[data["id"]] = data
+
+    def apply_patch(self, route: str, data: List[Dict[str, Any]]) -> None:
+        """
+        Mirrors a successful PATCH of /devices/{id} until the matching event arrives
+        """
+        if not route.startswith(DEVICE_ROUTE_PREFIX):
+            return
+        id_ = route[len(DEVICE_ROUTE_PREFIX):]
+        for change in data:
+            self.apply_change(dict(change, id=id_), touch=False)
+
+    def apply_change(self, change: Dict[str, Any], touch: bool = True) -> None:
+        """
+        Merges a (partial) device payload into the cached device with the same id
+        """
+        with self._lock:
+            if self._devices is None:
+                return
+            current = self._devices.get(change["id"])
+            if current is not None:
+                merged = {**current, **change}
+                if "attributes" in change:
+                    merged["attributes"] = {
+                        **current.get("attributes", {}),
+                        **change["attributes"],
+                    }
+                self._devices[change["id"]] = merged
+            if touch:
+                self._updated_at = time.monotonic()
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """
+        Applies a parsed websocket event to the snapshot
+        """
+        event_type = event.get("type")
+        data = event.get("data")
+        if not isinstance(data, dict) or "id" not in data:
+            return
+        if event_type == "deviceStateChanged":
+            self.apply_change(data)
+        elif event_type == "deviceAdded":
+            with self._lock:
+                if self._devices is not None:
+                    self._devices[data["id"]] = data
+                    self._updated_at = time.monotonic()
+        elif event_type == "deviceRemoved":
+            with self._lock:
+                if self._devices is not None:
+                    self._devices.pop(data["id"], None)
+                    self._updated_at = time.monotonic()
+
+    def handle_message(self, message: str) -> None:
+        """
+        Applies a raw websocket message, can be used as on_message payload handler
+        """
+        try:
+            event = json.loads(message)
+        except ValueError:
+            return
+        if isinstance(event, dict):
+            self.handle_event(event)
@@ -0,0 +1,148 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from pydantic import ValidationError
+
+from .abstract_smart_home_hub import AbstractAsyncSmartHomeHub, AbstractSmartHomeHub
+from .deadlines import deadline
+from ..devices.device import Device
+
+
+@dataclass
+class GroupResult:
+    """
+    Outcome of a group command, keyed by device id. errors holds the failed requests, apply_errors the devices
+    whose request succeeded but whose model could not be updated with the new attributes.
+    """
+
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    apply_errors: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return len(self.errors) == 0
+
+
+class DeviceGroup:
+    def __init__(
+        self,
+        dirigera_client: AbstractSmartHomeHub,
+        devices: Sequence[Union[Device, str]],
+        max_concurrency: int = 10,
+        device_set_id: Optional[str] = None,
+    ) -> None:
+        """
+        Sends the same command to several devices at once.
+
+        Args:
+            dirigera_client (AbstractSmartHomeHub): Hub the commands are sent through.
+            devices (Sequence[Union[Device, str]]): Device models or device ids.
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 10.
+            device_set_id (str, optional): Id of a device set on the hub whose members are exactly these devices.
+                Commands are then sent as a single request to the device set.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.dirigera_client = dirigera_client
+        self.devices = list(devices)
+        self.max_concurrency = max_concurrency
+        self.device_set_id = device_set_id
+
+    @property
+    def ids(self) -> List[str]:
+        return [x if isinstance(x, str) else x.id for x in self.devices]
+
+    def _models(self) -> Dict[str, Device]:
+        return {x.id: x for x in self.devices if isinstance(x, Device)}
+
+    def _apply(self, result: GroupResult, attributes: Dict[str, Any]) -> None:
+        for id_, model in self._models().items():
+            if id_ in result.results:
+                try:
+                    model.apply_attributes(attributes)
+                except ValidationError as err:
+                    result.apply_errors[id_] = err
+
+    def set_attributes(self, attributes: Dict[str, Any], timeout: Optional[float] = None) -> GroupResult:
+        """
+        Patches the attributes on all devices of the group, failures are reported per device and do not
+        stop the other requests. Device models of the group are updated for every device that succeeded.
+        With timeout, all requests have to finish within that many seconds, the current deadline is kept otherwise.
+        """
+        if isinstance(self.dirigera_client, AbstractAsyncSmartHomeHub):
+            raise TypeError("This group is bound to an async hub, use the async_* methods")
+        if timeout is not None:
+            with deadline(timeout):
+                return self.set_attributes(attributes)
+        data = [{"attributes": attributes}]
+        result = GroupResult()
+        if self.device_set_id is not None:
+            try:
+                response = self.dirigera_client.patch(f"/devices/set/{self.device_set_id}", data)
+                result.results = {id_: response for id_ in self.ids}
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                result.errors = {id_: err for id_ in self.ids}
+        else:
+            ids = self.ids
+            workers = max(1, min(self.max_concurrency, len(ids)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    id_: executor.submit(
+                        contextvars.copy_context().run, self.dirigera_client.patch, f"/devices/{id_}", data
+                    )
+                    for id_ in ids
+                }
+            for id_, future in futures.items():
+                error = future.exception()
+                if error is None:
+                    result.results[id_] = future.result()
+                else:
+                    result.errors[id_] = error  # type: ignore
+        self._apply(result, attributes)
+        return result
+
+    async def async_set_attributes(self, attributes: Dict[str, Any], timeout: Optional[float] = None) -> GroupResult:
+        """
+        set_attributes for groups of an AsyncHub
+        """
+        if timeout is not None:
+            with deadline(timeout):
+                return await self.async_set_attributes(attributes)
+        if not isinstance(self.dirigera_client, AbstractAsyncSmartHomeHub):
+            raise TypeError("This group is not bound to an async hub")
+        data = [{"attributes": attributes}]
+        result = GroupResult()
+        if self.device_set_id is not None:
+            try:
+                response = await self.dirigera_client.patch(f"/devices/set/{self.device_set_id}", data)
+                result.results = {id_: response for id_ in self.ids}
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                result.errors = {id_: err for id_ in self.ids}
+        else:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def send(id_: str) -> Any:
+                async with semaphore:
+                    return await self.dirigera_client.patch(f"/devices/{id_}", data)
+
+            ids = self.ids
+            responses = await asyncio.gather(*(send(id_) for id_ in ids), return_exceptions=True)
+            for id_, response in zip(ids, responses):
+                if isinstance(response, Exception):
+                    result.errors[id_] = response
+                elif isinstance(response, BaseException):
+                    raise response  # cancellation and interrupts are not per device failures
+                else:
+                    result.results[id_] = response
+        self._apply(result, attributes)
+        return result
+
+    def set_on(self, is_on: bool, timeout: Optional[float] = None) -> GroupResult:
+        return self.set_attributes({"isOn": is_on}, timeout)
+
+    async def async_set_on(self, is_on: bool, timeout: Optional[float] = None) -> GroupResult:
+        return await self.async_set_attributes({"isOn": is_on}, timeout)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import ValidationError
+
+from .abstract_smart_home_hub import AbstractSmartHomeHub
+from .device_cache import DEVICE_ROUTE_PREFIX
+from .. import devices as device_models
+from ..devices.device import Device
+
+if TYPE_CHECKING:
+    from ..devices.scene import Scene
+
+logger = logging.getLogger(__name__)
+
+DeviceT = TypeVar("DeviceT", bound=Device)
+
+INDEXED_KEYS: Dict[str, Callable[[Device], Optional[str]]] = {
+    "name": lambda device: device.attributes.custom_name,
+    "room": lambda device: device.room.id if device.room is not None else None,
+    "type": lambda device: device.type,
+    "device_type": lambda device: device.device_type,
+    "relation_id": lambda device: device.relation_id,
+}
+
+
+class DeviceRegistry:
+    """
+    Device and scene models indexed by id, custom name, room id, type, device type and relation id.
+
+    The indexes are kept current incrementally: only a changed device is re-indexed.
+    Lookups are dict accesses and never go to the hub.
+    """
+
+    def __init__(self, devices: Iterable[Device] = (), scenes: Iterable[Scene] = ()) -> None:
+        self._lock = threading.RLock()
+        self._devices: Dict[str, Device] = {}
+        self._keys: Dict[str, Tuple[Optional[str], ...]] = {}
+        self._indexes: Dict[str, Dict[str, Dict[str, Device]]] = {key: {} for key in INDEXED_KEYS}
+        self._scenes: Dict[str, Scene] = {}
+        self._scenes_by_name: Dict[str, Dict[str, Scene]] = {}
+        self.set_devices(devices)
+        self.set_scenes(scenes)
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, id_: object) -> bool:
+        return id_ in self._devices
+
+    def set_devices(self, devices: Iterable[Device]) -> None:
+        """
+        Replaces the inventory, devices that kept their id are re-indexed in place
+        """
+        with self._lock:
+            devices = list(devices)
+            ids = {device.id for device in devices}
+            for id_ in [id_ for id_ in self._devices if id_ not in ids]:
+                self.remove(id_)
+            for device in devices:
+                self.add(device)
+
+    def add(self, device: Device) -> None:
+        """
+        Adds a device or replaces the device with the same id
+        """
+        with self._lock:
+            self._unindex(device.id)
+            self._devices[device.id] = device
+            keys = tuple(get_key(device) for get_key in INDEXED_KEYS.values())
+            self._keys[device.id] = keys
+            for index, key in zip(self._indexes.values(), keys):
+                if key is not None:
+                    index.setdefault(key, {})[device.id] = device
+
+    def remove(self, id_: str) -> Optional[Device]:
+        with self._lock:
+            self._unindex(id_)
+            return self._devices.pop(id_, None)
+
+    def reindex(self, id_: str) -> None:
+        """
+        Updates the indexes after the indexed fields of a registered device changed
+        """
+        with self._lock:
+            device = self._devices.get(id_)
+            if device is not None:
+                self.add(device)
+
+    def apply_patch(self, route: str, data: List[Dict[str, Any]]) -> None:
+        """
+        Applies a successful PATCH of /devices/{id} to the registered model and re-indexes it,
+        so a renamed device is found by its new name right away
+        """
+        if not route.startswith(DEVICE_ROUTE_PREFIX):
+            return
+        with self._lock:
+            device = self._devices.get(route[len(DEVICE_ROUTE_PREFIX):])
+            if device is None:
+                return
+            for change in data:
+                device.apply_state(change)
+            self.reindex(device.id)
+
+    def _unindex(self, id_: str) -> None:
+        keys = self._keys.pop(id_, None)
+        if keys is None:
+            return
+        for index, key in zip(self._indexes.values(), keys):
+            if key is None:
+                continue
+            entries = index.get(key)
+            if entries is not None:
+                entries.pop(id_, None)
+                if not entries:
+                    del index[key]
+
+    def _lookup(self, index: str, key: str) -> List[Device]:
+        with self._lock:
+            return list(self._indexes[index].get(key, {}).values())
+
+    def get(self, id_: str) -> Optional[Device]:
+        return self._devices.get(id_)
+
+    def all(self) -> List[Device]:
+        with self._lock:
+            return list(self._devices.values())
+
+    def by_name(self, name: str) -> List[Device]:
+        return self._lookup("name", name)
+
+    def by_room(self, room_id: str) -> List[Device]:
+        return self._lookup("room", room_id)
+
+    def by_type(self, type_: str) -> List[Device]:
+        return self._lookup("type", type_)
+
+    def by_device_type(self, device_type: str) -> List[Device]:
+        return self._lookup("device_type", device_type)
+
+    def by_relation_id(self, relation_id: str) -> List[Device]:
+        return self._lookup("relation_id", relation_id)
+
+    def find_by_name(self, name: str, device_class: Type[DeviceT]) -> List[DeviceT]:
+        """
+        Returns the devices of the given model class with this custom name
+        """
+        return [device for device in self.by_name(name) if isinstance(device, device_class)]
+
+    def set_scenes(self, scenes: Iterable[Scene]) -> None:
+        with self._lock:
+            self._scenes = {}
+            self._scenes_by_name = {}
+            for scene in scenes:
+                self.add_scene(scene)
+
+    def add_scene(self, scene: Scene) -> None:
+        with self._lock:
+            self.remove_scene(scene.id)
+            self._scenes[scene.id] = scene
+            self._scenes_by_name.setdefault(scene.info.name, {})[scene.id] = scene
+
+    def remove_scene(self, id_: str) -> Optional[Scene]:
+        with self._lock:
+            scene = self._scenes.pop(id_, None)
+            if scene is not None:
+                entries = self._scenes_by_name[scene.info.name]
+                entries.pop(id_, None)
+                if not entries:
+                    del self._scenes_by_name[scene.info.name]
+            return scene
+
+    def get_scene(self, id_: str) -> Optional[Scene]:
+        return self._scenes.get(id_)
+
+    def scenes_by_name(self, name: str) -> List[Scene]:
+        with self._lock:
+            return list(self._scenes_by_name.get(name, {}).values())
+
+    def handle_event(self, event: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> None:
+        """
+        Applies a parsed websocket event, new devices and scenes are bound to dirigera_client.
+        Payloads that do not validate are logged and skipped.
+        """
+        event_type = event.get("type")
+        data = event.get("data")
+        if not isinstance(data, dict) or "id" not in data:
+            return
+        try:
+            self._handle_event(event_type, data, dirigera_client)
+        except ValidationError:
+            logger.warning("Ignoring malformed %s event for %s", event_type, data["id"], exc_info=True)
+
+    def _handle_event(self, event_type: Any, data: Dict[str, Any], dirigera_client: AbstractSmartHomeHub) -> None:
+        with self._lock:
+            if event_type == "deviceStateChanged":
+                device = self._devices.get(data["id"])
+                if device is not None:
+                    device.apply_state(data)
+                    self.reindex(device.id)
+            elif event_type == "deviceAdded":
+                self.add(device_models.dict_to_device(data, dirigera_client))
+            elif event_type == "deviceRemoved":
+                self.remove(data["id"])
+            elif event_type in ("sceneCreated", "sceneUpdated"):
+                self.add_scene(device_models.dict_to_scene(data, dirigera_client))
+            elif event_type == "sceneDeleted":
+                self.remove_scene(data["id"])
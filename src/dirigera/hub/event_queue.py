@@ -0,0 +1,173 @@
+import collections
+import json
+import logging
+import threading
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "dropOldest"
+    COALESCE = "coalesce"
+
+
+class QueuedEvent:  # pylint: disable=too-few-public-methods
+    """
+    A websocket message waiting in the EventQueue together with its parsed dict
+    """
+
+    __slots__ = ("message", "event")
+
+    def __init__(self, message: str, event: Optional[Dict[str, Any]]) -> None:
+        self.message = message
+        self.event = event
+
+    @property
+    def coalesce_key(self) -> Optional[str]:
+        """
+        Device id of a state change, these can be merged with a later change of the same device
+        """
+        event = self.event
+        if event is None or event.get("type") != "deviceStateChanged":
+            return None
+        data = event.get("data")
+        if not isinstance(data, dict):
+            return None
+        return data.get("id")
+
+    def merge(self, newer: "QueuedEvent") -> None:
+        """
+        Folds a later state change of the same device into this one, newer attributes win
+        """
+        assert self.event is not None and newer.event is not None
+        data = {**self.event["data"], **newer.event["data"]}
+        data["attributes"] = {
+            **(self.event["data"].get("attributes") or {}),
+            **(newer.event["data"].get("attributes") or {}),
+        }
+        self.event = {**newer.event, "data": data}
+        self.message = json.dumps(self.event)
+
+
+class EventQueue:
+    def __init__(
+        self,
+        handler: Callable[[QueuedEvent], Any],
+        maxsize: int = 1000,
+        workers: int = 1,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    ) -> None:
+        """
+        Bounded queue between the websocket thread and a pool of worker threads that run handler.
+
+        Args:
+            handler (Callable[[QueuedEvent], Any]): Called on a worker thread for every queued event.
+            maxsize (int, optional): Maximum number of waiting events. Defaults to 1000.
+            workers (int, optional): Number of worker threads. With more than one worker, events
+                may be handled out of order. Defaults to 1.
+            overflow (OverflowPolicy, optional): What put does when the queue is full. BLOCK waits for a free
+                slot, DROP_OLDEST discards the oldest waiting event, COALESCE merges state changes of a device
+                that is still waiting and otherwise drops the oldest. Defaults to OverflowPolicy.BLOCK.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.handler = handler
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: Deque[QueuedEvent] = collections.deque()
+        self._pending: Dict[str, QueuedEvent] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._active = 0
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._work, name=f"dirigera-events-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: QueuedEvent) -> None:
+        """
+        Queues an event, see OverflowPolicy for what happens when the queue is full
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            key = item.coalesce_key if self.overflow == OverflowPolicy.COALESCE else None
+            if key is not None and key in self._pending:
+                self._pending[key].merge(item)
+                self.coalesced += 1
+                return
+            while len(self._items) >= self.maxsize:
+                if self.overflow == OverflowPolicy.BLOCK:
+                    self._condition.wait()
+                    if self._stopped:
+                        return
+                else:
+                    self._discard(self._items.popleft())
+                    self.dropped += 1
+            self._items.append(item)
+            if key is not None:
+                self._pending[key] = item
+            self._condition.notify_all()
+
+    def _discard(self, item: QueuedEvent) -> None:
+        key = item.coalesce_key
+        if key is not None and self._pending.get(key) is item:
+            del self._pending[key]
+
+    def _take(self) -> Optional[QueuedEvent]:
+        with self._condition:
+            while not self._items and not self._stopped:
+                self._condition.wait()
+            if self._stopped:
+                return None
+            item = self._items.popleft()
+            self._discard(item)
+            self._active += 1
+            self._condition.notify_all()
+            return item
+
+    def _work(self) -> None:
+        while True:
+            item = self._take()
+            if item is None:
+                return
+            try:
+                self.handler(item)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Event handler failed")
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued event has been handled, returns False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._items and self._active == 0, timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the workers after their current event, events still waiting are discarded
+        """
+        with self._condition:
+            self._stopped = True
+            self._items.clear()
+            self._pending.clear()
+            self._condition.notify_all()
+        current = threading.current_thread()
+        for thread in self._threads:
+            if thread is not current:
+                thread.join(timeout)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+import datetime
+import itertools
+import json
+import logging
+import threading
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from ..devices.base_ikea_model import BaseIkeaModel
+
+logger = logging.getLogger(__name__)
+
+
+class EventType(Enum):
+    DEVICE_STATE_CHANGED = "deviceStateChanged"
+    DEVICE_ADDED = "deviceAdded"
+    DEVICE_REMOVED = "deviceRemoved"
+    SCENE_TRIGGERED = "sceneTriggered"
+    SCENE_CREATED = "sceneCreated"
+    SCENE_UPDATED = "sceneUpdated"
+    SCENE_DELETED = "sceneDeleted"
+
+
+class HubEvent(BaseIkeaModel):
+    """
+    Websocket event as sent by the hub, data is kept as the raw dict
+    """
+
+    id: Optional[str] = None
+    type: str
+    time: Optional[datetime.datetime] = None
+    source: Optional[str] = None
+    data: Dict[str, Any] = {}
+
+    @property
+    def device_id(self) -> Optional[str]:
+        return None
+
+    @property
+    def device_type(self) -> Optional[str]:
+        return None
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        return {}
+
+
+class DeviceEvent(HubEvent):
+    @property
+    def device_id(self) -> Optional[str]:
+        return self.data.get("id")
+
+    @property
+    def device_type(self) -> Optional[str]:
+        return self.data.get("deviceType")
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        return self.data.get("attributes") or {}
+
+
+class DeviceStateChangedEvent(DeviceEvent):
+    pass
+
+
+class DeviceAddedEvent(DeviceEvent):
+    pass
+
+
+class DeviceRemovedEvent(DeviceEvent):
+    pass
+
+
+class SceneEvent(HubEvent):
+    @property
+    def scene_id(self) -> Optional[str]:
+        return self.data.get("id")
+
+
+class SceneTriggeredEvent(SceneEvent):
+    pass
+
+
+class SceneCreatedEvent(SceneEvent):
+    pass
+
+
+class SceneUpdatedEvent(SceneEvent):
+    pass
+
+
+class SceneDeletedEvent(SceneEvent):
+    pass
+
+
+EVENT_CLASSES: Dict[str, Type[HubEvent]] = {
+    EventType.DEVICE_STATE_CHANGED.value: DeviceStateChangedEvent,
+    EventType.DEVICE_ADDED.value: DeviceAddedEvent,
+    EventType.DEVICE_REMOVED.value: DeviceRemovedEvent,
+    EventType.SCENE_TRIGGERED.value: SceneTriggeredEvent,
+    EventType.SCENE_CREATED.value: SceneCreatedEvent,
+    EventType.SCENE_UPDATED.value: SceneUpdatedEvent,
+    EventType.SCENE_DELETED.value: SceneDeletedEvent,
+}
+
+
+def dict_to_event(data: Dict[str, Any]) -> HubEvent:
+    """
+    Builds the typed event for the events type, unknown types are returned as HubEvent
+    """
+    return EVENT_CLASSES.get(data.get("type", ""), HubEvent)(**data)
+
+
+def parse_event(message: str) -> Optional[HubEvent]:
+    """
+    Parses a raw websocket message, returns None for messages that are no events
+    """
+    try:
+        data = json.loads(message)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or "type" not in data:
+        return None
+    return dict_to_event(data)
+
+
+EventCallback = Callable[[HubEvent], Any]
+
+
+class Subscription:  # pylint: disable=too-few-public-methods
+    def __init__(
+        self,
+        callback: EventCallback,
+        event_type: Optional[str],
+        device_id: Optional[str],
+        device_type: Optional[str],
+        attribute: Optional[str],
+    ) -> None:
+        self.callback = callback
+        self.event_type = event_type
+        self.device_id = device_id
+        self.device_type = device_type
+        self.attribute = attribute
+        self.index = "all"
+        self.key: Optional[str] = None
+        for index, key in (
+            ("device_id", device_id),
+            ("attribute", attribute),
+            ("device_type", device_type),
+            ("event_type", event_type),
+        ):
+            if key is not None:
+                self.index, self.key = index, key
+                break
+
+    def matches(self, event: HubEvent) -> bool:
+        return (
+            (self.event_type is None or event.type == self.event_type)
+            and (self.device_id is None or event.device_id == self.device_id)
+            and (self.device_type is None or event.device_type == self.device_type)
+            and (self.attribute is None or self.attribute in event.attributes)
+        )
+
+
+class EventRouter:
+    """
+    Dispatches typed hub events to subscribers.
+
+    Every subscription is indexed by its most selective filter (device id, attribute, device type,
+    event type), so an event is only checked against subscriptions that can match it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._indexes: Dict[str, Dict[Optional[str], Dict[int, Subscription]]] = {
+            "device_id": {},
+            "attribute": {},
+            "device_type": {},
+            "event_type": {},
+            "all": {},
+        }
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        callback: EventCallback,
+        event_type: Optional[EventType] = None,
+        device_id: Optional[str] = None,
+        device_type: Optional[str] = None,
+        attribute: Optional[str] = None,
+    ) -> int:
+        """
+        Registers callback for all events matching every given filter and returns a subscription id.
+
+        Args:
+            callback (Callable[[HubEvent], Any]): Called with the typed event.
+            event_type (EventType, optional): Only events of this type.
+            device_id (str, optional): Only events of this device.
+            device_type (str, optional): Only events of devices with this deviceType, e.g. "light".
+            attribute (str, optional): Only events carrying this attribute, e.g. "isOn".
+        """
+        subscription = Subscription(
+            callback,
+            event_type.value if event_type is not None else None,
+            device_id,
+            device_type,
+            attribute,
+        )
+        with self._lock:
+            subscription_id = next(self._ids)
+            self._subscriptions[subscription_id] = subscription
+            self._indexes[subscription.index].setdefault(subscription.key, {})[subscription_id] = subscription
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> None:
+        with self._lock:
+            subscription = self._subscriptions.pop(subscription_id, None)
+            if subscription is None:
+                return
+            index = self._indexes[subscription.index]
+            entries = index[subscription.key]
+            entries.pop(subscription_id, None)
+            if not entries:
+                del index[subscription.key]
+
+    def _candidates(self, event: HubEvent) -> List[Subscription]:
+        with self._lock:
+            candidates: Dict[int, Subscription] = {}
+            indexes = self._indexes
+            if event.device_id is not None:
+                candidates.update(indexes["device_id"].get(event.device_id, {}))
+            for attribute in event.attributes:
+                candidates.update(indexes["attribute"].get(attribute, {}))
+            if event.device_type is not None:
+                candidates.update(indexes["device_type"].get(event.device_type, {}))
+            candidates.update(indexes["event_type"].get(event.type, {}))
+            candidates.update(indexes["all"].get(None, {}))
+            return [candidates[key] for key in sorted(candidates)]
+
+    def dispatch(self, event: HubEvent) -> None:
+        """
+        Calls every matching subscriber in subscription order, a failing callback does not stop the others
+        """
+        for subscription in self._candidates(event):
+            if not subscription.matches(event):
+                continue
+            try:
+                subscription.callback(event)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Event callback failed for %s", event.type)
+
+    def handle_message(self, message: str) -> None:
+        event = parse_event(message)
+        if event is not None:
+            self.dispatch(event)
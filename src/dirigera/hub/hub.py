@@ -1,30 +1,65 @@
-# pylint:disable=too-many-public-methods
+# pylint:disable=too-many-public-methods,too-many-lines
+from __future__ import annotations
+import contextlib
+import contextvars
+import functools
+import json
+import logging
 import ssl
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type, Union
 import requests
-import websocket  # type: ignore
 import urllib3
+from pydantic import ValidationError
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import InsecureRequestWarning
 
 from .utils import camelize_dict
-from ..devices.device import Device
+from .device_group import DeviceGroup
+from .device_cache import DeviceCache
+from .device_registry import DeviceRegistry
+from .events import EventRouter, dict_to_event
+from .resync import Backoff, diff_devices
+from .deadlines import DeadlineExceeded, remaining_time, request_timeout
 from .abstract_smart_home_hub import AbstractSmartHomeHub
-from ..devices.air_purifier import AirPurifier, dict_to_air_purifier
-from ..devices.light import Light, dict_to_light
-from ..devices.blinds import Blind, dict_to_blind
-from ..devices.controller import Controller, dict_to_controller
-from ..devices.outlet import Outlet, dict_to_outlet
-from ..devices.environment_sensor import EnvironmentSensor, dict_to_environment_sensor
-from ..devices.motion_sensor import MotionSensor, dict_to_motion_sensor
-from ..devices.open_close_sensor import OpenCloseSensor, dict_to_open_close_sensor
-from ..devices.scene import Action, Info, Scene, SceneType, Trigger, dict_to_scene
-from ..devices.water_sensor import WaterSensor, dict_to_water_sensor
-from ..devices.occupancy_sensor import OccupancySensor, dict_to_occupancy_sensor
-from ..devices.light_sensor import LightSensor, dict_to_light_sensor
+from .. import devices as device_models
+from ..devices.device import Device
+
+if TYPE_CHECKING:
+    # The optional subsystems are imported when they are enabled, a plain Hub never loads them
+    from .event_queue import EventQueue, OverflowPolicy, QueuedEvent
+    from .write_behind import WriteBehind
+    from .rate_limiter import AdaptiveRateLimiter
+    from .keyed_executor import KeyedExecutor, LaneStats, Priority
+    from .resilience import CircuitBreaker, RetryPolicy
+    from .single_flight import ReadCache, SingleFlight
+    from .snapshot import InventorySnapshot
+    from .bulk_fetch import FetchResult
+    from ..devices.device_factory import DeviceT
+    from ..devices.lazy_device import LazyDevice
+    from ..devices.air_purifier import AirPurifier
+    from ..devices.light import Light
+    from ..devices.blinds import Blind
+    from ..devices.controller import Controller
+    from ..devices.outlet import Outlet
+    from ..devices.environment_sensor import EnvironmentSensor
+    from ..devices.motion_sensor import MotionSensor
+    from ..devices.open_close_sensor import OpenCloseSensor
+    from ..devices.scene import Action, Info, Scene, SceneType, Trigger
+    from ..devices.water_sensor import WaterSensor
+    from ..devices.occupancy_sensor import OccupancySensor
+    from ..devices.light_sensor import LightSensor
 
 urllib3.disable_warnings(category=InsecureRequestWarning)
 
+logger = logging.getLogger(__name__)
+
+# lane set with Hub.priority(), copied into the worker threads of device groups and the command executor
+_priority: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar("dirigera_priority", default=None)
+
 
 class Hub(AbstractSmartHomeHub):
     def __init__(
@@ -33,6 +68,8 @@ class Hub(AbstractSmartHomeHub):
         ip_address: str,
         port: str = "8443",
         api_version: str = "v1",
+        pool_maxsize: int = 10,
+        timeout: float = 10.0,
     ) -> None:
         """
         Initializes a new instance of the Hub class.
@@ -42,11 +79,362 @@ class Hub(AbstractSmartHomeHub):
             ip_address (str): The IP address of the hub.
             port (str, optional): The port number for the hub API. Defaults to "8443".
             api_version (str, optional): The version of the API to use. Defaults to "v1".
+            pool_maxsize (int, optional): Number of keep-alive connections kept open to the hub. Defaults to 10.
+            timeout (float, optional): Timeout of a single request in seconds, shortened to the current deadline.
+                Defaults to 10.
         """
         self.api_base_url = f"https://{ip_address}:{port}/{api_version}"
         self.websocket_base_url = f"wss://{ip_address}:{port}/{api_version}"
         self.token = token
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
         self.wsapp: Any = None
+        self.event_queue: Optional[EventQueue] = None
+        self.listener_thread: Optional[threading.Thread] = None
+        self._listener_stopped = threading.Event()
+        self._known_devices: Optional[DeviceCache] = None
+        self.write_behind: Optional[WriteBehind] = None
+        self.read_limiter: Optional[AdaptiveRateLimiter] = None
+        self.write_limiter: Optional[AdaptiveRateLimiter] = None
+        self.retry_policy: Optional[RetryPolicy] = None
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        self.probe_route = "/hub/status"
+        self.command_executor: Optional[KeyedExecutor] = None
+        self._command_executor_lock = threading.Lock()
+        self.session = self._create_session(pool_maxsize)
+        self.device_cache: Optional[DeviceCache] = None
+        self.read_cache: Optional[ReadCache] = None
+        self._single_flight: Optional[SingleFlight] = None
+        self._single_flight_lock = threading.Lock()
+        self.fleet_size: Optional[int] = None
+        self.snapshot: Optional[InventorySnapshot] = None
+        self.device_registry: Optional[DeviceRegistry] = None
+        self.events = EventRouter()
+
+    def __enter__(self) -> Hub:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _create_session(pool_maxsize: int) -> requests.Session:
+        """
+        Creates the session shared by all requests, connections (and their TLS sessions) are kept alive and reused
+        """
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        return session
+
+    def enable_device_cache(self, max_age: Optional[float] = 60) -> DeviceCache:
+        """
+        Serves /devices and /devices/{id} reads from memory.
+        Takes one snapshot of /devices that is kept current by the events of create_event_listener.
+
+        Args:
+            max_age (float, optional): Seconds the snapshot is trusted without a new snapshot or event,
+                afterwards reads go to the hub again and refresh it. None trusts it forever. Defaults to 60.
+        """
+        self.device_cache = DeviceCache(max_age=max_age)
+        self.get("/devices")
+        return self.device_cache
+
+    def disable_device_cache(self) -> None:
+        self.device_cache = None
+
+    def enable_read_cache(self, ttl: float = 1.0) -> ReadCache:
+        """
+        Serves repeated GET requests of a route from memory for ttl seconds. Every PATCH, POST or DELETE
+        drops the cached responses of its collection, e.g. a PATCH of /devices/{id} drops /devices.
+        The cached responses are shared between callers and must not be modified.
+
+        Args:
+            ttl (float, optional): Seconds a response is reused. Defaults to 1.
+        """
+        from .single_flight import ReadCache  # pylint: disable=import-outside-toplevel
+
+        self.read_cache = ReadCache(ttl=ttl)
+        return self.read_cache
+
+    def disable_read_cache(self) -> None:
+        self.read_cache = None
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Writes the current /devices and /scenes payloads to path for a later warm_start
+        """
+        from .snapshot import save_snapshot  # pylint: disable=import-outside-toplevel
+
+        save_snapshot(path, self.get("/devices"), self.get("/scenes"))
+
+    def warm_start(self, path: str, refresh: bool = True, max_age: Optional[float] = None) -> Optional[Future]:
+        """
+        Serves /devices and /scenes reads from the snapshot saved at path, without waiting for the hub.
+
+        With refresh, the hub is asked again in the background: devices that changed meanwhile are reported
+        like websocket events (to the device cache, the registry and the event subscriptions), the snapshot
+        is dropped and the file is rewritten. The returned Future resolves to those events.
+        Without refresh, the snapshot is served until it is older than max_age, reads go to the hub after that.
+        Returns None if there is no usable snapshot at path.
+
+        Args:
+            path (str): The file written by save_snapshot.
+            refresh (bool, optional): Ask the hub again in the background. Defaults to True.
+            max_age (float, optional): Seconds since the snapshot was saved after which it is no longer served.
+                Defaults to None, no limit.
+        """
+        from .snapshot import load_snapshot  # pylint: disable=import-outside-toplevel
+
+        snapshot = load_snapshot(path, max_age)
+        if snapshot is None:
+            return None
+        self.snapshot = snapshot
+        devices = snapshot.collection("devices")
+        if devices is not None:
+            self.fleet_size = len(devices)
+        if not refresh:
+            return None
+        future: Future = Future()
+
+        def reconcile() -> None:
+            try:
+                future.set_result(self._reconcile_snapshot(snapshot, path))
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.exception("Refreshing the snapshot failed")
+                future.set_exception(err)
+
+        threading.Thread(target=reconcile, name="dirigera-snapshot-refresh", daemon=True).start()
+        return future
+
+    def _reconcile_snapshot(self, snapshot: InventorySnapshot, path: str) -> List[Dict[str, Any]]:
+        from .snapshot import save_snapshot  # pylint: disable=import-outside-toplevel
+
+        devices = self._get("/devices")
+        scenes = self._get("/scenes")
+        known = snapshot.collection("devices")
+        events = diff_devices(known, devices) if known is not None else []
+        if self.snapshot is snapshot:
+            self.snapshot = None
+        for event in events:
+            self._handle_event(event)
+        save_snapshot(path, devices, scenes)
+        return events
+
+    def enable_device_registry(self) -> DeviceRegistry:
+        """
+        Loads all devices and scenes into a DeviceRegistry that answers the get_*_by_name lookups
+        without a request. The registry is kept current by the events of create_event_listener,
+        the returned models are shared and updated in place.
+        """
+        self.device_registry = DeviceRegistry(self.get_all_devices(), self.get_scenes())
+        return self.device_registry
+
+    def disable_device_registry(self) -> None:
+        self.device_registry = None
+
+    def enable_write_behind(self, max_rate: float = 10.0) -> WriteBehind:
+        """
+        Device setters no longer block on their PATCH. Writes are coalesced per device and attribute,
+        only the latest value is sent, at most max_rate times per second and device.
+        The Future of the latest setter call is available as device.last_write.
+
+        Args:
+            max_rate (float, optional): Maximum number of PATCH requests per device and second. Defaults to 10.
+        """
+        self.disable_write_behind()
+        from .write_behind import WriteBehind  # pylint: disable=import-outside-toplevel
+
+        self.write_behind = WriteBehind(self, max_rate=max_rate, max_workers=self.pool_maxsize)
+        return self.write_behind
+
+    def disable_write_behind(self, timeout: Optional[float] = None) -> None:
+        """
+        Sends the pending writes, afterwards setters block on their PATCH again.
+        Writes that have not been sent within timeout seconds are cancelled.
+        """
+        if self.write_behind is not None:
+            self.write_behind.close(timeout)
+            self.write_behind = None
+
+    def enable_rate_limiter(
+        self,
+        read_limiter: Optional[AdaptiveRateLimiter] = None,
+        write_limiter: Optional[AdaptiveRateLimiter] = None,
+    ) -> None:
+        """
+        Paces all requests with adaptive token buckets, GET requests and writes (PATCH, POST, DELETE)
+        have separate buckets. The rates grow while the hub answers quickly and back off on
+        429/5xx responses, failed connections and slow responses.
+
+        Args:
+            read_limiter (AdaptiveRateLimiter, optional): Defaults to 20 requests per second, adapting up to 100.
+            write_limiter (AdaptiveRateLimiter, optional): Defaults to 10 requests per second, adapting up to 50.
+        """
+        from .rate_limiter import AdaptiveRateLimiter  # pylint: disable=import-outside-toplevel
+
+        self.read_limiter = read_limiter or AdaptiveRateLimiter(rate=20.0, max_rate=100.0)
+        self.write_limiter = write_limiter or AdaptiveRateLimiter(rate=10.0, max_rate=50.0)
+
+    def disable_rate_limiter(self) -> None:
+        self.read_limiter = None
+        self.write_limiter = None
+
+    def enable_retries(self, retry_policy: Optional[RetryPolicy] = None) -> RetryPolicy:
+        """
+        Retries idempotent requests (GET and PATCH by default) after failed connections, timeouts and
+        429/502/503/504 responses, with exponential backoff and jitter, as long as the current deadline allows.
+        """
+        from .resilience import RetryPolicy  # pylint: disable=import-outside-toplevel
+
+        self.retry_policy = retry_policy or RetryPolicy()
+        return self.retry_policy
+
+    def disable_retries(self) -> None:
+        self.retry_policy = None
+
+    def enable_circuit_breaker(
+        self, circuit_breaker: Optional[CircuitBreaker] = None, probe_route: str = "/hub/status"
+    ) -> CircuitBreaker:
+        """
+        Fails requests immediately with CircuitOpenError while the hub is down, instead of letting every caller
+        wait for its timeout. While open, probe_route is polled in the background until the hub answers again.
+        """
+        self.disable_circuit_breaker()
+        self.probe_route = probe_route
+        from .resilience import CircuitBreaker  # pylint: disable=import-outside-toplevel
+
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.circuit_breaker.probe = self._probe
+        return self.circuit_breaker
+
+    def disable_circuit_breaker(self) -> None:
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.stop()
+            self.circuit_breaker = None
+
+    def rate_limits(self) -> Dict[str, Optional[float]]:
+        """
+        Current requests per second of the read and write buckets, None if not limited
+        """
+        return {
+            "read": self.read_limiter.rate if self.read_limiter is not None else None,
+            "write": self.write_limiter.rate if self.write_limiter is not None else None,
+        }
+
+    def submit_write(
+        self,
+        device_id: str,
+        attributes: Dict[str, Any],
+        on_success: Optional[Callable[[], Any]] = None,
+    ) -> Optional[Future]:
+        if self.write_behind is None:
+            return None
+        return self.write_behind.submit(device_id, attributes, on_success)
+
+    def _on_message(self, on_message: Any) -> Any:
+        def dispatch(wsapp: Any, message: str) -> None:
+            event_queue = self.event_queue
+            if event_queue is not None:
+                from .event_queue import OverflowPolicy, QueuedEvent  # pylint: disable=import-outside-toplevel
+
+                parse = self._has_event_consumers() or event_queue.overflow == OverflowPolicy.COALESCE
+                event_queue.put(QueuedEvent(message, self._parse_message(message) if parse else None))
+                return
+            self._handle_message(message)
+            if on_message is not None:
+                on_message(wsapp, message)
+
+        return dispatch
+
+    def _has_event_consumers(self) -> bool:
+        return (
+            self.device_cache is not None
+            or self.device_registry is not None
+            or self._known_devices is not None
+            or len(self.events) > 0
+        )
+
+    @staticmethod
+    def _parse_message(message: str) -> Optional[Dict[str, Any]]:
+        try:
+            event = json.loads(message)
+        except ValueError:
+            return None
+        return event if isinstance(event, dict) else None
+
+    def _handle_message(self, message: str) -> None:
+        """
+        Parses a websocket message once and hands it to the device cache, registry and event subscribers
+        """
+        if not self._has_event_consumers():
+            return
+        event = self._parse_message(message)
+        if event is not None:
+            self._handle_event(event)
+
+    def _handle_event(self, event: Dict[str, Any]) -> None:
+        """
+        Hands the event to every consumer, a consumer that fails is logged and does not stop the others
+        """
+        known_devices = self._known_devices
+        if known_devices is not None:
+            self._consume("resync state", known_devices.handle_event, event)
+        device_cache = self.device_cache
+        if device_cache is not None:
+            self._consume("device cache", device_cache.handle_event, event)
+        device_registry = self.device_registry
+        if device_registry is not None:
+            handle_event = functools.partial(device_registry.handle_event, dirigera_client=self)
+            self._consume("device registry", handle_event, event)
+        if len(self.events) > 0 and "type" in event:
+            self._consume("event router", self._route_event, event)
+
+    @staticmethod
+    def _consume(name: str, consumer: Callable[[Dict[str, Any]], Any], event: Dict[str, Any]) -> None:
+        try:
+            consumer(event)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("The %s failed to handle a %s event", name, event.get("type"))
+
+    def _route_event(self, event: Dict[str, Any]) -> None:
+        try:
+            hub_event = dict_to_event(event)
+        except ValidationError:
+            logger.warning("Ignoring malformed %s event", event["type"], exc_info=True)
+            return
+        self.events.dispatch(hub_event)
+
+    def device_group(
+        self,
+        devices: Sequence[Union[Device, str]],
+        max_concurrency: Optional[int] = None,
+        device_set_id: Optional[str] = None,
+    ) -> DeviceGroup:
+        """
+        Creates a DeviceGroup to send one command to many devices concurrently.
+        max_concurrency defaults to the connection pool size.
+        """
+        return DeviceGroup(
+            self,
+            devices,
+            max_concurrency=max_concurrency or self.pool_maxsize,
+            device_set_id=device_set_id,
+        )
+
+    def close(self) -> None:
+        """
+        Stops the event listener, sends pending writes and closes all pooled connections.
+        Pending writes that have not been sent within the request timeout are cancelled.
+        """
+        self.stop_event_listener()
+        self.disable_write_behind(self.timeout)
+        self.disable_circuit_breaker()
+        if self.command_executor is not None:
+            self.command_executor.shutdown()
+            self.command_executor = None
+        self.session.close()
 
     def headers(self) -> Dict[str, Any]:
         return {"Authorization": f"Bearer {self.token}"}
@@ -64,6 +452,7 @@ class Hub(AbstractSmartHomeHub):
         ping_intervall: int = 60,
         dispatcher: Any = None,
         reconnect: int = None,
+        backoff: Optional[Backoff] = None,
     ) -> None:
         """
         Create an event listener.
@@ -79,11 +468,15 @@ class Hub(AbstractSmartHomeHub):
             on_cont_message (Any, optional)
             ping_intervall (int, optional): Ping interval in Seconds. Defaults to 60.
             dispatcher (Any, optional)
-            reconnect (int, optional)
+            reconnect (int, optional): Fixed reconnect interval in Seconds, ignored when backoff is given.
+            backoff (Backoff, optional): Reconnects with exponential backoff and jitter until the listener
+                is stopped. After every reconnect one /devices snapshot is compared with the last known
+                state and the missed changes are emitted as synthetic events.
         """
-        self.wsapp = websocket.WebSocketApp(
-            self.websocket_base_url,
-            header={"Authorization": f"Bearer {self.token}"},
+        stopped = threading.Event()
+        self._listener_stopped = stopped
+        self._listen(
+            stopped,
             on_open=on_open,
             on_message=on_message,
             on_error=on_error,
@@ -92,47 +485,419 @@ class Hub(AbstractSmartHomeHub):
             on_pong=on_pong,
             on_data=on_data,
             on_cont_message=on_cont_message,
+            ping_intervall=ping_intervall,
+            dispatcher=dispatcher,
+            reconnect=reconnect,
+            backoff=backoff,
         )
 
-        self.wsapp.run_forever(
-            sslopt={"cert_reqs": ssl.CERT_NONE}, ping_interval=ping_intervall,
-            dispatcher=dispatcher, reconnect=reconnect
+    def _listen(
+        self,
+        stopped: threading.Event,
+        on_open: Any = None,
+        on_message: Any = None,
+        on_error: Any = None,
+        on_close: Any = None,
+        on_ping: Any = None,
+        on_pong: Any = None,
+        on_data: Any = None,
+        on_cont_message: Any = None,
+        ping_intervall: int = 60,
+        dispatcher: Any = None,
+        reconnect: Optional[int] = None,
+        backoff: Optional[Backoff] = None,
+    ) -> None:
+        """
+        Runs the websocket until stopped is set, the event is owned by the caller so a stop
+        that comes before the listener thread got here is not lost
+        """
+        # the websocket stack is only needed by listening hubs
+        import websocket  # type: ignore  # pylint: disable=import-outside-toplevel
+
+        if backoff is not None:
+            self._known_devices = DeviceCache(max_age=None)
+            reconnect = 0
+        while not stopped.is_set():
+            self.wsapp = websocket.WebSocketApp(
+                self.websocket_base_url,
+                header={"Authorization": f"Bearer {self.token}"},
+                on_open=self._on_open(on_open, on_message, backoff),
+                on_message=self._on_message(on_message),
+                on_error=on_error,
+                on_close=on_close,
+                on_ping=on_ping,
+                on_pong=on_pong,
+                on_data=on_data,
+                on_cont_message=on_cont_message,
+            )
+
+            self.wsapp.run_forever(
+                sslopt={"cert_reqs": ssl.CERT_NONE}, ping_interval=ping_intervall,
+                dispatcher=dispatcher, reconnect=reconnect
+            )
+            if backoff is None or stopped.wait(backoff.next_delay()):
+                break
+        self._known_devices = None
+
+    def _on_open(self, on_open: Any, on_message: Any, backoff: Optional[Backoff]) -> Any:
+        def opened(wsapp: Any) -> None:
+            if backoff is not None:
+                backoff.reset()
+                self._resync(wsapp, on_message)
+            if on_open is not None:
+                on_open(wsapp)
+
+        return opened
+
+    def _resync(self, wsapp: Any, on_message: Any) -> None:
+        """
+        Takes a /devices snapshot, the first one is the baseline, later ones are diffed against the
+        last known state and the differences are emitted like websocket events. The snapshot is always
+        fetched from the hub, never from a cache or a warm start snapshot.
+        """
+        known_devices = self._known_devices
+        if known_devices is None:
+            return
+        known = known_devices.get_devices()
+        if self.device_cache is not None:
+            self.device_cache.clear()
+        self._invalidate_reads("/devices")
+        try:
+            current = self.get("/devices")
+        except (requests.RequestException, ValueError):
+            logger.exception("Resync after reconnect failed")
+            return
+        known_devices.set_snapshot(current)
+        if known is None:
+            return
+        for event in diff_devices(known, current):
+            self._emit_event(wsapp, event, on_message)
+
+    def _emit_event(self, wsapp: Any, event: Dict[str, Any], on_message: Any) -> None:
+        message = json.dumps(event)
+        if self.event_queue is not None:
+            from .event_queue import QueuedEvent  # pylint: disable=import-outside-toplevel
+
+            self.event_queue.put(QueuedEvent(message, event))
+            return
+        self._handle_event(event)
+        if on_message is not None:
+            on_message(wsapp, message)
+
+    def start_event_listener(
+        self,
+        on_message: Any = None,
+        on_error: Any = None,
+        workers: int = 1,
+        queue_size: int = 1000,
+        overflow: Optional[OverflowPolicy] = None,
+        ping_intervall: int = 60,
+        reconnect: Optional[int] = None,
+        backoff: Optional[Backoff] = None,
+    ) -> EventQueue:
+        """
+        Starts the event listener on a daemon thread and returns immediately.
+        The websocket thread only queues the messages, the device cache, registry, event subscribers
+        and on_message are served by a pool of worker threads, so slow callbacks never stall the socket.
+
+        Args:
+            on_message (Any, optional): Called as on_message(wsapp, message) on a worker thread.
+            on_error (Any, optional)
+            workers (int, optional): Number of worker threads. With more than one worker,
+                events may be handled out of order. Defaults to 1.
+            queue_size (int, optional): Maximum number of waiting events. Defaults to 1000.
+            overflow (OverflowPolicy, optional): Behaviour when the queue is full, see OverflowPolicy.
+                Defaults to OverflowPolicy.BLOCK.
+            ping_intervall (int, optional): Ping interval in Seconds. Defaults to 60.
+            reconnect (int, optional): Fixed reconnect interval in Seconds, ignored when backoff is given.
+            backoff (Backoff, optional): Reconnects with backoff and resyncs, see create_event_listener.
+        """
+        if self.listener_thread is not None and self.listener_thread.is_alive():
+            raise AssertionError("Event listener is already running")
+
+        def handle(item: QueuedEvent) -> None:
+            event = item.event
+            if event is None and self._has_event_consumers():
+                event = self._parse_message(item.message)
+            if event is not None:
+                self._handle_event(event)
+            if on_message is not None:
+                on_message(self.wsapp, item.message)
+
+        from .event_queue import EventQueue, OverflowPolicy  # pylint: disable=import-outside-toplevel
+
+        if overflow is None:
+            overflow = OverflowPolicy.BLOCK
+        self.event_queue = EventQueue(handle, maxsize=queue_size, workers=workers, overflow=overflow)
+        stopped = threading.Event()
+        self._listener_stopped = stopped
+        self.listener_thread = threading.Thread(
+            target=self._listen,
+            args=(stopped,),
+            kwargs={
+                "on_error": on_error,
+                "ping_intervall": ping_intervall,
+                "reconnect": reconnect,
+                "backoff": backoff,
+            },
+            name="dirigera-listener",
+            daemon=True,
         )
+        self.listener_thread.start()
+        return self.event_queue
 
     def stop_event_listener(self) -> None:
+        self._listener_stopped.set()
         if self.wsapp is not None:
             self.wsapp.close()
             self.wsapp = None
+        if self.listener_thread is not None:
+            if self.listener_thread is not threading.current_thread():
+                self.listener_thread.join(timeout=5)
+            self.listener_thread = None
+        if self.event_queue is not None:
+            self.event_queue.stop(timeout=5)
+            self.event_queue = None
+
+    def _request(self, method: str, route: str, data: Any = None) -> requests.Response:
+        """
+        Sends a request, retried according to the retry policy if one is enabled and the method is idempotent
+        """
+        if method == "GET":
+            return self._retry(method, route, data)
+        try:
+            return self._retry(method, route, data)
+        finally:
+            self._invalidate_reads(route)
+
+    def _invalidate_reads(self, route: str) -> None:
+        """
+        After a write, GET requests of the same collection neither join a request already in flight
+        nor use the read cache
+        """
+        if self._single_flight is not None:
+            self._single_flight.forget(route)
+        if self.snapshot is not None:
+            self.snapshot.invalidate(route)
+        if self.read_cache is not None:
+            self.read_cache.invalidate(route)
+
+    def _retry(self, method: str, route: str, data: Any = None) -> requests.Response:
+        retry_policy = self.retry_policy
+        if retry_policy is None or method not in retry_policy.methods:
+            return self._send(method, route, data)
+        from .resilience import CircuitOpenError  # pylint: disable=import-outside-toplevel
+
+        backoff = retry_policy.backoff()
+        attempt = 1
+        while True:
+            try:
+                response = self._send(method, route, data)
+            except (DeadlineExceeded, CircuitOpenError):
+                raise
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retry_policy.attempts or not self._wait_for_retry(backoff.next_delay()):
+                    raise
+            else:
+                if (
+                    attempt >= retry_policy.attempts
+                    or response.status_code not in retry_policy.status_codes
+                    or not self._wait_for_retry(backoff.next_delay())
+                ):
+                    return response
+            attempt += 1
+
+    @staticmethod
+    def _wait_for_retry(delay: float) -> bool:
+        """
+        Sleeps before a retry, returns False if the retry would not fit into the current deadline
+        """
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            return False
+        time.sleep(delay)
+        return True
+
+    def _send(self, method: str, route: str, data: Any = None) -> requests.Response:
+        """
+        Sends a single request on the pooled session. The timeout is shortened to the current deadline,
+        the request is paced by the rate limiter of its kind and fails fast while the circuit breaker is open.
+        """
+        circuit_breaker = self.circuit_breaker
+        if circuit_breaker is not None:
+            circuit_breaker.check()
+        limiter = self.read_limiter if method == "GET" else self.write_limiter
+        if limiter is not None and not limiter.acquire(remaining_time()):
+            raise DeadlineExceeded("Deadline exceeded")
+        started = time.monotonic()
+        try:
+            response = self.session.request(
+                method,
+                f"{self.api_base_url}{route}",
+                headers=self.headers(),
+                json=data,
+                timeout=request_timeout(self.timeout),
+                verify=False,
+            )
+        except requests.RequestException:
+            if limiter is not None:
+                limiter.record(time.monotonic() - started, None)
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure()
+            raise
+        if limiter is not None:
+            limiter.record(time.monotonic() - started, response.status_code)
+        if circuit_breaker is not None:
+            if response.status_code >= 500:
+                circuit_breaker.record_failure()
+            else:
+                circuit_breaker.record_success()
+        return response
+
+    def _probe(self) -> bool:
+        """
+        True if the hub answers the probe route, used by the circuit breaker
+        """
+        try:
+            response = self.session.get(
+                f"{self.api_base_url}{self.probe_route}", headers=self.headers(), timeout=self.timeout, verify=False
+            )
+        except requests.RequestException:
+            return False
+        return response.status_code < 500
+
+    def _get_single_flight(self) -> SingleFlight:
+        if self._single_flight is None:
+            with self._single_flight_lock:
+                if self._single_flight is None:
+                    from .single_flight import SingleFlight  # pylint: disable=import-outside-toplevel
+
+                    self._single_flight = SingleFlight()
+        return self._single_flight
+
+    def _get_command_executor(self) -> KeyedExecutor:
+        if self.command_executor is None:
+            with self._command_executor_lock:
+                if self.command_executor is None:
+                    from .keyed_executor import KeyedExecutor  # pylint: disable=import-outside-toplevel
+
+                    self.command_executor = KeyedExecutor(max_workers=self.pool_maxsize)
+        return self.command_executor
+
+    @contextlib.contextmanager
+    def priority(self, priority: Priority) -> Iterator[None]:
+        """
+        Sends the PATCH requests of the calling context, including all device setters and device groups,
+        in the given priority lane:
+
+        with dirigera_hub.priority(Priority.BACKGROUND):
+            for light in lights:
+                light.set_startup_behaviour(StartupEnum.START_OFF)
+
+        Free connections always serve interactive commands first, then normal, then background ones.
+        """
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def lane_stats(self) -> Dict[Priority, LaneStats]:
+        """
+        Queue depth and latencies of the command priority lanes, empty until a PATCH was submitted
+        """
+        command_executor = self.command_executor
+        if command_executor is None:
+            from .keyed_executor import LaneStats, Priority  # pylint: disable=import-outside-toplevel
+
+            return {priority: LaneStats() for priority in Priority}
+        return command_executor.lane_stats()
+
+    def submit_patch(
+        self, route: str, data: List[Dict[str, Any]], priority: Optional[Priority] = None
+    ) -> Future:
+        """
+        Sends the PATCH on the command executor and returns its Future. PATCH requests to the same route
+        (i.e. the same device) are sent one after another in submission order, different devices in parallel.
+        The executor is created by the first submitted PATCH, patch() inside priority() submits as well. Once
+        the executor exists, patch() is routed through it too, so both stay in order.
+
+        Args:
+            route (str): The route, e.g. /devices/{id}.
+            data (List[Dict[str, Any]]): The PATCH body.
+            priority (Priority, optional): Lane of the command. Defaults to the lane set with priority(),
+                otherwise Priority.NORMAL.
+        """
+        if priority is None:
+            priority = _priority.get()
+        if priority is None:
+            from .keyed_executor import Priority  # pylint: disable=import-outside-toplevel
+
+            priority = Priority.NORMAL
+        return self._get_command_executor().submit(route, self._patch, route, data, priority=priority)
 
     def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
-        response = requests.patch(
-            f"{self.api_base_url}{route}",
-            headers=self.headers(),
-            json=data,
-            timeout=10,
-            verify=False,
-        )
+        command_executor = self.command_executor
+        if command_executor is None:
+            if _priority.get() is not None:
+                return self.submit_patch(route, data).result()
+        elif not command_executor.in_worker():
+            return self.submit_patch(route, data).result()
+        return self._patch(route, data)
+
+    def _patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
+        response = self._request("PATCH", route, data)
         response.raise_for_status()
+        if self.device_cache is not None:
+            self.device_cache.apply_patch(route, data)
+        if self.device_registry is not None:
+            self.device_registry.apply_patch(route, data)
         return response.text
 
     def get(self, route: str) -> Any:
-        response = requests.get(
-            f"{self.api_base_url}{route}",
-            headers=self.headers(),
-            timeout=10,
-            verify=False,
-        )
+        """
+        Concurrent calls for the same route share one request and its parsed response
+        """
+        if self.device_cache is not None:
+            cached = self.device_cache.lookup(route)
+            if cached is not None:
+                return cached
+        snapshot = self.snapshot
+        if snapshot is not None:
+            if snapshot.expired():
+                self.snapshot = None
+            else:
+                cached = snapshot.lookup(route)
+                if cached is not None:
+                    return cached
+        read_cache = self.read_cache
+        if read_cache is not None:
+            cached = read_cache.get(route)
+            if cached is not None:
+                return cached
+        try:
+            return self._get_single_flight().do(
+                route, lambda: self._get(route), timeout=remaining_time(), not_shared=(DeadlineExceeded,)
+            )
+        except FutureTimeoutError as err:
+            raise DeadlineExceeded("Deadline exceeded") from err
+
+    def _get(self, route: str) -> Any:
+        read_cache = self.read_cache
+        generation = read_cache.generation if read_cache is not None else 0
+        response = self._request("GET", route)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+        if route == "/devices":
+            self.fleet_size = len(data)
+        if self.device_cache is not None:
+            self.device_cache.store(route, data)
+        if read_cache is not None:
+            read_cache.put(route, data, generation)
+        return data
 
     def post(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
-        response = requests.post(
-            f"{self.api_base_url}{route}",
-            headers=self.headers(),
-            json=data,
-            timeout=10,
-            verify=False,
-        )
+        response = self._request("POST", route, data)
         if not response.ok:
             print(response.text)
         response.raise_for_status()
@@ -143,13 +908,7 @@ class Hub(AbstractSmartHomeHub):
         return response.json()
 
     def delete(self, route: str, data: Optional[Dict[str, Any]] = None) -> Any:
-        response = requests.delete(
-            f"{self.api_base_url}{route}",
-            headers=self.headers(),
-            json=data,
-            timeout=10,
-            verify=False,
-        )
+        response = self._request("DELETE", route, data)
         response.raise_for_status()
 
         if len(response.content) == 0:
@@ -168,34 +927,40 @@ class Hub(AbstractSmartHomeHub):
                 raise ValueError("Device id not found") from err
             raise err
 
+    def _get_devices(self, key: str, value: str, model: Type[DeviceT]) -> List[DeviceT]:
+        """
+        Fetches all devices whose key equals value and validates them as model in one pass
+        """
+        devices = self.get("/devices")
+        return device_models.parse_devices_as(model, [device for device in devices if device[key] == value], self)
+
     def get_air_purifiers(self) -> List[AirPurifier]:
         """
         Fetches all air purifiers registered in the Hub
         """
-        devices = self.get("/devices")
-        airpurifiers = list(filter(lambda x: x["type"] == "airPurifier", devices))
-        return [dict_to_air_purifier(air_p, self) for air_p in airpurifiers]
+        return self._get_devices("type", "airPurifier", device_models.AirPurifier)
 
     def get_air_purifier_by_id(self, id_: str) -> AirPurifier:
         air_purifier_device = self._get_device_data_by_id(id_)
         if air_purifier_device["deviceType"] != "airPurifier":
             raise ValueError("Device is not an Air Purifier")
-        return dict_to_air_purifier(air_purifier_device, self)
+        return device_models.dict_to_air_purifier(air_purifier_device, self)
 
     def get_lights(self) -> List[Light]:
         """
         Fetches all lights registered in the Hub
         """
-        devices = self.get("/devices")
-        lights = list(filter(lambda x: x["type"] == "light", devices))
-        return [dict_to_light(light, self) for light in lights]
+        return self._get_devices("type", "light", device_models.Light)
 
     def get_light_by_name(self, lamp_name: str) -> Light:
         """
         Fetches all lights and returns first result that matches this name
         """
-        lights = self.get_lights()
-        lights = list(filter(lambda x: x.attributes.custom_name == lamp_name, lights))
+        if self.device_registry is not None:
+            lights = self.device_registry.find_by_name(lamp_name, device_models.Light)
+        else:
+            lights = self.get_lights()
+            lights = list(filter(lambda x: x.attributes.custom_name == lamp_name, lights))
         if len(lights) == 0:
             raise AssertionError(f"No light found with name {lamp_name}")
         return lights[0]
@@ -207,24 +972,25 @@ class Hub(AbstractSmartHomeHub):
         light = self._get_device_data_by_id(id_)
         if light["type"] != "light":
             raise ValueError("Device is not a light")
-        return dict_to_light(light, self)
+        return device_models.dict_to_light(light, self)
 
     def get_outlets(self) -> List[Outlet]:
         """
         Fetches all outlets registered in the Hub
         """
-        devices = self.get("/devices")
-        outlets = list(filter(lambda x: x["type"] == "outlet", devices))
-        return [dict_to_outlet(outlet, self) for outlet in outlets]
+        return self._get_devices("type", "outlet", device_models.Outlet)
 
     def get_outlet_by_name(self, outlet_name: str) -> Outlet:
         """
         Fetches all outlets and returns first result that matches this name
         """
-        outlets = self.get_outlets()
-        outlets = list(
-            filter(lambda x: x.attributes.custom_name == outlet_name, outlets)
-        )
+        if self.device_registry is not None:
+            outlets = self.device_registry.find_by_name(outlet_name, device_models.Outlet)
+        else:
+            outlets = self.get_outlets()
+            outlets = list(
+                filter(lambda x: x.attributes.custom_name == outlet_name, outlets)
+            )
         if len(outlets) == 0:
             raise AssertionError(f"No outlet found with name {outlet_name}")
         return outlets[0]
@@ -236,38 +1002,35 @@ class Hub(AbstractSmartHomeHub):
         outlet = self._get_device_data_by_id(id_)
         if outlet["type"] != "outlet":
             raise ValueError("Device is not an outlet")
-        return dict_to_outlet(outlet, self)
+        return device_models.dict_to_outlet(outlet, self)
 
     def get_environment_sensors(self) -> List[EnvironmentSensor]:
         """
         Fetches all environment sensors registered in the Hub
         """
-        devices = self.get("/devices")
-        sensors = list(
-            filter(lambda x: x["deviceType"] == "environmentSensor", devices)
-        )
-        return [dict_to_environment_sensor(sensor, self) for sensor in sensors]
+        return self._get_devices("deviceType", "environmentSensor", device_models.EnvironmentSensor)
 
     def get_environment_sensor_by_id(self, id_: str) -> EnvironmentSensor:
         environment_sensor = self._get_device_data_by_id(id_)
         if environment_sensor["deviceType"] != "environmentSensor":
             raise ValueError("Device is not an EnvironmentSensor")
-        return dict_to_environment_sensor(environment_sensor, self)
+        return device_models.dict_to_environment_sensor(environment_sensor, self)
 
     def get_motion_sensors(self) -> List[MotionSensor]:
         """
         Fetches all motion sensors registered in the Hub
         """
-        devices = self.get("/devices")
-        sensors = list(filter(lambda x: x["deviceType"] == "motionSensor", devices))
-        return [dict_to_motion_sensor(sensor, self) for sensor in sensors]
+        return self._get_devices("deviceType", "motionSensor", device_models.MotionSensor)
 
     def get_motion_sensor_by_name(self, motion_sensor_name: str) -> MotionSensor:
         """
         Fetches all motion sensors and returns first result that matches this name
         """
-        motion_sensors = self.get_motion_sensors()
-        motion_sensors = list(filter(lambda x: x.attributes.custom_name == motion_sensor_name, motion_sensors))
+        if self.device_registry is not None:
+            motion_sensors = self.device_registry.find_by_name(motion_sensor_name, device_models.MotionSensor)
+        else:
+            motion_sensors = self.get_motion_sensors()
+            motion_sensors = list(filter(lambda x: x.attributes.custom_name == motion_sensor_name, motion_sensors))
         if len(motion_sensors) == 0:
             raise AssertionError(f"No motion sensor found with name {motion_sensor_name}")
         return motion_sensors[0]
@@ -276,36 +1039,35 @@ class Hub(AbstractSmartHomeHub):
         motion_sensor = self._get_device_data_by_id(id_)
         if motion_sensor["deviceType"] != "motionSensor":
             raise ValueError("Device is not an MotionSensor")
-        return dict_to_motion_sensor(motion_sensor, self)
+        return device_models.dict_to_motion_sensor(motion_sensor, self)
 
     def get_open_close_sensors(self) -> List[OpenCloseSensor]:
         """
         Fetches all open/close sensors registered in the Hub
         """
-        devices = self.get("/devices")
-        sensors = list(filter(lambda x: x["deviceType"] == "openCloseSensor", devices))
-        return [dict_to_open_close_sensor(sensor, self) for sensor in sensors]
+        return self._get_devices("deviceType", "openCloseSensor", device_models.OpenCloseSensor)
 
     def get_open_close_by_id(self, id_: str) -> OpenCloseSensor:
         open_close_sensor = self._get_device_data_by_id(id_)
         if open_close_sensor["deviceType"] != "openCloseSensor":
             raise ValueError("Device is not an OpenCloseSensor")
-        return dict_to_open_close_sensor(open_close_sensor, self)
+        return device_models.dict_to_open_close_sensor(open_close_sensor, self)
 
     def get_blinds(self) -> List[Blind]:
         """
         Fetches all blinds registered in the Hub
         """
-        devices = self.get("/devices")
-        blinds = list(filter(lambda x: x["type"] == "blinds", devices))
-        return [dict_to_blind(blind, self) for blind in blinds]
+        return self._get_devices("type", "blinds", device_models.Blind)
 
     def get_blind_by_name(self, blind_name: str) -> Blind:
         """
         Fetches all blinds and returns first result that matches this name
         """
-        blinds = self.get_blinds()
-        blinds = list(filter(lambda x: x.attributes.custom_name == blind_name, blinds))
+        if self.device_registry is not None:
+            blinds = self.device_registry.find_by_name(blind_name, device_models.Blind)
+        else:
+            blinds = self.get_blinds()
+            blinds = list(filter(lambda x: x.attributes.custom_name == blind_name, blinds))
         if len(blinds) == 0:
             raise AssertionError(f"No blind found with name {blind_name}")
         return blinds[0]
@@ -314,24 +1076,25 @@ class Hub(AbstractSmartHomeHub):
         blind_sensor = self._get_device_data_by_id(id_)
         if blind_sensor["deviceType"] != "blinds":
             raise ValueError("Device is not a Blind")
-        return dict_to_blind(blind_sensor, self)
+        return device_models.dict_to_blind(blind_sensor, self)
 
     def get_controllers(self) -> List[Controller]:
         """
         Fetches all controllers registered in the Hub
         """
-        devices = self.get("/devices")
-        controllers = list(filter(lambda x: x["type"] == "controller", devices))
-        return [dict_to_controller(controller, self) for controller in controllers]
+        return self._get_devices("type", "controller", device_models.Controller)
 
     def get_controller_by_name(self, controller_name: str) -> Controller:
         """
         Fetches all controllers and returns first result that matches this name
         """
-        controllers = self.get_controllers()
-        controllers = list(
-            filter(lambda x: x.attributes.custom_name == controller_name, controllers)
-        )
+        if self.device_registry is not None:
+            controllers = self.device_registry.find_by_name(controller_name, device_models.Controller)
+        else:
+            controllers = self.get_controllers()
+            controllers = list(
+                filter(lambda x: x.attributes.custom_name == controller_name, controllers)
+            )
         if len(controllers) == 0:
             raise AssertionError(f"No controller found with name {controller_name}")
         return controllers[0]
@@ -344,28 +1107,31 @@ class Hub(AbstractSmartHomeHub):
         controller = self._get_device_data_by_id(id_)
         if controller["type"] != "controller":
             raise ValueError("Device is not a controller")
-        return dict_to_controller(controller, self)
+        return device_models.dict_to_controller(controller, self)
 
     def get_scenes(self) -> List[Scene]:
         """
         Fetches all scenes
         """
         scenes: List = self.get("/scenes")
-        return [dict_to_scene(scene, self) for scene in scenes]
+        return [device_models.dict_to_scene(scene, self) for scene in scenes]
 
     def get_scene_by_id(self, scene_id: str) -> Scene:
         """
         Fetches a specific scene by a given id
         """
         data = self.get(f"/scenes/{scene_id}")
-        return dict_to_scene(data, self)
+        return device_models.dict_to_scene(data, self)
 
     def get_scene_by_name(self, scene_name: str) -> Scene:
         """
         Fetches all scenes and returns the first result that matches scene_name
         """
-        scenes = self.get_scenes()
-        scenes = list(filter(lambda x: x.info.name == scene_name, scenes))
+        if self.device_registry is not None:
+            scenes = self.device_registry.scenes_by_name(scene_name)
+        else:
+            scenes = self.get_scenes()
+            scenes = list(filter(lambda x: x.info.name == scene_name, scenes))
         if len(scenes) == 0:
             raise AssertionError(f"No Scene found with name {scene_name}")
         return scenes[0]
@@ -374,13 +1140,7 @@ class Hub(AbstractSmartHomeHub):
         """
         Fetches all water sensors registered in the Hub
         """
-        devices = self.get("/devices")
-        water_sensors = list(
-            filter(lambda x: x["deviceType"] == "waterSensor", devices)
-        )
-        return [
-            dict_to_water_sensor(water_sensor, self) for water_sensor in water_sensors
-        ]
+        return self._get_devices("deviceType", "waterSensor", device_models.WaterSensor)
 
     def get_water_sensor_by_id(self, id_: str) -> WaterSensor:
         """
@@ -390,15 +1150,13 @@ class Hub(AbstractSmartHomeHub):
         water_sensor = self._get_device_data_by_id(id_)
         if water_sensor["deviceType"] != "waterSensor":
             raise ValueError("Device is not a WaterSensor")
-        return dict_to_water_sensor(water_sensor, self)
+        return device_models.dict_to_water_sensor(water_sensor, self)
 
     def get_light_sensors(self) -> List[LightSensor]:
         """
         Fetches all light sensors registered in the Hub
         """
-        devices = self.get("/devices")
-        sensors = list(filter(lambda x: x["deviceType"] == "lightSensor", devices))
-        return [dict_to_light_sensor(sensor, self) for sensor in sensors]
+        return self._get_devices("deviceType", "lightSensor", device_models.LightSensor)
 
     def get_light_sensor_by_id(self, id_: str) -> LightSensor:
         """
@@ -408,15 +1166,13 @@ class Hub(AbstractSmartHomeHub):
         sensor = self._get_device_data_by_id(id_)
         if sensor["deviceType"] != "lightSensor":
             raise ValueError("Device is not a LightSensor")
-        return dict_to_light_sensor(sensor, self)
+        return device_models.dict_to_light_sensor(sensor, self)
 
     def get_occupancy_sensors(self) -> List[OccupancySensor]:
         """
         Fetches all occupancy sensors registered in the Hub
         """
-        devices = self.get("/devices")
-        sensors = list(filter(lambda x: x["deviceType"] == "occupancySensor", devices))
-        return [dict_to_occupancy_sensor(sensor, self) for sensor in sensors]
+        return self._get_devices("deviceType", "occupancySensor", device_models.OccupancySensor)
 
     def get_occupancy_sensor_by_id(self, id_: str) -> OccupancySensor:
         """
@@ -426,31 +1182,81 @@ class Hub(AbstractSmartHomeHub):
         sensor = self._get_device_data_by_id(id_)
         if sensor["deviceType"] != "occupancySensor":
             raise ValueError("Device is not an OccupancySensor")
-        return dict_to_occupancy_sensor(sensor, self)
+        return device_models.dict_to_occupancy_sensor(sensor, self)
 
     def get_all_devices(self) -> List[Device]:
         """
-        Fetches all devices registered in the Hub
+        Fetches all devices registered in the Hub with a single request
+        devices of unknown types are returned as plain Device
+        """
+        return device_models.parse_devices(self.get("/devices"), self)
+
+    def _fetch_device_data(
+        self, ids: Sequence[str], ratio: float
+    ) -> Tuple[Dict[str, Dict[str, Any]], FetchResult]:
+        from .bulk_fetch import fetch_device_data, use_device_list  # pylint: disable=import-outside-toplevel
+
+        use_list = use_device_list(len(set(ids)), self.fleet_size, ratio, self.pool_maxsize)
+        return fetch_device_data(self, ids, use_list, max_concurrency=self.pool_maxsize)
+
+    def get_devices_by_ids(self, ids: Sequence[str], ratio: float = 0.25) -> FetchResult:
+        """
+        Fetches the devices with the given ids as typed models. Ids the hub does not know are reported
+        in result.missing, failed requests and invalid payloads in result.errors instead of raising.
+
+        Args:
+            ids (Sequence[str]): Device ids, duplicates are fetched once.
+            ratio (float, optional): Share of the fleet from which one GET /devices replaces the
+                concurrent GET /devices/{id} requests. Defaults to 0.25.
+        """
+        data, result = self._fetch_device_data(ids, ratio)
+        try:
+            result.devices = dict(zip(data, device_models.parse_devices(list(data.values()), self)))
+        except ValidationError:
+            # One invalid payload fails the whole batch, validate one by one to keep the valid devices
+            for id_, device in data.items():
+                try:
+                    result.devices[id_] = device_models.dict_to_device(device, self)
+                except ValidationError as err:
+                    result.errors[id_] = err
+        return result
+
+    def reload_many(self, models: Sequence[Device], ratio: float = 0.25) -> FetchResult:
+        """
+        Refreshes the device models in place like device.refresh(), with the requests chosen as in
+        get_devices_by_ids. result.devices holds the given models and result.changed their changed fields.
+        Models whose payload is invalid are reported in result.errors.
         """
-        devices: List[Device] = []
-        devices.extend(self.get_air_purifiers())
-        devices.extend(self.get_blinds())
-        devices.extend(self.get_controllers())
-        devices.extend(self.get_environment_sensors())
-        devices.extend(self.get_lights())
-        devices.extend(self.get_motion_sensors())
-        devices.extend(self.get_open_close_sensors())
-        devices.extend(self.get_outlets())
-        devices.extend(self.get_water_sensors())
-        devices.extend(self.get_occupancy_sensors())
-        devices.extend(self.get_light_sensors())
+        data, result = self._fetch_device_data([model.id for model in models], ratio)
+        for model in models:
+            if model.id in data:
+                try:
+                    result.changed[model.id] = model.apply_state(data[model.id])
+                except ValidationError as err:
+                    result.errors[model.id] = err
+                    continue
+                result.devices[model.id] = model
+        return result
 
-        return devices
+    def get_lazy_devices(
+        self, type_: Optional[str] = None, device_type: Optional[str] = None
+    ) -> List[LazyDevice]:
+        """
+        Fetches all devices as LazyDevice proxies that only validate the full model on first use,
+        optionally filtered by type and/or deviceType
+        """
+        devices = self.get("/devices")
+        return [
+            device_models.dict_to_lazy_device(device, self)
+            for device in devices
+            if (type_ is None or device["type"] == type_)
+            and (device_type is None or device["deviceType"] == device_type)
+        ]
 
     def create_scene(
         self,
         info: Info,
-        scene_type: SceneType = SceneType.USER_SCENE,
+        scene_type: Optional[SceneType] = None,
         triggers: Optional[List[Trigger]] = None,
         actions: Optional[List[Action]] = None,
     ) -> Scene:
@@ -461,7 +1267,7 @@ class Hub(AbstractSmartHomeHub):
 
         Args:
             info (Info): Name & Icon
-            type (SceneType): typically USER_SCENE
+            type (SceneType): Defaults to USER_SCENE
             triggers (List[Trigger]): Triggers for the Scene (An app trigger will be created automatically)
             actions (List[Action]): Actions that will be run on Trigger
 
@@ -479,6 +1285,8 @@ class Hub(AbstractSmartHomeHub):
             action_list = [
                 x.model_dump(mode="json", exclude_none=True) for x in actions
             ]
+        if scene_type is None:
+            scene_type = device_models.SceneType.USER_SCENE
         data = {
             "info": info.model_dump(mode="json", exclude_none=True),
             "type": scene_type.value,
@@ -491,9 +1299,14 @@ class Hub(AbstractSmartHomeHub):
             data=data,
         )
         scene_id = response_dict["id"]
-        return self.get_scene_by_id(scene_id)
+        scene = self.get_scene_by_id(scene_id)
+        if self.device_registry is not None:
+            self.device_registry.add_scene(scene)
+        return scene
 
     def delete_scene(self, scene_id: str) -> None:
         self.delete(
             f"/scenes/{scene_id}",
         )
+        if self.device_registry is not None:
+            self.device_registry.remove_scene(scene_id)
@@ -0,0 +1,205 @@
+import collections
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+@dataclass
+class LaneStats:
+    """
+    Queue depth and latencies of one priority lane, wait is the time from submit until the task started
+    """
+
+    queued: int = 0
+    completed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.completed if self.completed else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.completed if self.completed else 0.0
+
+
+@dataclass
+class _Task:
+    future: Future
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    priority: Priority
+    submitted_at: float
+    context: contextvars.Context
+
+
+class KeyedExecutor:
+    """
+    Thread pool that runs the tasks of one key one after another in submission order,
+    while tasks of different keys run in parallel.
+
+    Tasks run in a copy of the context they were submitted from, so deadlines carry over.
+    Free workers always take the key with the most urgent priority lane first. A key is queued in the lane of
+    its most urgent pending task, so an interactive command never waits for background commands of other keys
+    that have not started yet. Within a key the submission order is kept.
+    """
+
+    def __init__(self, max_workers: int = 10) -> None:
+        """
+        Args:
+            max_workers (int, optional): Number of worker threads, i.e. keys served in parallel. Defaults to 10.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._queues: Dict[str, Deque[_Task]] = {}
+        self._ready: List[Tuple[int, int, str]] = []
+        self._lanes: Dict[str, Tuple[int, int]] = {}
+        self._sequence = itertools.count()
+        self._active: Set[str] = set()
+        self._stats: Dict[Priority, LaneStats] = {priority: LaneStats() for priority in Priority}
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self._local = threading.local()
+        self._threads: List[threading.Thread] = [
+            threading.Thread(target=self._work, name=f"dirigera-commands-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: Priority = Priority.NORMAL,
+        **kwargs: Any,
+    ) -> Future:
+        future: Future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            queue = self._queues.setdefault(key, collections.deque())
+            queue.append(
+                _Task(future, fn, args, kwargs, priority, time.monotonic(), contextvars.copy_context())
+            )
+            self._stats[priority].queued += 1
+            if key not in self._active:
+                self._schedule(key, priority)
+        return future
+
+    def _schedule(self, key: str, priority: Priority) -> None:
+        """
+        Puts the key into the ready heap, or moves it to a more urgent lane. Replaced entries stay in the heap
+        and are skipped when popped.
+        """
+        lane = self._lanes.get(key)
+        if lane is not None and lane[0] <= priority:
+            return
+        entry = (int(priority), next(self._sequence))
+        self._lanes[key] = entry
+        heapq.heappush(self._ready, (*entry, key))
+        self._condition.notify()
+
+    def pending(self, key: str) -> int:
+        """
+        Number of tasks of the key that have not started yet
+        """
+        with self._condition:
+            return len(self._queues.get(key, ()))
+
+    def lane_stats(self) -> Dict[Priority, LaneStats]:
+        """
+        Snapshot of the queue depth and latencies per priority lane
+        """
+        with self._condition:
+            return {priority: LaneStats(**vars(stats)) for priority, stats in self._stats.items()}
+
+    def in_worker(self) -> bool:
+        """
+        True when called from a task of this executor, such a task must not wait for another task
+        """
+        return getattr(self._local, "worker", False)
+
+    def _pop_ready(self) -> Optional[str]:
+        while self._ready:
+            priority, sequence, key = heapq.heappop(self._ready)
+            if self._lanes.get(key) == (priority, sequence):
+                del self._lanes[key]
+                return key
+        return None
+
+    def _take(self) -> Optional[Tuple[str, _Task]]:
+        with self._condition:
+            while True:
+                key = self._pop_ready()
+                if key is not None:
+                    break
+                if self._shutdown:
+                    return None
+                self._condition.wait()
+            self._active.add(key)
+            task = self._queues[key].popleft()
+            stats = self._stats[task.priority]
+            wait = time.monotonic() - task.submitted_at
+            stats.queued -= 1
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+            return key, task
+
+    def _done(self, key: str, task: _Task) -> None:
+        with self._condition:
+            stats = self._stats[task.priority]
+            stats.completed += 1
+            stats.total_latency += time.monotonic() - task.submitted_at
+            self._active.discard(key)
+            queue = self._queues[key]
+            if queue:
+                self._schedule(key, min(x.priority for x in queue))
+            else:
+                del self._queues[key]
+                self._condition.notify_all()
+
+    def _work(self) -> None:
+        self._local.worker = True
+        while True:
+            taken = self._take()
+            if taken is None:
+                return
+            key, task = taken
+            if task.future.set_running_or_notify_cancel():
+                try:
+                    result = task.context.run(task.fn, *task.args, **task.kwargs)
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    task.future.set_exception(err)
+                else:
+                    task.future.set_result(result)
+            self._done(key, task)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Runs the tasks already submitted, afterwards the worker threads exit
+        """
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            current = threading.current_thread()
+            for thread in self._threads:
+                if thread is not current:
+                    thread.join()
@@ -0,0 +1,140 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        """
+        Allows rate acquisitions per second on average and bursts of up to burst acquisitions.
+
+        Args:
+            rate (float): Tokens added per second.
+            burst (float, optional): Capacity of the bucket. Defaults to rate, but at least 1.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self._rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns how many seconds the caller has to wait before using it
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until a token is available. If that would take longer than timeout seconds,
+        returns False right away without taking a token.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self._rate
+            if timeout is not None and delay > timeout:
+                return False
+            self._tokens -= 1
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate follows the hub's health (additive increase, multiplicative decrease).
+
+    Responses that arrive within target_latency raise the rate by about increase requests per second
+    every second, up to max_rate. A 429, a 5xx, a failed connection or a slower response multiplies
+    the rate by decrease, down to min_rate. After a decrease, further decreases are ignored for one
+    cooldown, so requests that were already in flight during the same congestion only count once.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        min_rate: float = 1.0,
+        max_rate: float = 50.0,
+        burst: Optional[float] = None,
+        target_latency: float = 0.5,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            rate (float, optional): Initial requests per second. Defaults to 10.
+            min_rate (float, optional): Lower bound of the rate. Defaults to 1.
+            max_rate (float, optional): Upper bound of the rate. Defaults to 50.
+            burst (float, optional): Requests that may be sent at once after an idle period. Defaults to rate.
+            target_latency (float, optional): Slower responses count as congestion, in seconds. Defaults to 0.5.
+            increase (float, optional): Rate added per second of healthy responses. Defaults to 1.
+            decrease (float, optional): Factor applied to the rate on congestion. Defaults to 0.5.
+            cooldown (float, optional): Seconds after a decrease in which no further decrease happens.
+                Defaults to 1.
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("Rates must satisfy 0 < min_rate <= rate <= max_rate")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.bucket = TokenBucket(rate, burst)
+        self._decreased_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """
+        Current requests per second
+        """
+        return self.bucket.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        return self.bucket.acquire(timeout)
+
+    def record(self, latency: float, status_code: Optional[int]) -> None:
+        """
+        Feeds back the outcome of a request, status_code is None if no response was received
+        """
+        congested = (
+            status_code is None
+            or status_code == 429
+            or status_code >= 500
+            or latency > self.target_latency
+        )
+        with self._lock:
+            if not congested:
+                rate = self.bucket.rate
+                self.bucket.rate = min(self.max_rate, rate + self.increase / rate)
+                return
+            now = time.monotonic()
+            if self._decreased_at is not None and now - self._decreased_at < self.cooldown:
+                return
+            self._decreased_at = now
+            self.bucket.rate = max(self.min_rate, self.bucket.rate * self.decrease)
@@ -0,0 +1,155 @@
+import logging
+import threading
+from typing import Callable, FrozenSet, Optional
+
+import requests
+
+from .deadlines import DeadlineExceeded, deadline, remaining_time, request_timeout
+from .resync import Backoff
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceeded",
+    "RetryPolicy",
+    "deadline",
+    "remaining_time",
+    "request_timeout",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    pass
+
+
+class RetryPolicy:  # pylint: disable=too-few-public-methods
+    def __init__(
+        self,
+        attempts: int = 3,
+        methods: FrozenSet[str] = frozenset(["GET", "PATCH"]),
+        status_codes: FrozenSet[int] = frozenset([429, 502, 503, 504]),
+        initial_delay: float = 0.1,
+        max_delay: float = 2.0,
+    ) -> None:
+        """
+        Retries failed requests with exponential backoff and jitter, within the current deadline.
+
+        Args:
+            attempts (int, optional): Attempts per request including the first one. Defaults to 3.
+            methods (FrozenSet[str], optional): Idempotent methods that may be retried. PATCH only sets
+                absolute attribute values, POST (e.g. creating or triggering scenes) is never retried by default.
+                Defaults to GET and PATCH.
+            status_codes (FrozenSet[int], optional): Responses that are retried, failed connections and timeouts
+                are always retried. Defaults to 429, 502, 503 and 504.
+            initial_delay (float, optional): Delay before the first retry in seconds. Defaults to 0.1.
+            max_delay (float, optional): Upper bound of the delay in seconds. Defaults to 2.
+        """
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.methods = methods
+        self.status_codes = status_codes
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+
+    def backoff(self) -> Backoff:
+        return Backoff(initial=self.initial_delay, maximum=self.max_delay)
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while the hub is down.
+
+    After failure_threshold consecutive failed requests (no connection, timeout or 5xx) the circuit opens:
+    requests raise CircuitOpenError without touching the network. A background thread probes the hub with
+    growing intervals, starting at reset_timeout, and closes the circuit once the hub answers again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        max_probe_interval: float = 60.0,
+        probe: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            reset_timeout (float, optional): Seconds until the first probe. Defaults to 5.
+            max_probe_interval (float, optional): Upper bound of the probe interval in seconds. Defaults to 60.
+            probe (Callable[[], bool], optional): Returns True once the hub is reachable again.
+                Set by the Hub when the breaker is enabled.
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_probe_interval = max_probe_interval
+        self.probe = probe
+        self.failures = 0
+        self._open = False
+        self._lock = threading.Lock()
+        self._stopped: Optional[threading.Event] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    def check(self) -> None:
+        if self._open:
+            with self._lock:
+                # a breaker stopped while open (disabled, or shared with a closed hub) probes again when reused
+                if self._open and self._stopped is None:
+                    self._start_probe()
+            raise CircuitOpenError("Hub is unavailable, circuit breaker is open")
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._open or self.failures < self.failure_threshold:
+                return
+            self._open = True
+            self._start_probe()
+        logger.warning("Hub unavailable after %s failed requests, circuit opened", self.failures)
+
+    def _start_probe(self) -> None:
+        """
+        Starts a probe thread with its own stop event, called with the lock held
+        """
+        stopped = threading.Event()
+        self._stopped = stopped
+        threading.Thread(
+            target=self._probe_until_closed, args=(stopped,), name="dirigera-circuit-probe", daemon=True
+        ).start()
+
+    def _probe_until_closed(self, stopped: threading.Event) -> None:
+        backoff = Backoff(initial=self.reset_timeout, maximum=max(self.reset_timeout, self.max_probe_interval))
+        while not stopped.wait(backoff.next_delay()):
+            try:
+                recovered = self.probe() if self.probe is not None else True
+            except Exception:  # pylint: disable=broad-exception-caught
+                recovered = False
+            if recovered:
+                self.reset()
+                logger.info("Hub reachable again, circuit closed")
+                return
+
+    def reset(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._open = False
+            self._stopped = None
+
+    def stop(self) -> None:
+        """
+        Stops a running probe, the breaker can be enabled again afterwards
+        """
+        with self._lock:
+            if self._stopped is not None:
+                self._stopped.set()
+                self._stopped = None
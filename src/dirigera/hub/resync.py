@@ -0,0 +1,101 @@
+import datetime
+import random
+from typing import Any, Dict, Iterable, List
+
+RESYNC_SOURCE = "urn:dirigera:resync"
+IGNORED_KEYS = frozenset(["lastSeen"])
+
+
+class Backoff:
+    def __init__(
+        self,
+        initial: float = 1.0,
+        maximum: float = 60.0,
+        factor: float = 2.0,
+        jitter: float = 0.5,
+    ) -> None:
+        """
+        Exponential backoff with jitter between reconnect attempts.
+
+        Args:
+            initial (float, optional): Delay before the first attempt in seconds. Defaults to 1.0.
+            maximum (float, optional): Upper bound of the delay in seconds. Defaults to 60.0.
+            factor (float, optional): Growth of the delay per failed attempt. Defaults to 2.0.
+            jitter (float, optional): Fraction of the delay that is randomly taken off, so clients
+                that lost the hub at the same time do not reconnect in lockstep. Defaults to 0.5.
+        """
+        if initial <= 0 or maximum < initial or factor < 1:
+            raise ValueError("Backoff requires 0 < initial <= maximum and factor >= 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self._delay = initial
+
+    def next_delay(self) -> float:
+        delay = self._delay
+        self._delay = min(self.maximum, delay * self.factor)
+        return delay * (1 - self.jitter * random.random())
+
+    def reset(self) -> None:
+        """
+        Called once a connection was established, the next failure starts over at initial
+        """
+        self._delay = self.initial
+
+
+def _event(event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": event_type,
+        "source": RESYNC_SOURCE,
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "data": data,
+    }
+
+
+def diff_devices(
+    known: Iterable[Dict[str, Any]], current: Iterable[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Compares two /devices payloads and returns the events that would have turned known into current.
+    State changes only carry the fields and attributes that differ, lastSeen is ignored.
+    """
+    known_by_id = {device["id"]: device for device in known}
+    events = []
+    current_ids = set()
+    for device in current:
+        current_ids.add(device["id"])
+        old = known_by_id.get(device["id"])
+        if old is None:
+            events.append(_event("deviceAdded", device))
+            continue
+        changed = {
+            key: value
+            for key, value in device.items()
+            if key != "attributes" and key not in IGNORED_KEYS and old.get(key) != value
+        }
+        old_attributes = old.get("attributes") or {}
+        attributes = {
+            key: value
+            for key, value in (device.get("attributes") or {}).items()
+            if old_attributes.get(key) != value
+        }
+        if changed or attributes:
+            events.append(
+                _event(
+                    "deviceStateChanged",
+                    {
+                        "id": device["id"],
+                        "type": device.get("type"),
+                        "deviceType": device.get("deviceType"),
+                        **changed,
+                        "attributes": attributes,
+                    },
+                )
+            )
+    for id_, old in known_by_id.items():
+        if id_ not in current_ids:
+            events.append(_event("deviceRemoved", old))
+    return events
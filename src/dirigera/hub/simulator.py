@@ -0,0 +1,571 @@
+"""
+A local stand-in for the Dirigera hub: serves the REST routes and the websocket event feed the library uses
+over HTTPS and WSS, so the real Hub can be tested and load tested end to end without hardware.
+
+    dirigera-simulator --port 8443 --snapshot inventory.json --latency 0.02 --error-rate 0.01
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import base64
+import copy
+import datetime
+import hashlib
+import ipaddress
+import json
+import os
+import random
+import secrets
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from aiohttp import web
+except ImportError:  # pragma: no cover
+    web = None  # type: ignore
+
+from .hub import Hub
+from .snapshot import load_snapshot
+
+CERTIFICATE_DAYS = 30
+EVENT_SOURCE = "urn:com:ikea:homesmart:iotc:simulator"
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+
+def _alt_names(host: str) -> Tuple[List[str], List[str]]:
+    """
+    DNS names and IP addresses the certificate is issued for
+    """
+    names, addresses = ["localhost"], ["127.0.0.1"]
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        names.append(host)
+    else:
+        addresses.append(host)
+    return sorted(set(names)), sorted(set(addresses))
+
+
+def _write_certificate_cryptography(host: str, certificate: str, key: str) -> bool:
+    try:
+        # pylint: disable=import-outside-toplevel
+        from cryptography import x509  # type: ignore
+        from cryptography.hazmat.primitives import hashes, serialization  # type: ignore
+        from cryptography.hazmat.primitives.asymmetric import rsa  # type: ignore
+        from cryptography.x509.oid import NameOID  # type: ignore
+    except ImportError:
+        return False
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    names, addresses = _alt_names(host)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=CERTIFICATE_DAYS))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.DNSName(x) for x in names] + [x509.IPAddress(ipaddress.ip_address(x)) for x in addresses]
+            ),
+            critical=False,
+        )
+        .sign(private_key, hashes.SHA256())
+    )
+    with open(key, "wb") as file:
+        file.write(
+            private_key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            )
+        )
+    with open(certificate, "wb") as file:
+        file.write(cert.public_bytes(serialization.Encoding.PEM))
+    return True
+
+
+def _write_certificate_openssl(host: str, certificate: str, key: str) -> bool:
+    openssl = shutil.which("openssl")
+    if openssl is None:
+        return False
+    names, addresses = _alt_names(host)
+    alt_names = ",".join([f"DNS:{x}" for x in names] + [f"IP:{x}" for x in addresses])
+    subprocess.run(
+        [
+            openssl, "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", certificate,
+            "-days", str(CERTIFICATE_DAYS), "-subj", "/CN=localhost", "-addext", f"subjectAltName={alt_names}",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return True
+
+
+def simulator_ssl_context(host: str = "127.0.0.1") -> ssl.SSLContext:
+    """
+    Server context with a fresh self-signed certificate for localhost and host, created with the cryptography
+    package if it is installed, otherwise with the openssl command. The key files are deleted once loaded.
+    """
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    with tempfile.TemporaryDirectory() as directory:
+        certificate = os.path.join(directory, "simulator.crt")
+        key = os.path.join(directory, "simulator.key")
+        written = _write_certificate_cryptography(host, certificate, key)
+        if not written:
+            written = _write_certificate_openssl(host, certificate, key)
+        if not written:
+            raise ImportError(
+                "HubSimulator needs the cryptography package or the openssl command to create a certificate, "
+                "or an ssl_context"
+            )
+        context.load_cert_chain(certificate, key)
+    return context
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+@dataclass
+class SimulatorStats:
+    requests: int = 0
+    injected_errors: int = 0
+    rejected_connections: int = 0
+    unauthorized: int = 0
+    events: int = 0
+
+
+class HubSimulator:  # pylint: disable=too-many-instance-attributes
+    """
+    Serves /v1/devices, /v1/scenes, /v1/hub/status, the oauth routes used by auth.py and the websocket
+    event feed on /v1 from a background thread. Device and scene state is kept in memory: PATCH changes
+    the attributes and broadcasts deviceStateChanged, scenes can be created, triggered and deleted.
+
+    Latency, injected errors and a connection limit make it behave like a busy hub under load.
+    """
+
+    def __init__(
+        self,
+        devices: Optional[List[Dict[str, Any]]] = None,
+        scenes: Optional[List[Dict[str, Any]]] = None,
+        token: str = "simulator-token",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        max_connections: Optional[int] = None,
+        seed: Optional[int] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        """
+        Args:
+            devices (List[Dict[str, Any]], optional): Payloads of GET /devices, copied. Defaults to none.
+            scenes (List[Dict[str, Any]], optional): Payloads of GET /scenes, copied. Defaults to none.
+            token (str, optional): Bearer token accepted by the REST routes and returned by the oauth flow.
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 picks a free one, see port. Defaults to 0.
+            latency (float, optional): Seconds added to every request. Defaults to 0.
+            jitter (float, optional): Up to this many seconds are added at random to the latency. Defaults to 0.
+            error_rate (float, optional): Share of requests answered with 503. Defaults to 0.
+            max_connections (int, optional): Open connections accepted at once, requests on further
+                connections are answered with 503 and the connection is closed. Defaults to no limit.
+            seed (int, optional): Seed of the jitter and error injection.
+            ssl_context (ssl.SSLContext, optional): Server context, defaults to a fresh self-signed certificate,
+                see simulator_ssl_context.
+        """
+        if web is None:
+            raise ImportError("HubSimulator requires aiohttp, install it with: pip install dirigera[async]")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be a value between 0 and 1.")
+        if max_connections is not None and max_connections < 1:
+            raise ValueError("max_connections must be at least 1.")
+        self.token = token
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_connections = max_connections
+        self.ssl_context = ssl_context
+        self.stats = SimulatorStats()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._devices: Dict[str, Dict[str, Any]] = {x["id"]: copy.deepcopy(x) for x in devices or []}
+        self._scenes: Dict[str, Dict[str, Any]] = {x["id"]: copy.deepcopy(x) for x in scenes or []}
+        self._challenges: Dict[str, str] = {}
+        self._connections: Set[Any] = set()
+        self._sockets: Set[Any] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._events: Optional[asyncio.Queue] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> HubSimulator:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.host}:{self.port}/v1"
+
+    def create_hub(self, **kwargs: Any) -> Hub:
+        """
+        Hub connected to the simulator, kwargs are passed on to Hub
+        """
+        return Hub(token=self.token, ip_address=self.host, port=str(self.port), **kwargs)
+
+    def start(self) -> None:
+        """
+        Starts serving on a daemon thread and returns once the port is bound
+        """
+        if self._thread is not None:
+            raise AssertionError("Simulator is already running")
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        failure: List[BaseException] = []
+
+        def serve() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self._serve(ready))
+            except BaseException as error:  # pylint: disable=broad-exception-caught
+                failure.append(error)
+                ready.set()
+            finally:
+                loop.close()
+
+        self._thread = threading.Thread(target=serve, name="dirigera-simulator", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            self._thread = None
+            raise failure[0]
+
+    def stop(self) -> None:
+        loop, stopping, thread = self._loop, self._stopping, self._thread
+        if loop is not None and stopping is not None:
+            loop.call_soon_threadsafe(stopping.set)
+        if thread is not None:
+            thread.join(timeout=5)
+        self._thread = None
+
+    @property
+    def listeners(self) -> int:
+        """
+        Number of connected websockets
+        """
+        return len(self._sockets)
+
+    def device(self, id_: str) -> Dict[str, Any]:
+        """
+        Copy of the current payload of a device
+        """
+        with self._lock:
+            return copy.deepcopy(self._devices[id_])
+
+    def scenes(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return copy.deepcopy(list(self._scenes.values()))
+
+    def emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Broadcasts an event to the connected websockets, safe to call from any thread
+        """
+        loop = self._loop
+        if loop is None:
+            raise AssertionError("Simulator is not running")
+        loop.call_soon_threadsafe(self._emit, event_type, data)
+
+    async def _serve(self, ready: threading.Event) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._events = asyncio.Queue()
+        self._stopping = asyncio.Event()
+        app = web.Application(middlewares=[self._simulate])
+        app.add_routes(
+            [
+                web.get("/v1", self._websocket),
+                web.get("/v1/oauth/authorize", self._authorize),
+                web.post("/v1/oauth/token", self._token),
+                web.get("/v1/hub/status", self._status),
+                web.get("/v1/devices", self._get_devices),
+                web.get("/v1/devices/{id}", self._get_device),
+                web.patch("/v1/devices/set/{id}", self._patch_device_set),
+                web.patch("/v1/devices/{id}", self._patch_device),
+                web.get("/v1/scenes", self._get_scenes),
+                web.post("/v1/scenes/", self._create_scene),
+                web.get("/v1/scenes/{id}", self._get_scene),
+                web.delete("/v1/scenes/{id}", self._delete_scene),
+                web.post("/v1/scenes/{id}/trigger", self._trigger_scene),
+                web.post("/v1/scenes/{id}/undo", self._undo_scene),
+            ]
+        )
+        runner = web.AppRunner(app, handle_signals=False)
+        await runner.setup()
+        ssl_context = self.ssl_context or simulator_ssl_context(self.host)
+        site = web.TCPSite(runner, self.host, self.port, ssl_context=ssl_context)
+        await site.start()
+        self.port = runner.addresses[0][1]
+        broadcaster = asyncio.ensure_future(self._broadcast())
+        ready.set()
+        try:
+            await self._stopping.wait()
+        finally:
+            broadcaster.cancel()
+            for socket in list(self._sockets):
+                await socket.close()
+            await runner.cleanup()
+            self._loop = None
+
+    @web.middleware
+    async def _simulate(self, request: Any, handler: Handler) -> Any:
+        transport = request.transport
+        self._connections = {x for x in self._connections if not x.is_closing()}
+        if transport not in self._connections:
+            if self.max_connections is not None and len(self._connections) >= self.max_connections:
+                self.stats.rejected_connections += 1
+                response = web.json_response({"error": "Too many connections"}, status=503)
+                response.force_close()
+                return response
+            self._connections.add(transport)
+        self.stats.requests += 1
+        if not request.path.startswith("/v1/oauth/"):
+            if request.headers.get("Authorization") != f"Bearer {self.token}":
+                self.stats.unauthorized += 1
+                return web.json_response({"error": "Unauthorized"}, status=401)
+        if request.path == "/v1":
+            return await handler(request)
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats.injected_errors += 1
+            return web.json_response({"error": "Service Unavailable"}, status=503)
+        return await handler(request)
+
+    def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        if self._events is None or not self._sockets:
+            return
+        event = {
+            "id": str(uuid.uuid4()),
+            "type": event_type,
+            "time": _now(),
+            "specversion": "1.1.0",
+            "source": EVENT_SOURCE,
+            "data": data,
+        }
+        self._events.put_nowait(json.dumps(event))
+
+    async def _broadcast(self) -> None:
+        assert self._events is not None
+        while True:
+            message = await self._events.get()
+            self.stats.events += 1
+            for socket in list(self._sockets):
+                try:
+                    await socket.send_str(message)
+                except ConnectionError:
+                    self._sockets.discard(socket)
+
+    async def _websocket(self, request: Any) -> Any:
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self._sockets.add(socket)
+        try:
+            async for _ in socket:
+                pass
+        finally:
+            self._sockets.discard(socket)
+        return socket
+
+    async def _authorize(self, request: Any) -> Any:
+        challenge = request.query.get("code_challenge")
+        if not challenge or request.query.get("code_challenge_method") != "S256":
+            return web.json_response({"error": "S256 code_challenge required"}, status=400)
+        code = secrets.token_urlsafe(16)
+        self._challenges[code] = challenge
+        return web.json_response({"code": code})
+
+    async def _token(self, request: Any) -> Any:
+        form = await request.post()
+        challenge = self._challenges.pop(form.get("code", ""), None)
+        verifier = str(form.get("code_verifier", ""))
+        digest = hashlib.sha256(verifier.encode()).digest()
+        if challenge is None or base64.urlsafe_b64encode(digest).rstrip(b"=").decode() != challenge:
+            return web.json_response({"error": "Invalid code or code_verifier"}, status=403)
+        return web.json_response({"access_token": self.token})
+
+    async def _status(self, request: Any) -> Any:  # pylint: disable=unused-argument
+        return web.json_response({"id": "simulator", "status": "ok", "devices": len(self._devices)})
+
+    async def _get_devices(self, request: Any) -> Any:  # pylint: disable=unused-argument
+        with self._lock:
+            return web.json_response(list(self._devices.values()))
+
+    async def _get_device(self, request: Any) -> Any:
+        with self._lock:
+            device = self._devices.get(request.match_info["id"])
+            if device is None:
+                return web.json_response({"error": "Device not found"}, status=404)
+            return web.json_response(device)
+
+    async def _patch_device(self, request: Any) -> Any:
+        id_ = request.match_info["id"]
+        if id_ not in self._devices:
+            return web.json_response({"error": "Device not found"}, status=404)
+        return await self._patch([id_], await request.json())
+
+    async def _patch_device_set(self, request: Any) -> Any:
+        set_id = request.match_info["id"]
+        with self._lock:
+            ids = [
+                id_
+                for id_, device in self._devices.items()
+                if any(x.get("id") == set_id for x in device.get("deviceSet", []))
+            ]
+        if not ids:
+            return web.json_response({"error": "Device set not found"}, status=404)
+        return await self._patch(ids, await request.json())
+
+    async def _patch(self, ids: List[str], body: Any) -> Any:
+        if not isinstance(body, list) or not all(isinstance(x, dict) for x in body):
+            return web.json_response({"error": "Expected a list of changes"}, status=400)
+        attributes: Dict[str, Any] = {}
+        for change in body:
+            attributes.update(change.get("attributes", {}))
+        with self._lock:
+            for id_ in ids:
+                can_receive = self._devices[id_].get("capabilities", {}).get("canReceive", [])
+                unknown = sorted(set(attributes) - set(can_receive))
+                if unknown:
+                    return web.json_response({"error": f"{id_} can not receive {', '.join(unknown)}"}, status=400)
+            for id_ in ids:
+                self._apply(id_, attributes)
+        return web.Response(status=202)
+
+    def _apply(self, id_: str, attributes: Dict[str, Any]) -> None:
+        device = self._devices[id_]
+        changed = {key: value for key, value in attributes.items() if device["attributes"].get(key) != value}
+        if not changed:
+            return
+        device["attributes"].update(changed)
+        device["lastSeen"] = _now()
+        self._emit(
+            "deviceStateChanged",
+            {
+                "id": id_,
+                "type": device.get("type"),
+                "deviceType": device.get("deviceType"),
+                "attributes": changed,
+                "lastSeen": device["lastSeen"],
+            },
+        )
+
+    async def _get_scenes(self, request: Any) -> Any:  # pylint: disable=unused-argument
+        with self._lock:
+            return web.json_response(list(self._scenes.values()))
+
+    async def _get_scene(self, request: Any) -> Any:
+        with self._lock:
+            scene = self._scenes.get(request.match_info["id"])
+            if scene is None:
+                return web.json_response({"error": "Scene not found"}, status=404)
+            return web.json_response(scene)
+
+    async def _create_scene(self, request: Any) -> Any:
+        data = await request.json()
+        if not isinstance(data, dict) or "info" not in data:
+            return web.json_response({"error": "Expected a scene with info"}, status=400)
+        id_ = str(uuid.uuid4())
+        triggers = list(data.get("triggers") or [])
+        if not any(x.get("type") == "app" for x in triggers):
+            triggers.append({"type": "app", "disabled": False})
+        scene = {
+            "id": id_,
+            "type": "userScene",
+            "createdAt": _now(),
+            "commands": [],
+            "undoAllowedDuration": 30,
+            "actions": [],
+            **data,
+            "triggers": [{"id": str(uuid.uuid4()), **x} for x in triggers],
+        }
+        with self._lock:
+            self._scenes[id_] = scene
+            self._emit("sceneCreated", scene)
+        return web.json_response({"id": id_}, status=201)
+
+    async def _delete_scene(self, request: Any) -> Any:
+        with self._lock:
+            scene = self._scenes.pop(request.match_info["id"], None)
+            if scene is None:
+                return web.json_response({"error": "Scene not found"}, status=404)
+            self._emit("sceneDeleted", {"id": scene["id"]})
+        return web.Response(status=202)
+
+    async def _trigger_scene(self, request: Any) -> Any:
+        with self._lock:
+            scene = self._scenes.get(request.match_info["id"])
+            if scene is None:
+                return web.json_response({"error": "Scene not found"}, status=404)
+            scene["lastTriggered"] = _now()
+            for action in scene.get("actions", []):
+                if action.get("enabled", True) and action.get("id") in self._devices:
+                    self._apply(action["id"], action.get("attributes") or {})
+            self._emit("sceneTriggered", {"id": scene["id"], "info": scene["info"], "type": scene["type"]})
+        return web.Response(status=202)
+
+    async def _undo_scene(self, request: Any) -> Any:
+        if request.match_info["id"] not in self._scenes:
+            return web.json_response({"error": "Scene not found"}, status=404)
+        return web.Response(status=202)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--token", default="simulator-token")
+    parser.add_argument("--snapshot", help="serve the devices and scenes of a file written by Hub.save_snapshot")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many seconds added at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--max-connections", type=int, help="open connections accepted at once")
+    args = parser.parse_args(argv)
+    devices: List[Dict[str, Any]] = []
+    scenes: List[Dict[str, Any]] = []
+    if args.snapshot:
+        snapshot = load_snapshot(args.snapshot)
+        if snapshot is None:
+            parser.error(f"{args.snapshot} is not a snapshot")
+        devices = snapshot.collection("devices") or []
+        scenes = snapshot.collection("scenes") or []
+    simulator = HubSimulator(
+        devices,
+        scenes,
+        token=args.token,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        max_connections=args.max_connections,
+    )
+    with simulator:
+        print(f"Simulating a hub with {len(devices)} devices on {simulator.base_url}, token: {simulator.token}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+
+def routes_overlap(route: str, other: str) -> bool:
+    """
+    Routes overlap if they belong to the same collection, e.g. /devices and /devices/{id}.
+    A write to /devices/set/{id} changes several devices, so the collection is the unit of invalidation.
+    """
+    return route.strip("/").split("/", 1)[0] == other.strip("/").split("/", 1)[0]
+
+
+class SingleFlight:
+    """
+    Concurrent calls for the same key share one execution: the first caller runs the function,
+    callers arriving while it runs wait for and receive the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+        not_shared: Tuple[Type[BaseException], ...] = (),
+    ) -> Any:
+        """
+        Args:
+            key (str): Calls with equal keys are shared.
+            fn (Callable[[], Any]): Runs if no call of the key is in flight.
+            timeout (float, optional): Seconds a joining caller waits for the shared result,
+                raises concurrent.futures.TimeoutError afterwards. Defaults to waiting forever.
+            not_shared (Tuple[Type[BaseException], ...], optional): Failures specific to the caller that ran fn,
+                e.g. its own deadline. Joining callers do not receive them and call again instead.
+        """
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if future is None:
+                    future = self._calls[key] = Future()
+            if leader:
+                break
+            remaining = None if expires_at is None else expires_at - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise FutureTimeoutError()
+            try:
+                return future.result(remaining)
+            except not_shared:
+                continue
+        try:
+            result = fn()
+        except BaseException as err:
+            self._finish(key, future)
+            future.set_exception(err)
+            raise
+        self._finish(key, future)
+        future.set_result(result)
+        return result
+
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def forget(self, route: str) -> None:
+        """
+        Calls for overlapping routes that are in flight are no longer joined, later callers start a new one
+        """
+        with self._lock:
+            for key in [key for key in self._calls if routes_overlap(key, route)]:
+                del self._calls[key]
+
+
+class ReadCache:
+    """
+    Short-lived cache of GET responses, entries of a collection are dropped by every write to it.
+
+    Responses are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, ttl: float = 1.0) -> None:
+        """
+        Args:
+            ttl (float, optional): Seconds a response is served from the cache. Defaults to 1.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Changes with every invalidation, responses fetched across an invalidation are not stored
+        """
+        return self._generation
+
+    def get(self, route: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(route)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[route]
+                return None
+            return entry[1]
+
+    def put(self, route: str, data: Any, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._entries[route] = (time.monotonic() + self.ttl, data)
+
+    def invalidate(self, route: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if routes_overlap(key, route)]:
+                del self._entries[key]
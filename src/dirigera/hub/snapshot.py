@@ -0,0 +1,119 @@
+import datetime
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .single_flight import routes_overlap
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+COLLECTIONS = ("devices", "scenes")
+
+
+class InventorySnapshot:
+    """
+    /devices and /scenes payloads loaded from disk, served by Hub.get until the hub has been asked again.
+
+    The payloads are kept as the hub sent them: loading parses the file once and validates nothing,
+    models are only validated when they are requested. A write to a collection drops it from the snapshot.
+    With max_age, nothing is served once the snapshot is older than max_age seconds, or if its age is unknown.
+    """
+
+    def __init__(
+        self,
+        devices: List[Dict[str, Any]],
+        scenes: List[Dict[str, Any]],
+        saved_at: str = "",
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.saved_at = saved_at
+        self.max_age = max_age
+        self._expires_at: Optional[float] = None
+        if max_age is not None:
+            try:
+                self._expires_at = datetime.datetime.fromisoformat(saved_at).timestamp() + max_age
+            except ValueError:
+                self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._collections: Dict[str, Optional[List[Dict[str, Any]]]] = {"devices": devices, "scenes": scenes}
+        self._by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def collection(self, name: str) -> Optional[List[Dict[str, Any]]]:
+        return self._collections.get(name)
+
+    def expired(self) -> bool:
+        return self._expires_at is not None and time.time() >= self._expires_at
+
+    def lookup(self, route: str) -> Optional[Any]:
+        """
+        Serves /devices, /devices/{id}, /scenes and /scenes/{id}, returns None for everything else
+        """
+        parts = route.strip("/").split("/")
+        if len(parts) > 2 or self.expired():
+            return None
+        with self._lock:
+            payloads = self._collections.get(parts[0])
+            if payloads is None:
+                return None
+            if len(parts) == 1:
+                return payloads
+            by_id = self._by_id.get(parts[0])
+            if by_id is None:
+                by_id = self._by_id[parts[0]] = {payload["id"]: payload for payload in payloads}
+            return by_id.get(parts[1])
+
+    def invalidate(self, route: str) -> None:
+        with self._lock:
+            for name in COLLECTIONS:
+                if routes_overlap(name, route):
+                    self._collections[name] = None
+                    self._by_id.pop(name, None)
+
+
+def save_snapshot(path: str, devices: List[Dict[str, Any]], scenes: List[Dict[str, Any]]) -> None:
+    """
+    Writes the payloads as compact JSON. The file is replaced atomically, a crash never leaves half a snapshot.
+    """
+    content = {
+        "version": SNAPSHOT_VERSION,
+        "savedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "devices": devices,
+        "scenes": scenes,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".dirigera-snapshot-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(content, file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(path: str, max_age: Optional[float] = None) -> Optional[InventorySnapshot]:
+    """
+    Reads a snapshot written by save_snapshot, None if the file is missing, unreadable, of another version
+    or older than max_age seconds
+    """
+    try:
+        with open(path, "rb") as file:
+            content = json.loads(file.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable snapshot %s", path, exc_info=True)
+        return None
+    if not isinstance(content, dict) or content.get("version") != SNAPSHOT_VERSION:
+        logger.warning("Ignoring snapshot %s of another version", path)
+        return None
+    snapshot = InventorySnapshot(content["devices"], content["scenes"], content.get("savedAt", ""), max_age)
+    if snapshot.expired():
+        logger.info("Ignoring snapshot %s saved at %s, it is older than %s seconds", path, snapshot.saved_at, max_age)
+        return None
+    return snapshot
@@ -1,16 +1,61 @@
 import functools
 import re
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Union
+
+_CAMEL_PATTERN = re.compile(r"_([a-z])")
+_SNAKE_PATTERN = re.compile(r"([A-Z])")
+
+
+@functools.lru_cache(maxsize=4096)
+def camelize(key: str) -> str:
+    """
+    snake_case -> camelCase, results are memoised since payloads reuse a small set of keys
+    """
+    return _CAMEL_PATTERN.sub(lambda m: m.group(1).upper(), key)
+
+
+@functools.lru_cache(maxsize=4096)
+def snake_case(key: str) -> str:
+    """
+    camelCase -> snake_case, the inverse of camelize
+    """
+    return _SNAKE_PATTERN.sub(lambda m: "_" + m.group(1).lower(), key)
+
+
+def _convert_keys(
+    data: Union[Dict[str, Any], List[Any]], convert: Callable[[str], str]
+) -> Union[Dict[str, Any], List[Any]]:
+    """
+    Copies nested dicts/lists and converts all str keys, walks with an explicit stack instead of recursion
+    """
+    result: Union[Dict[str, Any], List[Any]] = [] if isinstance(data, list) else {}
+    stack = [(data, result)]
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, list):
+            for item in source:
+                if isinstance(item, (dict, list)):
+                    child: Union[Dict[str, Any], List[Any]] = [] if isinstance(item, list) else {}
+                    stack.append((item, child))
+                    item = child
+                target.append(item)  # type: ignore
+        else:
+            for key, value in source.items():
+                if isinstance(value, (dict, list)):
+                    child = [] if isinstance(value, list) else {}
+                    stack.append((value, child))
+                    value = child
+                target[convert(key) if isinstance(key, str) else key] = value  # type: ignore
+    return result
 
 
 def camelize_dict(
     data: Union[Dict[str, Any], List[Any]]
 ) -> Union[Dict[str, Any], List[Any]]:
-    camelize = functools.partial(re.sub, r"_([a-z])", lambda m: m.group(1).upper())
-
-    if isinstance(data, list):
-        return [camelize_dict(i) if isinstance(i, (dict, list)) else i for i in data]
-    return {
-        camelize(a): camelize_dict(b) if isinstance(b, (dict, list)) else b
-        for a, b in data.items()
-    }
+    return _convert_keys(data, camelize)
+
+
+def snake_case_dict(
+    data: Union[Dict[str, Any], List[Any]]
+) -> Union[Dict[str, Any], List[Any]]:
+    return _convert_keys(data, snake_case)
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .abstract_smart_home_hub import AbstractSmartHomeHub
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingWrites:  # pylint: disable=too-few-public-methods
+    __slots__ = ("attributes", "futures", "in_flight", "next_flush")
+
+    def __init__(self) -> None:
+        self.attributes: Dict[str, Any] = {}
+        self.futures: List[Tuple[Future, Optional[Callable[[], Any]]]] = []
+        self.in_flight = False
+        self.next_flush = 0.0
+
+
+class WriteBehind:
+    """
+    Coalesces attribute writes per device, only the latest value of every attribute is sent.
+
+    A device's first write is sent immediately. Writes that arrive while a PATCH to that device is in flight,
+    or within 1 / max_rate seconds of the last PATCH, are merged and sent as one PATCH once it is allowed.
+    Each write returns a Future that resolves when the PATCH carrying its value, or a later value of the same
+    attribute, has landed.
+    """
+
+    def __init__(
+        self, dirigera_client: AbstractSmartHomeHub, max_rate: float = 10.0, max_workers: int = 10
+    ) -> None:
+        """
+        Args:
+            dirigera_client (AbstractSmartHomeHub): Hub the PATCH requests are sent through.
+            max_rate (float, optional): Maximum number of PATCH requests per device and second. Defaults to 10.
+            max_workers (int, optional): Number of devices written concurrently. Defaults to 10.
+        """
+        if max_rate <= 0:
+            raise ValueError("max_rate must be greater than 0")
+        self.dirigera_client = dirigera_client
+        self.interval = 1 / max_rate
+        self._devices: Dict[str, _PendingWrites] = {}
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dirigera-writes")
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="dirigera-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        device_id: str,
+        attributes: Dict[str, Any],
+        on_success: Optional[Callable[[], Any]] = None,
+    ) -> Future:
+        """
+        Queues the attributes for the device, values still pending for the same attributes are replaced.
+        on_success is called in submission order once the write landed, before the Future resolves.
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise AssertionError("Write-behind is closed")
+            pending = self._devices.setdefault(device_id, _PendingWrites())
+            pending.attributes.update(attributes)
+            pending.futures.append((future, on_success))
+            self._condition.notify_all()
+        return future
+
+    def pending(self, device_id: str) -> Dict[str, Any]:
+        """
+        Returns the attributes still waiting to be sent to the device
+        """
+        with self._condition:
+            pending = self._devices.get(device_id)
+            return dict(pending.attributes) if pending is not None else {}
+
+    def _due(self, now: float) -> Optional[float]:
+        """
+        Starts the PATCH of every device that is due, returns the seconds until the next one is
+        """
+        wait: Optional[float] = None
+        for device_id, pending in list(self._devices.items()):
+            if pending.in_flight:
+                continue
+            if not pending.attributes:
+                if now >= pending.next_flush:
+                    del self._devices[device_id]
+                continue
+            if pending.next_flush > now:
+                delay = pending.next_flush - now
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            attributes, futures = pending.attributes, pending.futures
+            pending.attributes, pending.futures = {}, []
+            pending.in_flight = True
+            self._executor.submit(self._send, device_id, attributes, futures)
+        return wait
+
+    def _run(self) -> None:
+        with self._condition:
+            while not self._closed:
+                wait = self._due(time.monotonic())
+                self._condition.wait(wait)
+
+    def _send(
+        self,
+        device_id: str,
+        attributes: Dict[str, Any],
+        futures: List[Tuple[Future, Optional[Callable[[], Any]]]],
+    ) -> None:
+        error: Optional[BaseException] = None
+        try:
+            self.dirigera_client.patch(route=f"/devices/{device_id}", data=[{"attributes": attributes}])
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            error = err
+        for future, on_success in futures:
+            if error is not None:
+                future.set_exception(error)
+                continue
+            try:
+                if on_success is not None:
+                    on_success()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                future.set_exception(err)
+            else:
+                future.set_result(None)
+        with self._condition:
+            pending = self._devices[device_id]
+            pending.in_flight = False
+            pending.next_flush = time.monotonic() + self.interval
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until all pending writes have been sent, returns False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: all(not x.attributes and not x.in_flight for x in self._devices.values()),
+                timeout,
+            )
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Sends the pending writes and stops the background thread. Writes that have not been sent within
+        timeout seconds are cancelled and logged, a PATCH already in flight is left to finish in the background.
+        """
+        flushed = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            if not flushed:
+                self._cancel_pending()
+            self._condition.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=flushed)
+
+    def _cancel_pending(self) -> None:
+        for device_id, pending in self._devices.items():
+            if pending.attributes:
+                logger.warning("Cancelled unsent write of %s to device %s", pending.attributes, device_id)
+            for future, _ in pending.futures:
+                future.cancel()
+            pending.attributes, pending.futures = {}, []
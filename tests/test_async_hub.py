@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any, Dict, List
+import pytest
+from src.dirigera.hub.abstract_smart_home_hub import FakeAsyncDirigeraHub
+from src.dirigera.hub.async_hub import AsyncHub
+from src.dirigera.hub.resilience import deadline
+from src.dirigera.devices.device import Device
+from src.dirigera.devices.light import Light, dict_to_light
+from src.dirigera.devices.outlet import Outlet
+from .test_hub import DEVICES, device_dict
+
+
+class FakeTransportAsyncHub(AsyncHub):
+    def __init__(self, replies: Dict[str, Any]) -> None:
+        super().__init__(token="token", ip_address="127.0.0.1")
+        self.replies = replies
+        self.get_routes: List[str] = []
+
+    async def get(self, route: str) -> Any:
+        self.get_routes.append(route)
+        return self.replies[route]
+
+
+@pytest.fixture(name="async_hub")
+def fixture_async_hub() -> FakeTransportAsyncHub:
+    return FakeTransportAsyncHub(
+        {"/devices": DEVICES, "/devices/light-1": DEVICES[0]}
+    )
+
+
+@pytest.fixture(name="fake_client")
+def fixture_fake_client() -> FakeAsyncDirigeraHub:
+    return FakeAsyncDirigeraHub()
+
+
+@pytest.fixture(name="fake_light")
+def fixture_light(fake_client: FakeAsyncDirigeraHub) -> Light:
+    data = device_dict(
+        "light-1", "light", "light", isOn=False, lightLevel=10
+    )
+    data["capabilities"]["canReceive"] = ["customName", "isOn", "lightLevel"]
+    return dict_to_light(data, fake_client)
+
+
+def test_get_lights(async_hub: FakeTransportAsyncHub) -> None:
+    lights = asyncio.run(async_hub.get_lights())
+    assert [light.id for light in lights] == ["light-1"]
+    assert lights[0].dirigera_client == async_hub
+
+
+def test_get_light_by_name(async_hub: FakeTransportAsyncHub) -> None:
+    light = asyncio.run(async_hub.get_light_by_name("name light-1"))
+    assert light.id == "light-1"
+    with pytest.raises(AssertionError):
+        asyncio.run(async_hub.get_light_by_name("unknown"))
+
+
+def test_get_light_by_id_checks_type(async_hub: FakeTransportAsyncHub) -> None:
+    assert asyncio.run(async_hub.get_light_by_id("light-1")).id == "light-1"
+    with pytest.raises(ValueError):
+        asyncio.run(async_hub.get_outlet_by_id("light-1"))
+
+
+def test_get_all_devices(async_hub: FakeTransportAsyncHub) -> None:
+    devices = asyncio.run(async_hub.get_all_devices())
+    assert async_hub.get_routes == ["/devices"]
+    assert isinstance(devices[0], Light)
+    assert isinstance(devices[1], Outlet)
+    assert type(devices[3]) is Device  # pylint: disable=unidiomatic-typecheck
+
+
+def test_async_set_light_level(
+    fake_light: Light, fake_client: FakeAsyncDirigeraHub
+) -> None:
+    asyncio.run(fake_light.async_set_light_level(80))
+    action = fake_client.patch_actions.pop()
+    assert action["route"] == f"/devices/{fake_light.id}"
+    assert action["data"] == [{"attributes": {"lightLevel": 80}}]
+    assert fake_light.attributes.light_level == 80
+
+
+def test_async_setter_validates_before_sending(
+    fake_light: Light, fake_client: FakeAsyncDirigeraHub
+) -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(fake_light.async_set_light_level(101))
+    assert not fake_client.patch_actions
+    assert fake_light.attributes.light_level == 10
+
+
+def test_async_reload(fake_light: Light, fake_client: FakeAsyncDirigeraHub) -> None:
+    data = device_dict("light-1", "light", "light", isOn=True)
+    fake_client.get_action_replys[f"/devices/{fake_light.id}"] = data
+    light = asyncio.run(fake_light.async_reload())
+    assert light.attributes.is_on
+    assert light.dirigera_client == fake_client
+
+
+def test_sync_setter_rejects_async_client(fake_light: Light) -> None:
+    with pytest.raises(TypeError):
+        fake_light.set_light(True)
+
+
+def test_async_batch(fake_light: Light, fake_client: FakeAsyncDirigeraHub) -> None:
+    async def run() -> None:
+        async with fake_light.batch() as light:
+            await light.async_set_light(True)
+            await light.async_set_light_level(50)
+
+    asyncio.run(run())
+    assert fake_client.patch_actions == [
+        {
+            "route": f"/devices/{fake_light.id}",
+            "data": [{"attributes": {"isOn": True, "lightLevel": 50}}],
+        }
+    ]
+    assert fake_light.attributes.light_level == 50
+
+
+def test_request_timeout() -> None:
+    hub = AsyncHub(token="token", ip_address="127.0.0.1", timeout=2.5)
+    assert hub._timeout().total == 2.5  # pylint: disable=protected-access
+    with deadline(1):
+        total = hub._timeout().total  # pylint: disable=protected-access
+        assert total is not None and total <= 1
+    assert AsyncHub(token="token", ip_address="127.0.0.1").timeout == 10
@@ -0,0 +1,21 @@
+from collections import Counter
+from benchmarks.fleet import DEVICE_KINDS, FleetHub, generate_fleet, generate_scenes
+from benchmarks.run import BENCHMARKS, compare, run
+
+
+def test_fleet_contains_every_kind() -> None:
+    fleet = generate_fleet(200)
+    assert fleet == generate_fleet(200)
+    kinds = Counter(device["deviceType"] for device in fleet)
+    assert set(kinds) == {kind[1] for kind in DEVICE_KINDS}
+    hub = FleetHub(fleet, generate_scenes(fleet, 3))
+    assert len(hub.get_all_devices()) == 200
+    assert len(hub.get_scenes()) == 3
+
+
+def test_benchmarks_run_and_compare() -> None:
+    results = run([len(DEVICE_KINDS)], list(BENCHMARKS), min_time=0, min_runs=1)
+    assert set(results) == {f"{name}[{len(DEVICE_KINDS)}]" for name in BENCHMARKS}
+    slower = {key: {"per_op_us": result["per_op_us"] / 2} for key, result in results.items()}
+    assert sorted(compare(results, {"results": slower}, tolerance=0.2)) == sorted(results)
+    assert not compare(results, {"results": results}, tolerance=0.2)
@@ -0,0 +1,97 @@
+import copy
+from typing import Any, List
+import requests
+from pydantic import ValidationError
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.bulk_fetch import use_device_list
+from src.dirigera.devices.light import Light
+from src.dirigera.devices.outlet import Outlet
+from .test_hub import DEVICES, FakeAdapter
+
+
+class FleetAdapter(FakeAdapter):
+    """
+    Serves /devices and /devices/{id} from DEVICES, unknown ids answer 404
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.devices = copy.deepcopy(DEVICES)
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        path = request.path_url
+        self.replies = {"/v1/devices": self.devices, **{f"/v1/devices/{x['id']}": x for x in self.devices}}
+        self.status_code = 200 if path in self.replies else 404
+        return super().send(request, *args, **kwargs)
+
+
+def fleet_hub() -> Hub:
+    hub = Hub(token="token", ip_address="127.0.0.1", pool_maxsize=3)
+    hub.session.mount("https://", FleetAdapter())
+    return hub
+
+
+def adapter_of(hub: Hub) -> FleetAdapter:
+    adapter = hub.session.get_adapter(hub.api_base_url)
+    assert isinstance(adapter, FleetAdapter)
+    return adapter
+
+
+def paths(hub: Hub) -> List[str]:
+    return sorted(x.path_url for x in adapter_of(hub).requests)
+
+
+def test_use_device_list() -> None:
+    assert not use_device_list(2, None, 0.25, 10)
+    assert use_device_list(11, None, 0.25, 10)
+    assert not use_device_list(2, 100, 0.25, 10)
+    assert use_device_list(25, 100, 0.25, 10)
+
+
+def test_per_id_requests_report_missing() -> None:
+    hub = fleet_hub()
+    result = hub.get_devices_by_ids(["outlet-1", "unknown", "light-1", "outlet-1"])
+    assert paths(hub) == ["/v1/devices/light-1", "/v1/devices/outlet-1", "/v1/devices/unknown"]
+    assert list(result.devices) == ["outlet-1", "light-1"]
+    assert isinstance(result.devices["outlet-1"], Outlet)
+    assert isinstance(result.devices["light-1"], Light)
+    assert result.missing == ["unknown"]
+    assert not result.errors
+    assert not result.ok
+
+
+def test_device_list_for_large_share() -> None:
+    hub = fleet_hub()
+    result = hub.get_devices_by_ids(["light-1", "outlet-1", "motion-1", "unknown"])
+    assert paths(hub) == ["/v1/devices"]
+    assert hub.fleet_size == len(DEVICES)
+    assert list(result.devices) == ["light-1", "outlet-1", "motion-1"]
+    assert result.missing == ["unknown"]
+    hub.get_devices_by_ids(["light-1"], ratio=0.5)
+    assert paths(hub) == ["/v1/devices", "/v1/devices/light-1"]
+
+
+def test_reload_many_updates_in_place() -> None:
+    hub = fleet_hub()
+    lights = hub.get_devices_by_ids(["light-1", "outlet-1"]).devices
+    light = lights["light-1"]
+    assert isinstance(light, Light)
+    adapter_of(hub).devices[0]["attributes"]["isOn"] = False
+    models = list(lights.values())
+    result = hub.reload_many(models)
+    assert result.devices["light-1"] is light
+    assert result.changed == {"light-1": {"attributes.is_on"}, "outlet-1": set()}
+    assert light.attributes.is_on is False
+
+
+def test_invalid_payload_is_reported_per_device() -> None:
+    hub = fleet_hub()
+    models = list(hub.get_devices_by_ids(["light-1", "outlet-1"]).devices.values())
+    adapter_of(hub).devices[0]["attributes"]["isOn"] = [1]
+    result = hub.get_devices_by_ids(["light-1", "outlet-1"])
+    assert list(result.devices) == ["outlet-1"]
+    assert isinstance(result.errors["light-1"], ValidationError)
+    assert not result.ok
+    result = hub.reload_many(models)
+    assert list(result.devices) == ["outlet-1"]
+    assert list(result.errors) == ["light-1"]
@@ -0,0 +1,92 @@
+import json
+from typing import Any, Dict
+import pytest
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.device_cache import DeviceCache
+from .test_hub import DEVICES, FakeAdapter
+
+
+def state_changed(id_: str, **attributes: Any) -> Dict[str, Any]:
+    return {
+        "type": "deviceStateChanged",
+        "data": {"id": id_, "attributes": attributes},
+    }
+
+
+@pytest.fixture(name="cache")
+def fixture_cache() -> DeviceCache:
+    cache = DeviceCache(max_age=None)
+    cache.set_snapshot(DEVICES)
+    return cache
+
+
+@pytest.fixture(name="adapter")
+def fixture_adapter() -> FakeAdapter:
+    return FakeAdapter(
+        {"/v1/devices": DEVICES, "/v1/devices/light-1": DEVICES[0]}
+    )
+
+
+@pytest.fixture(name="hub")
+def fixture_hub(adapter: FakeAdapter) -> Hub:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    return hub
+
+
+def test_lookup(cache: DeviceCache) -> None:
+    assert cache.lookup("/devices") == DEVICES
+    assert cache.lookup("/devices/light-1") == DEVICES[0]
+    assert cache.lookup("/devices/unknown") is None
+    assert cache.lookup("/scenes") is None
+
+
+def test_state_changed_event_merges_attributes(cache: DeviceCache) -> None:
+    before = cache.get_device("light-1")
+    cache.handle_message(json.dumps(state_changed("light-1", isOn=False)))
+    after = cache.get_device("light-1")
+    assert after is not None and before is not None
+    assert after["attributes"]["isOn"] is False
+    assert after["attributes"]["customName"] == "name light-1"
+    assert before["attributes"]["isOn"] is True
+
+
+def test_added_and_removed_events(cache: DeviceCache) -> None:
+    cache.handle_event({"type": "deviceRemoved", "data": {"id": "light-1"}})
+    assert cache.get_device("light-1") is None
+    cache.handle_event({"type": "deviceAdded", "data": DEVICES[0]})
+    assert cache.get_device("light-1") == DEVICES[0]
+
+
+def test_stale_snapshot_is_not_served() -> None:
+    cache = DeviceCache(max_age=0)
+    cache.set_snapshot(DEVICES)
+    cache._updated_at -= 1  # pylint: disable=protected-access
+    assert cache.lookup("/devices") is None
+
+
+def test_hub_reads_from_cache(hub: Hub, adapter: FakeAdapter) -> None:
+    hub.enable_device_cache(max_age=None)
+    assert len(adapter.requests) == 1
+    light = hub.get_light_by_id("light-1")
+    lights = hub.get_lights()
+    assert light.reload().id == "light-1"
+    assert len(adapter.requests) == 1
+    assert [x.id for x in lights] == ["light-1"]
+
+
+def test_hub_applies_patch_and_events(hub: Hub) -> None:
+    hub.enable_device_cache(max_age=None)
+    light = hub.get_light_by_id("light-1")
+    light.set_light(False)
+    assert not light.reload().attributes.is_on
+    on_message = hub._on_message(None)  # pylint: disable=protected-access
+    on_message(None, json.dumps(state_changed("light-1", isOn=True)))
+    assert light.reload().attributes.is_on
+
+
+def test_hub_falls_back_to_http_when_stale(hub: Hub, adapter: FakeAdapter) -> None:
+    cache = hub.enable_device_cache(max_age=0)
+    cache._updated_at -= 1  # pylint: disable=protected-access
+    hub.get_lights()
+    assert len(adapter.requests) == 2
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any, Dict, List
+import pytest
+from src.dirigera.hub.abstract_smart_home_hub import (
+    FakeAsyncDirigeraHub,
+    FakeDirigeraHub,
+)
+from src.dirigera.hub.device_group import DeviceGroup
+from src.dirigera.devices.light import Light, dict_to_light
+from .test_hub import device_dict
+
+
+class FailingHub(FakeDirigeraHub):
+    def __init__(self, failing: List[str]) -> None:
+        super().__init__()
+        self.failing = failing
+
+    def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
+        if route.split("/")[-1] in self.failing:
+            raise ConnectionError(route)
+        return super().patch(route, data)
+
+
+@pytest.fixture(name="fake_client")
+def fixture_fake_client() -> FailingHub:
+    return FailingHub(failing=["light-2"])
+
+
+@pytest.fixture(name="lights")
+def fixture_lights(fake_client: FailingHub) -> List[Light]:
+    return [
+        dict_to_light(device_dict(f"light-{i}", "light", "light", isOn=True), fake_client)
+        for i in range(3)
+    ]
+
+
+def test_set_attributes_reports_per_device(
+    lights: List[Light], fake_client: FailingHub
+) -> None:
+    group = DeviceGroup(fake_client, [lights[0], lights[2], "light-1"], max_concurrency=2)
+    result = group.set_on(False)
+    assert sorted(result.results) == ["light-0", "light-1"]
+    assert list(result.errors) == ["light-2"]
+    assert isinstance(result.errors["light-2"], ConnectionError)
+    assert not result.ok
+    assert sorted(action["route"] for action in fake_client.patch_actions) == [
+        "/devices/light-0",
+        "/devices/light-1",
+    ]
+    assert not lights[0].attributes.is_on
+    assert lights[2].attributes.is_on
+
+
+def test_set_attributes_uses_device_set(
+    lights: List[Light], fake_client: FailingHub
+) -> None:
+    group = DeviceGroup(fake_client, lights[:2], device_set_id="set-1")
+    result = group.set_attributes({"lightLevel": 30})
+    assert result.ok
+    assert fake_client.patch_actions == [
+        {"route": "/devices/set/set-1", "data": [{"attributes": {"lightLevel": 30}}]}
+    ]
+    assert lights[0].attributes.light_level == 30
+    assert lights[1].attributes.light_level == 30
+
+
+def test_async_set_attributes() -> None:
+    fake_client = FakeAsyncDirigeraHub()
+    group = DeviceGroup(fake_client, ["a", "b", "c"], max_concurrency=2)
+    result = asyncio.run(group.async_set_on(True))
+    assert result.ok
+    assert sorted(result.results) == ["a", "b", "c"]
+    assert len(fake_client.patch_actions) == 3
+    with pytest.raises(TypeError):
+        group.set_on(False)
+    assert len(fake_client.patch_actions) == 3
+
+
+def test_apply_error_is_not_a_failed_write(lights: List[Light], fake_client: FailingHub) -> None:
+    group = DeviceGroup(fake_client, lights[:2])
+    result = group.set_attributes({"lightLevel": "bright"})
+    assert result.ok
+    assert sorted(result.results) == ["light-0", "light-1"]
+    assert sorted(result.apply_errors) == ["light-0", "light-1"]
+    assert len(fake_client.patch_actions) == 2
+
+
+class CancellingAsyncHub(FakeAsyncDirigeraHub):
+    async def patch(self, route: str, data: List[Dict[str, Any]]) -> Any:
+        if route == "/devices/b":
+            raise asyncio.CancelledError()
+        return await super().patch(route, data)
+
+
+def test_async_set_attributes_propagates_cancellation() -> None:
+    group = DeviceGroup(CancellingAsyncHub(), ["a", "b", "c"])
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(group.async_set_on(True))
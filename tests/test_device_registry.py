@@ -0,0 +1,124 @@
+import json
+from typing import Any, Dict, List
+import pytest
+from src.dirigera.hub.abstract_smart_home_hub import FakeDirigeraHub
+from src.dirigera.hub.device_registry import DeviceRegistry
+from src.dirigera.hub.hub import Hub
+from src.dirigera.devices.device import Device
+from src.dirigera.devices.device_factory import dict_to_device
+from src.dirigera.devices.light import Light
+from src.dirigera.devices.outlet import Outlet
+from .test_hub import DEVICES, FakeAdapter, device_dict
+
+
+@pytest.fixture(name="fake_client")
+def fixture_fake_client() -> FakeDirigeraHub:
+    return FakeDirigeraHub()
+
+
+@pytest.fixture(name="devices")
+def fixture_devices(fake_client: FakeDirigeraHub) -> List[Device]:
+    return [dict_to_device(data, fake_client) for data in DEVICES]
+
+
+@pytest.fixture(name="registry")
+def fixture_registry(devices: List[Device]) -> DeviceRegistry:
+    return DeviceRegistry(devices)
+
+
+def test_indexes(registry: DeviceRegistry, devices: List[Device]) -> None:
+    assert len(registry) == len(devices)
+    assert registry.get("light-1") is devices[0]
+    assert registry.by_name("name outlet-1") == [devices[1]]
+    assert registry.by_room("room-1") == devices
+    assert registry.by_type("sensor") == [devices[2]]
+    assert registry.by_device_type("speaker") == [devices[3]]
+    assert registry.find_by_name("name light-1", Light) == [devices[0]]
+    assert registry.find_by_name("name light-1", Outlet) == []
+
+
+def test_remove(registry: DeviceRegistry) -> None:
+    registry.remove("light-1")
+    assert "light-1" not in registry
+    assert registry.by_name("name light-1") == []
+    assert registry.by_device_type("light") == []
+
+
+def test_state_changed_event_reindexes(
+    registry: DeviceRegistry, fake_client: FakeDirigeraHub
+) -> None:
+    event = {
+        "type": "deviceStateChanged",
+        "data": {"id": "light-1", "attributes": {"customName": "Desk", "isOn": False}},
+    }
+    registry.handle_event(event, fake_client)
+    light = registry.find_by_name("Desk", Light)[0]
+    assert not light.attributes.is_on
+    assert registry.by_name("name light-1") == []
+
+
+def test_device_added_event(
+    registry: DeviceRegistry, fake_client: FakeDirigeraHub
+) -> None:
+    data = device_dict("outlet-2", "outlet", "outlet", isOn=True)
+    registry.handle_event({"type": "deviceAdded", "data": data}, fake_client)
+    assert isinstance(registry.get("outlet-2"), Outlet)
+    assert len(registry.by_device_type("outlet")) == 2
+
+
+def test_hub_name_lookup_without_requests() -> None:
+    adapter = FakeAdapter({"/v1/devices": DEVICES, "/v1/scenes": []})
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    hub.enable_device_registry()
+    assert len(adapter.requests) == 2
+    light = hub.get_light_by_name("name light-1")
+    assert hub.get_outlet_by_name("name outlet-1").id == "outlet-1"
+    with pytest.raises(AssertionError):
+        hub.get_light_by_name("name outlet-1")
+    assert len(adapter.requests) == 2
+    on_message = hub._on_message(None)  # pylint: disable=protected-access
+    on_message(
+        None,
+        json.dumps(
+            {"type": "deviceStateChanged", "data": {"id": "light-1", "attributes": {"isOn": False}}}
+        ),
+    )
+    assert hub.get_light_by_name("name light-1") is light
+    assert not light.attributes.is_on
+
+
+def test_setter_reindexes_registered_device() -> None:
+    adapter = FakeAdapter({"/v1/devices": DEVICES, "/v1/scenes": []})
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    hub.enable_device_registry()
+    light = hub.get_light_by_name("name light-1")
+    light.set_name("Renamed")
+    assert hub.get_light_by_name("Renamed") is light
+    with pytest.raises(AssertionError):
+        hub.get_light_by_name("name light-1")
+    copy = dict_to_device(DEVICES[1], hub)
+    assert isinstance(copy, Outlet)
+    copy.set_name("Kettle")
+    assert hub.get_outlet_by_name("Kettle").attributes.custom_name == "Kettle"
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        {"type": "deviceAdded", "data": {"id": "light-9", "type": "light", "deviceType": "light"}},
+        {"type": "deviceStateChanged", "data": {"id": "light-1", "attributes": {"isOn": "sometimes"}}},
+        {"type": "sceneCreated", "data": {"id": "scene-9", "info": None}},
+    ],
+)
+def test_malformed_event_does_not_stop_on_message(event: Dict[str, Any]) -> None:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", FakeAdapter({"/v1/devices": DEVICES, "/v1/scenes": []}))
+    registry = hub.enable_device_registry()
+    messages: List[str] = []
+    on_message = hub._on_message(lambda _ws, message: messages.append(message))  # pylint: disable=protected-access
+    on_message(None, json.dumps(event))
+    assert len(messages) == 1
+    assert "light-9" not in registry
+    assert registry.get_scene("scene-9") is None
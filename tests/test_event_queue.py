@@ -0,0 +1,172 @@
+import importlib.abc
+import json
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+from unittest import mock
+import pytest
+from src.dirigera.hub.event_queue import EventQueue, OverflowPolicy, QueuedEvent
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.resync import Backoff
+from .test_events import state_changed
+
+
+def queued(id_: str, **attributes: Any) -> QueuedEvent:
+    event = state_changed(id_, "light", **attributes)
+    return QueuedEvent(json.dumps(event), event)
+
+
+class BlockedHandler:  # pylint: disable=too-few-public-methods
+    """
+    Handler that holds the first event until released, so the following events pile up in the queue
+    """
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.handled: List[Dict[str, Any]] = []
+
+    def __call__(self, item: QueuedEvent) -> None:
+        self.started.set()
+        self.release.wait(5)
+        assert item.event is not None
+        self.handled.append(item.event["data"])
+
+
+def fill(overflow: OverflowPolicy, items: List[QueuedEvent]) -> BlockedHandler:
+    handler = BlockedHandler()
+    event_queue = EventQueue(handler, maxsize=2, overflow=overflow)
+    event_queue.put(queued("first", isOn=True))
+    assert handler.started.wait(5)
+    for item in items:
+        event_queue.put(item)
+    handler.release.set()
+    assert event_queue.join(timeout=5)
+    assert event_queue.dropped + event_queue.coalesced + len(handler.handled) == len(items) + 1
+    event_queue.stop()
+    return handler
+
+
+def test_drop_oldest() -> None:
+    handler = fill(
+        OverflowPolicy.DROP_OLDEST,
+        [queued("a", isOn=True), queued("b", isOn=True), queued("c", isOn=True)],
+    )
+    assert [x["id"] for x in handler.handled] == ["first", "b", "c"]
+
+
+def test_coalesce_merges_pending_device_changes() -> None:
+    handler = fill(
+        OverflowPolicy.COALESCE,
+        [queued("a", isOn=True), queued("b", lightLevel=5), queued("a", lightLevel=10), queued("a", isOn=False)],
+    )
+    assert [x["id"] for x in handler.handled] == ["first", "a", "b"]
+    assert handler.handled[1]["attributes"] == {"isOn": False, "lightLevel": 10}
+
+
+def test_block_waits_for_free_slot() -> None:
+    handler = BlockedHandler()
+    event_queue = EventQueue(handler, maxsize=1, overflow=OverflowPolicy.BLOCK)
+    event_queue.put(queued("first"))
+    assert handler.started.wait(5)
+    event_queue.put(queued("a"))
+    producer = threading.Thread(target=event_queue.put, args=(queued("b"),))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive()
+    handler.release.set()
+    producer.join(5)
+    assert event_queue.join(timeout=5)
+    assert [x["id"] for x in handler.handled] == ["first", "a", "b"]
+    event_queue.stop()
+
+
+def test_failing_handler_keeps_worker_alive() -> None:
+    handled: List[QueuedEvent] = []
+
+    def handler(item: QueuedEvent) -> None:
+        handled.append(item)
+        if len(handled) == 1:
+            raise RuntimeError("boom")
+
+    event_queue = EventQueue(handler, workers=2)
+    event_queue.put(queued("a"))
+    event_queue.put(queued("b"))
+    assert event_queue.join(timeout=5)
+    assert len(handled) == 2
+    event_queue.stop()
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        EventQueue(lambda _: None, maxsize=0)
+    with pytest.raises(ValueError):
+        EventQueue(lambda _: None, workers=0)
+
+
+class FakeWebSocketApp:
+    def __init__(self, _url: str, on_message: Any = None, **_kwargs: Any) -> None:
+        self.on_message = on_message
+        self.closed = threading.Event()
+
+    def run_forever(self, **_kwargs: Any) -> None:
+        for id_ in ("light-1", "light-2"):
+            self.on_message(self, json.dumps(state_changed(id_, "light", isOn=True)))
+        self.closed.wait(5)
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def test_start_event_listener(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("websocket.WebSocketApp", FakeWebSocketApp)
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    messages: List[str] = []
+    subscribed: List[Any] = []
+    hub.events.subscribe(subscribed.append, device_type="light")
+    event_queue = hub.start_event_listener(on_message=lambda _ws, message: messages.append(message))
+    assert hub.listener_thread is not None and hub.listener_thread.daemon
+    with pytest.raises(AssertionError):
+        hub.start_event_listener()
+    deadline = time.monotonic() + 5
+    while len(messages) < 2 and time.monotonic() < deadline:
+        event_queue.join(timeout=0.1)
+        time.sleep(0.01)
+    assert len(messages) == 2
+    assert [x.device_id for x in subscribed] == ["light-1", "light-2"]
+    hub.stop_event_listener()
+    assert hub.listener_thread is None
+    assert hub.event_queue is None
+
+
+class SlowImport(importlib.abc.MetaPathFinder):
+    """
+    Holds the first import of websocket until released
+    """
+
+    def __init__(self) -> None:
+        self.released = threading.Event()
+
+    def find_spec(self, fullname: str, *_args: Any) -> None:
+        if fullname == "websocket":
+            self.released.wait(5)
+
+
+def test_stop_before_listener_thread_started() -> None:
+    finder = SlowImport()
+    with mock.patch.dict(sys.modules):
+        sys.modules.pop("websocket", None)
+        sys.meta_path.insert(0, finder)
+        try:
+            hub = Hub(token="token", ip_address="127.0.0.1")
+            hub.start_event_listener(backoff=Backoff(initial=0.01, maximum=0.01))
+            thread = hub.listener_thread
+            assert thread is not None
+            threading.Timer(0.1, finder.released.set).start()
+            started = time.monotonic()
+            hub.stop_event_listener()
+            assert time.monotonic() - started < 2
+            assert not thread.is_alive()
+        finally:
+            sys.meta_path.remove(finder)
@@ -0,0 +1,124 @@
+import json
+from typing import Any, Dict, List
+import pytest
+from src.dirigera.hub.events import (
+    DeviceStateChangedEvent,
+    EventRouter,
+    EventType,
+    HubEvent,
+    SceneTriggeredEvent,
+    parse_event,
+)
+from src.dirigera.hub.device_cache import DeviceCache
+from src.dirigera.hub.hub import Hub
+
+
+def state_changed(id_: str, device_type: str, **attributes: Any) -> Dict[str, Any]:
+    return {
+        "id": "event-1",
+        "specversion": "1.1.0",
+        "source": "urn:com:ikea:homesmart:iotc:zigbee",
+        "time": "2023-10-28T04:42:14.000Z",
+        "type": "deviceStateChanged",
+        "data": {"id": id_, "deviceType": device_type, "attributes": attributes},
+    }
+
+
+@pytest.fixture(name="router")
+def fixture_router() -> EventRouter:
+    return EventRouter()
+
+
+def test_parse_event() -> None:
+    event = parse_event(json.dumps(state_changed("light-1", "light", isOn=True)))
+    assert isinstance(event, DeviceStateChangedEvent)
+    assert event.device_id == "light-1"
+    assert event.device_type == "light"
+    assert event.attributes == {"isOn": True}
+    scene = parse_event(json.dumps({"type": "sceneTriggered", "data": {"id": "scene-1"}}))
+    assert isinstance(scene, SceneTriggeredEvent)
+    assert scene.scene_id == "scene-1"
+    assert type(parse_event('{"type": "other"}')) is HubEvent  # pylint: disable=unidiomatic-typecheck
+    assert parse_event("not json") is None
+    assert parse_event("[]") is None
+
+
+def test_subscriptions_filter(router: EventRouter) -> None:
+    received: Dict[str, List[HubEvent]] = {
+        "id": [], "type": [], "attribute": [], "combined": [], "all": [], "scene": []
+    }
+    router.subscribe(received["id"].append, device_id="light-1")
+    router.subscribe(received["type"].append, device_type="outlet")
+    router.subscribe(received["attribute"].append, attribute="lightLevel")
+    router.subscribe(received["combined"].append, device_type="light", attribute="isOn")
+    router.subscribe(received["all"].append)
+    router.subscribe(received["scene"].append, event_type=EventType.SCENE_TRIGGERED)
+
+    router.handle_message(json.dumps(state_changed("light-1", "light", isOn=True)))
+    router.handle_message(json.dumps(state_changed("light-2", "light", lightLevel=3)))
+    router.handle_message(json.dumps(state_changed("outlet-1", "outlet", isOn=False)))
+    router.handle_message(json.dumps({"type": "sceneTriggered", "data": {"id": "scene-1"}}))
+
+    assert [e.device_id for e in received["id"]] == ["light-1"]
+    assert [e.device_id for e in received["type"]] == ["outlet-1"]
+    assert [e.device_id for e in received["attribute"]] == ["light-2"]
+    assert [e.device_id for e in received["combined"]] == ["light-1"]
+    assert len(received["all"]) == 4
+    assert len(received["scene"]) == 1
+
+
+def test_unsubscribe_and_failing_callback(router: EventRouter) -> None:
+    received: List[HubEvent] = []
+
+    def failing(_: HubEvent) -> None:
+        raise RuntimeError("boom")
+
+    router.subscribe(failing, device_id="light-1")
+    subscription_id = router.subscribe(received.append, device_id="light-1")
+    later: List[HubEvent] = []
+    router.subscribe(later.append, device_id="light-1")
+    router.handle_message(json.dumps(state_changed("light-1", "light", isOn=True)))
+    router.unsubscribe(subscription_id)
+    router.handle_message(json.dumps(state_changed("light-1", "light", isOn=False)))
+    assert len(received) == 1
+    assert len(later) == 2
+    assert len(router) == 2
+
+
+def test_hub_dispatches_to_router() -> None:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    received: List[HubEvent] = []
+    hub.events.subscribe(received.append, attribute="isOn")
+    on_message = hub._on_message(None)  # pylint: disable=protected-access
+    on_message(None, json.dumps(state_changed("light-1", "light", isOn=True)))
+    assert isinstance(received[0], DeviceStateChangedEvent)
+
+
+@pytest.mark.parametrize("change", [{"data": None}, {"time": "yesterday"}])
+def test_malformed_event_is_skipped(change: Dict[str, Any]) -> None:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    received: List[HubEvent] = []
+    messages: List[str] = []
+    hub.events.subscribe(received.append)
+    on_message = hub._on_message(lambda _ws, message: messages.append(message))  # pylint: disable=protected-access
+    on_message(None, json.dumps({**state_changed("light-1", "light", isOn=True), **change}))
+    on_message(None, json.dumps(state_changed("light-2", "light", isOn=True)))
+    assert len(messages) == 2
+    assert [x.device_id for x in received] == ["light-2"]
+
+
+def test_failing_consumer_does_not_block_the_others(monkeypatch: pytest.MonkeyPatch) -> None:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    cache = hub.device_cache = DeviceCache(max_age=None)
+
+    def fail(_event: Dict[str, Any]) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(cache, "handle_event", fail)
+    received: List[HubEvent] = []
+    messages: List[str] = []
+    hub.events.subscribe(received.append)
+    on_message = hub._on_message(lambda _ws, message: messages.append(message))  # pylint: disable=protected-access
+    on_message(None, json.dumps(state_changed("light-1", "light", isOn=True)))
+    assert [x.device_id for x in received] == ["light-1"]
+    assert len(messages) == 1
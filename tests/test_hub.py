@@ -0,0 +1,171 @@
+import json
+from typing import Any, Dict, List, Optional
+import pytest
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from pydantic import ValidationError
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.abstract_smart_home_hub import FakeDirigeraHub
+from src.dirigera.devices.device_factory import dict_to_device, parse_devices
+from src.dirigera.devices.device import Device
+from src.dirigera.devices.light import Light
+from src.dirigera.devices.motion_sensor import MotionSensor
+from src.dirigera.devices.outlet import Outlet
+
+
+def device_dict(
+    id_: str, type_: str, device_type: str, **attributes: Any
+) -> Dict[str, Any]:
+    return {
+        "id": id_,
+        "type": type_,
+        "deviceType": device_type,
+        "createdAt": "2023-01-07T20:07:19.000Z",
+        "isReachable": True,
+        "lastSeen": "2023-10-28T04:42:14.000Z",
+        "attributes": {
+            "customName": f"name {id_}",
+            "model": "model",
+            "manufacturer": "IKEA of Sweden",
+            "firmwareVersion": "1.0.0",
+            "hardwareVersion": "1",
+            **attributes,
+        },
+        "capabilities": {"canSend": [], "canReceive": ["customName", "isOn"]},
+        "room": {
+            "id": "room-1",
+            "name": "Bedroom",
+            "color": "ikea_yellow_no_24",
+            "icon": "rooms_bed",
+        },
+        "deviceSet": [],
+        "remoteLinks": [],
+    }
+
+
+DEVICES: List[Dict[str, Any]] = [
+    device_dict("light-1", "light", "light", isOn=True),
+    device_dict("outlet-1", "outlet", "outlet", isOn=False),
+    device_dict("motion-1", "sensor", "motionSensor", isOn=True),
+    device_dict("speaker-1", "speaker", "speaker"),
+]
+
+
+class CountingHub(Hub):
+    def __init__(self, replies: Dict[str, Any]) -> None:
+        super().__init__(token="token", ip_address="127.0.0.1")
+        self.replies = replies
+        self.get_routes: List[str] = []
+
+    def get(self, route: str) -> Any:
+        self.get_routes.append(route)
+        return self.replies[route]
+
+
+@pytest.fixture(name="hub")
+def fixture_hub() -> CountingHub:
+    return CountingHub({"/devices": DEVICES})
+
+
+def test_get_all_devices_single_request(hub: CountingHub) -> None:
+    devices = hub.get_all_devices()
+    assert hub.get_routes == ["/devices"]
+    assert [device.id for device in devices] == [d["id"] for d in DEVICES]
+
+
+def test_get_all_devices_dispatches_by_type(hub: CountingHub) -> None:
+    devices = hub.get_all_devices()
+    assert isinstance(devices[0], Light)
+    assert isinstance(devices[1], Outlet)
+    assert isinstance(devices[2], MotionSensor)
+    assert devices[0].dirigera_client == hub
+
+
+def test_get_all_devices_keeps_unknown_types(hub: CountingHub) -> None:
+    unknown = hub.get_all_devices()[3]
+    assert type(unknown) is Device  # pylint: disable=unidiomatic-typecheck
+    assert unknown.device_type == "speaker"
+    assert dict_to_device(DEVICES[3], hub).dirigera_client is hub
+
+
+def test_listing_helpers_validate_only_their_type(hub: CountingHub) -> None:
+    lights = hub.get_lights()
+    assert [type(x) for x in lights] == [Light]
+    assert lights[0].dirigera_client == hub
+    assert [x.id for x in hub.get_motion_sensors()] == ["motion-1"]
+    assert "dirigeraClient" not in DEVICES[0]
+
+
+def test_parse_devices_reports_invalid_device() -> None:
+    broken = device_dict("light-2", "light", "light")
+    with pytest.raises(ValidationError):
+        parse_devices([*DEVICES, broken], FakeDirigeraHub())
+
+
+class FakeAdapter(BaseAdapter):
+    def __init__(self, replies: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__()
+        self.replies = replies or {}
+        self.requests: List[requests.PreparedRequest] = []
+        self.status_code = 200
+        self.closed = False
+
+    def send(
+        self, request: requests.PreparedRequest, *_args: Any, **_kwargs: Any
+    ) -> requests.Response:
+        self.requests.append(request)
+        response = requests.Response()
+        response.status_code = self.status_code
+        reply = self.replies.get(request.path_url, {"method": request.method})
+        response._content = json.dumps(  # pylint: disable=protected-access
+            reply
+        ).encode()
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(name="adapter")
+def fixture_adapter() -> FakeAdapter:
+    return FakeAdapter()
+
+
+@pytest.fixture(name="session_hub")
+def fixture_session_hub(adapter: FakeAdapter) -> Hub:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    return hub
+
+
+def test_session_pool_size() -> None:
+    hub = Hub(token="token", ip_address="127.0.0.1", pool_maxsize=42)
+    adapter = hub.session.get_adapter(hub.api_base_url)
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 42
+    hub.close()
+
+
+def test_requests_share_session(session_hub: Hub, adapter: FakeAdapter) -> None:
+    assert session_hub.get("/devices") == {"method": "GET"}
+    session_hub.patch("/devices/1", data=[{"attributes": {"isOn": True}}])
+    session_hub.post("/scenes/1/trigger")
+    session_hub.delete("/scenes/1")
+    assert [request.method for request in adapter.requests] == [
+        "GET",
+        "PATCH",
+        "POST",
+        "DELETE",
+    ]
+    assert adapter.requests[0].url == "https://127.0.0.1:8443/v1/devices"
+    assert adapter.requests[0].headers["Authorization"] == "Bearer token"
+    assert adapter.requests[0].headers["Connection"] == "keep-alive"
+
+
+def test_context_manager_closes_session(
+    session_hub: Hub, adapter: FakeAdapter
+) -> None:
+    with session_hub as hub:
+        hub.get("/devices")
+    assert adapter.closed
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+from typing import Dict, Set, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Only loaded on first use, see dirigera/__init__.py and dirigera/devices/__init__.py
+LAZY_MODULES = [
+    "aiohttp",
+    "websocket",
+    "dirigera.hub.async_hub",
+    "dirigera.devices.device_factory",
+    "dirigera.devices.light",
+    "dirigera.devices.outlet",
+    "dirigera.devices.scene",
+]
+
+# Imported by the enable_* methods, warm_start and the bulk fetch, a plain Hub never loads them
+OPTIONAL_MODULES = [
+    "dirigera.hub.event_queue",
+    "dirigera.hub.write_behind",
+    "dirigera.hub.rate_limiter",
+    "dirigera.hub.keyed_executor",
+    "dirigera.hub.resilience",
+    "dirigera.hub.single_flight",
+    "dirigera.hub.snapshot",
+    "dirigera.hub.bulk_fetch",
+]
+
+# Self time of the dirigera modules, third party packages are not counted
+BUDGET_US = 250_000
+
+
+def run_imports(statement: str) -> Tuple[Set[str], Dict[str, int]]:
+    """
+    Runs the statement in a fresh interpreter with -X importtime. Returns the loaded modules and
+    the self time per module in microseconds, the latter misses modules loaded through importlib.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}; import sys; print(*sys.modules)"],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            times[module.strip()] = int(self_us)
+    return set(result.stdout.split()), times
+
+
+def test_hub_import_is_lazy_and_within_budget() -> None:
+    modules, times = run_imports("import dirigera; dirigera.Hub")
+    assert "dirigera.hub.hub" in modules
+    assert not [module for module in LAZY_MODULES if module in modules]
+    own = sum(us for module, us in times.items() if module.startswith("dirigera"))
+    assert own < BUDGET_US, f"dirigera modules took {own} us to import"
+
+
+def test_device_modules_load_on_first_use() -> None:
+    modules, _ = run_imports("import dirigera.devices as d; d.Outlet")
+    assert "dirigera.devices.outlet" in modules
+    assert "dirigera.devices.light" not in modules
+
+
+def test_optional_subsystems_load_when_enabled() -> None:
+    modules, _ = run_imports("import dirigera.hub.hub")
+    assert not [module for module in OPTIONAL_MODULES if module in modules]
+    modules, _ = run_imports(
+        "from dirigera.hub.hub import Hub; hub = Hub(token='token', ip_address='127.0.0.1'); "
+        "hub.enable_retries(); hub.enable_read_cache()"
+    )
+    assert "dirigera.hub.resilience" in modules
+    assert "dirigera.hub.single_flight" in modules
+    assert "dirigera.hub.write_behind" not in modules
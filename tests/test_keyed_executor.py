@@ -0,0 +1,150 @@
+import threading
+import time
+from typing import List, Tuple
+import pytest
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.keyed_executor import KeyedExecutor, Priority
+from src.dirigera.devices.device_factory import parse_devices
+from .test_hub import DEVICES, FakeAdapter
+
+
+def test_same_key_runs_in_submission_order() -> None:
+    executor = KeyedExecutor(max_workers=4)
+    order: List[int] = []
+
+    def task(index: int) -> int:
+        time.sleep(0.01 if index % 2 == 0 else 0)
+        order.append(index)
+        return index
+
+    futures = [executor.submit("light-1", task, index) for index in range(10)]
+    assert [future.result(timeout=5) for future in futures] == list(range(10))
+    assert order == list(range(10))
+    executor.shutdown()
+
+
+def test_different_keys_run_in_parallel() -> None:
+    executor = KeyedExecutor(max_workers=2)
+    barrier = threading.Barrier(2, timeout=5)
+    futures = [executor.submit(key, barrier.wait) for key in ("light-1", "light-2")]
+    assert sorted(future.result(timeout=5) for future in futures) == [0, 1]
+    executor.shutdown()
+
+
+def test_exceptions_and_shutdown() -> None:
+    executor = KeyedExecutor(max_workers=1)
+
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    failing = executor.submit("light-1", fail)
+    following = executor.submit("light-1", executor.in_worker)
+    with pytest.raises(RuntimeError):
+        failing.result(timeout=5)
+    assert following.result(timeout=5) is True
+    assert not executor.in_worker()
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        executor.submit("light-1", fail)
+    with pytest.raises(ValueError):
+        KeyedExecutor(max_workers=0)
+
+
+def test_hub_submit_patch_keeps_device_order() -> None:
+    adapter = FakeAdapter()
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    futures = [
+        hub.submit_patch(f"/devices/light-{index % 2}", [{"attributes": {"lightLevel": index}}])
+        for index in range(20)
+    ]
+    for future in futures:
+        future.result(timeout=5)
+    hub.patch("/devices/light-0", [{"attributes": {"lightLevel": 100}}])
+    sent: List[Tuple[str, bytes]] = [(x.path_url, x.body) for x in adapter.requests]  # type: ignore
+    for device in ("light-0", "light-1"):
+        levels = [body for path, body in sent if path == f"/v1/devices/{device}"]
+        expected = [index for index in range(20) if f"light-{index % 2}" == device]
+        if device == "light-0":
+            expected.append(100)
+        assert levels == [f'[{{"attributes": {{"lightLevel": {x}}}}}]'.encode() for x in expected]
+    hub.close()
+    assert hub.command_executor is None
+
+
+def test_priority_lanes_preempt_queued_commands() -> None:
+    executor = KeyedExecutor(max_workers=1)
+    started, gate = threading.Event(), threading.Event()
+    order: List[str] = []
+
+    def busy() -> None:
+        started.set()
+        gate.wait(5)
+
+    executor.submit("busy", busy)
+    assert started.wait(5)
+    for key in ("bulk-1", "bulk-2"):
+        executor.submit(key, order.append, key, priority=Priority.BACKGROUND)
+    executor.submit("shared", order.append, "shared-background", priority=Priority.BACKGROUND)
+    executor.submit("normal", order.append, "normal")
+    executor.submit("switch", order.append, "switch", priority=Priority.INTERACTIVE)
+    executor.submit("shared", order.append, "shared-interactive", priority=Priority.INTERACTIVE)
+    stats = executor.lane_stats()
+    assert stats[Priority.BACKGROUND].queued == 3
+    assert stats[Priority.INTERACTIVE].queued == 2
+    gate.set()
+    executor.shutdown()
+    assert order == [
+        "switch",
+        "shared-background",
+        "shared-interactive",
+        "normal",
+        "bulk-1",
+        "bulk-2",
+    ]
+    stats = executor.lane_stats()
+    assert stats[Priority.BACKGROUND].queued == 0
+    assert stats[Priority.BACKGROUND].completed == 3
+    assert stats[Priority.INTERACTIVE].completed == 2
+    assert stats[Priority.BACKGROUND].max_wait >= stats[Priority.INTERACTIVE].mean_wait > 0
+
+
+def test_hub_priority_context() -> None:
+    adapter = FakeAdapter()
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    with hub.priority(Priority.BACKGROUND):
+        hub.patch("/devices/light-1", [{"attributes": {"customName": "bulk"}}])
+    hub.patch("/devices/light-1", [{"attributes": {"isOn": True}}])
+    hub.submit_patch("/devices/light-1", [{"attributes": {"isOn": False}}], Priority.INTERACTIVE).result(5)
+    stats = hub.lane_stats()
+    assert stats[Priority.BACKGROUND].completed == 1
+    assert stats[Priority.NORMAL].completed == 1
+    assert stats[Priority.INTERACTIVE].completed == 1
+    assert len(adapter.requests) == 3
+    hub.close()
+
+
+def test_hub_priority_reaches_device_groups() -> None:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", FakeAdapter())
+    group = hub.device_group(parse_devices(DEVICES, hub)[:2])
+    with hub.priority(Priority.BACKGROUND):
+        assert group.set_on(False).ok
+    stats = hub.lane_stats()
+    assert stats[Priority.BACKGROUND].completed == 2
+    assert stats[Priority.NORMAL].completed == 0
+    hub.close()
+
+
+def test_reading_priority_state_does_not_create_executor() -> None:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", FakeAdapter())
+    stats = hub.lane_stats()
+    assert set(stats) == set(Priority)
+    assert all(x.queued == 0 and x.completed == 0 for x in stats.values())
+    with hub.priority(Priority.BACKGROUND):
+        pass
+    hub.patch("/devices/light-1", [{"attributes": {"isOn": True}}])
+    assert hub.command_executor is None
+    hub.close()
@@ -0,0 +1,59 @@
+from typing import Any, Dict
+import pytest
+from pydantic import ValidationError
+from src.dirigera.hub.abstract_smart_home_hub import FakeDirigeraHub
+from src.dirigera.devices.lazy_device import LazyDevice, dict_to_lazy_device
+from src.dirigera.devices.light import Light
+from .test_hub import CountingHub, DEVICES, device_dict
+
+
+@pytest.fixture(name="fake_client")
+def fixture_fake_client() -> FakeDirigeraHub:
+    return FakeDirigeraHub()
+
+
+@pytest.fixture(name="lazy_light")
+def fixture_lazy_light(fake_client: FakeDirigeraHub) -> LazyDevice:
+    return dict_to_lazy_device(DEVICES[0], fake_client)
+
+
+def test_cheap_fields_do_not_validate(lazy_light: LazyDevice) -> None:
+    assert lazy_light.id == "light-1"
+    assert lazy_light.type == "light"
+    assert lazy_light.device_type == "light"
+    assert lazy_light.custom_name == "name light-1"
+    assert lazy_light.is_reachable
+    assert lazy_light.relation_id is None
+    assert not lazy_light.is_validated
+
+
+def test_invalid_data_raises_on_first_model_access(
+    fake_client: FakeDirigeraHub,
+) -> None:
+    data: Dict[str, Any] = device_dict("light-2", "light", "light")
+    lazy = dict_to_lazy_device(data, fake_client)
+    assert lazy.id == "light-2"
+    with pytest.raises(ValidationError):
+        lazy.model()
+
+
+def test_model_built_once_and_delegated(
+    lazy_light: LazyDevice, fake_client: FakeDirigeraHub
+) -> None:
+    assert lazy_light.attributes.is_on
+    assert lazy_light.is_validated
+    model = lazy_light.model()
+    assert isinstance(model, Light)
+    assert lazy_light.model() is model
+    lazy_light.set_light(False)
+    assert fake_client.patch_actions[-1]["data"] == [{"attributes": {"isOn": False}}]
+    assert not model.attributes.is_on
+
+
+def test_hub_get_lazy_devices() -> None:
+    hub = CountingHub({"/devices": DEVICES})
+    devices = hub.get_lazy_devices()
+    assert [device.id for device in devices] == [d["id"] for d in DEVICES]
+    assert not any(device.is_validated for device in devices)
+    sensors = hub.get_lazy_devices(type_="sensor", device_type="motionSensor")
+    assert [device.id for device in sensors] == ["motion-1"]
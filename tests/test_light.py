@@ -328,3 +328,44 @@ def test_dict_to_light_3rdparty(fake_client: FakeDirigeraHub) -> None:
     assert light.attributes.model == data["attributes"]["model"]
     assert light.attributes.manufacturer == data["attributes"]["manufacturer"]
     assert light.attributes.serial_number == data["attributes"]["serialNumber"]
+
+
+def test_batch_sends_single_patch(
+    fake_light: Light, fake_client: FakeDirigeraHub
+) -> None:
+    with fake_light.batch() as light:
+        light.set_light(True)
+        light.set_light_level(80)
+        light.set_color_temperature(2500)
+        assert not fake_client.patch_actions
+        assert not light.attributes.is_on
+    assert fake_client.patch_actions == [
+        {
+            "route": f"/devices/{fake_light.id}",
+            "data": [
+                {
+                    "attributes": {
+                        "isOn": True,
+                        "lightLevel": 80,
+                        "colorTemperature": 2500,
+                    }
+                }
+            ],
+        }
+    ]
+    assert fake_light.attributes.is_on
+    assert fake_light.attributes.light_level == 80
+    assert fake_light.attributes.color_temperature == 2500
+
+
+def test_batch_discarded_on_error(
+    fake_light: Light, fake_client: FakeDirigeraHub
+) -> None:
+    with pytest.raises(ValueError):
+        with fake_light.batch():
+            fake_light.set_light(True)
+            fake_light.set_light_level(200)
+    assert not fake_client.patch_actions
+    assert not fake_light.attributes.is_on
+    fake_light.set_light(True)
+    assert len(fake_client.patch_actions) == 1
@@ -0,0 +1,86 @@
+import time
+import pytest
+import requests
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.rate_limiter import AdaptiveRateLimiter, TokenBucket
+from src.dirigera.hub.resilience import DeadlineExceeded, deadline
+from .test_hub import FakeAdapter
+
+
+def test_token_bucket_paces_after_burst() -> None:
+    bucket = TokenBucket(rate=20, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.05, abs=0.01)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.08
+
+
+def test_token_bucket_invalid_rate() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_additive_increase_multiplicative_decrease() -> None:
+    limiter = AdaptiveRateLimiter(rate=10, min_rate=2, max_rate=12, increase=10, cooldown=60)
+    limiter.record(0.01, 200)
+    assert limiter.rate == pytest.approx(11)
+    for _ in range(10):
+        limiter.record(0.01, 200)
+    assert limiter.rate == 12
+    limiter.record(0.01, 503)
+    assert limiter.rate == 6
+    limiter.record(0.01, 429)
+    assert limiter.rate == 6
+    limiter.cooldown = 0
+    limiter.record(5.0, 200)
+    assert limiter.rate == 3
+    limiter.record(0.01, None)
+    assert limiter.rate == 2
+
+
+def test_adaptive_rate_limiter_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveRateLimiter(rate=100, max_rate=50)
+    with pytest.raises(ValueError):
+        AdaptiveRateLimiter(decrease=1)
+
+
+def test_hub_uses_separate_buckets() -> None:
+    adapter = FakeAdapter()
+    session_hub = Hub(token="token", ip_address="127.0.0.1")
+    session_hub.session.mount("https://", adapter)
+    assert session_hub.rate_limits() == {"read": None, "write": None}
+    session_hub.enable_rate_limiter(
+        read_limiter=AdaptiveRateLimiter(rate=10, max_rate=100),
+        write_limiter=AdaptiveRateLimiter(rate=10, max_rate=100),
+    )
+    session_hub.get("/devices")
+    limits = session_hub.rate_limits()
+    assert limits["read"] is not None and limits["read"] > 10
+    assert limits["write"] == 10
+    adapter.status_code = 503
+    with pytest.raises(requests.HTTPError):
+        session_hub.patch("/devices/light-1", [{"attributes": {"isOn": True}}])
+    assert session_hub.rate_limits()["write"] == 5
+    session_hub.disable_rate_limiter()
+    assert session_hub.rate_limits() == {"read": None, "write": None}
+
+
+def test_rate_limiter_respects_deadline() -> None:
+    adapter = FakeAdapter()
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    hub.enable_rate_limiter(read_limiter=AdaptiveRateLimiter(rate=1, min_rate=1, burst=1))
+    hub.get("/devices")
+    started = time.monotonic()
+    with deadline(0.1):
+        with pytest.raises(DeadlineExceeded):
+            hub.get("/scenes")
+    assert time.monotonic() - started < 0.1
+    assert len(adapter.requests) == 1
+    bucket = TokenBucket(rate=10, burst=1)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0.01)
+    assert bucket.acquire(timeout=0.2)
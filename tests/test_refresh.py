@@ -0,0 +1,57 @@
+import asyncio
+import copy
+from src.dirigera.hub.abstract_smart_home_hub import FakeAsyncDirigeraHub, FakeDirigeraHub
+from src.dirigera.devices.light import Light, dict_to_light
+from src.dirigera.devices.scene import dict_to_scene
+from .test_hub import device_dict
+
+SCENE = {
+    "id": "scene-1",
+    "type": "userScene",
+    "info": {"name": "Night", "icon": "scenes_moon"},
+    "triggers": [],
+    "actions": [],
+    "createdAt": "2023-01-07T20:07:19.000Z",
+    "commands": [],
+    "undoAllowedDuration": 30,
+}
+
+
+def test_refresh_updates_in_place() -> None:
+    client = FakeDirigeraHub()
+    data = device_dict("light-1", "light", "light", isOn=True, lightLevel=10)
+    light = dict_to_light(data, client)
+    room = light.room
+    changed = copy.deepcopy(data)
+    changed["isReachable"] = False
+    changed["lastSeen"] = "2023-10-28T04:45:00.000Z"
+    changed["attributes"]["lightLevel"] = 80
+    client.get_action_replys["/devices/light-1"] = changed
+    assert light.refresh() == {"is_reachable", "last_seen", "attributes.light_level"}
+    assert light.is_reachable is False
+    assert light.attributes.light_level == 80
+    assert light.room is room
+    assert light.refresh() == set()
+
+
+def test_async_refresh() -> None:
+    client = FakeAsyncDirigeraHub()
+    data = device_dict("light-1", "light", "light", isOn=True)
+    light = Light(dirigeraClient=client, **data)
+    changed = copy.deepcopy(data)
+    changed["attributes"]["isOn"] = False
+    client.get_action_replys["/devices/light-1"] = changed
+    assert asyncio.run(light.async_refresh()) == {"attributes.is_on"}
+    assert light.attributes.is_on is False
+
+
+def test_scene_refresh() -> None:
+    client = FakeDirigeraHub()
+    scene = dict_to_scene(SCENE, client)
+    client.get_action_replys["/scenes/scene-1"] = {
+        **SCENE,
+        "lastTriggered": "2023-10-28T04:45:00.000Z",
+        "info": {"name": "Late night", "icon": "scenes_moon"},
+    }
+    assert scene.refresh() == {"last_triggered", "info"}
+    assert scene.info.name == "Late night"
@@ -0,0 +1,147 @@
+import time
+from typing import Any, List, Optional, Union
+import pytest
+import requests
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    RetryPolicy,
+    deadline,
+    remaining_time,
+    request_timeout,
+)
+from .test_hub import FakeAdapter
+
+
+class FlakyAdapter(FakeAdapter):
+    """
+    Answers with the queued outcomes (status code or exception) first, then with 200
+    """
+
+    def __init__(self, outcomes: Optional[List[Union[int, Exception]]] = None) -> None:
+        super().__init__()
+        self.outcomes = outcomes or []
+        self.timeouts: List[Any] = []
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        self.timeouts.append(kwargs.get("timeout"))
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, int):
+            self.status_code = outcome
+            return super().send(request, *args, **kwargs)
+        self.requests.append(request)
+        raise outcome  # pylint: disable=raising-bad-type
+
+
+def flaky_hub(outcomes: List[Union[int, Exception]]) -> Hub:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", FlakyAdapter(outcomes))
+    return hub
+
+
+def adapter_of(hub: Hub) -> FlakyAdapter:
+    adapter = hub.session.get_adapter(hub.api_base_url)
+    assert isinstance(adapter, FlakyAdapter)
+    return adapter
+
+
+def test_deadline_nesting() -> None:
+    assert remaining_time() is None
+    assert request_timeout(10) == 10
+    with deadline(5):
+        with deadline(60):
+            remaining = remaining_time()
+            assert remaining is not None and remaining <= 5
+        assert request_timeout(10) <= 5
+        assert request_timeout(1) == 1
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            request_timeout(10)
+
+
+def test_retries_idempotent_requests() -> None:
+    hub = flaky_hub([503, requests.ConnectionError("reset"), 200])
+    hub.enable_retries(RetryPolicy(attempts=3, initial_delay=0.001, max_delay=0.001))
+    assert hub.get("/devices") == {"method": "GET"}
+    assert len(adapter_of(hub).requests) == 3
+
+
+def test_gives_up_after_attempts_and_skips_post() -> None:
+    hub = flaky_hub([503, 503, 503])
+    hub.enable_retries(RetryPolicy(attempts=2, initial_delay=0.001, max_delay=0.001))
+    with pytest.raises(requests.HTTPError):
+        hub.patch("/devices/light-1", [{"attributes": {"isOn": True}}])
+    assert len(adapter_of(hub).requests) == 2
+    with pytest.raises(requests.HTTPError):
+        hub.post("/scenes/scene-1/trigger")
+    assert len(adapter_of(hub).requests) == 3
+
+
+def test_retry_respects_deadline() -> None:
+    hub = flaky_hub([503, 503])
+    hub.enable_retries(RetryPolicy(attempts=3, initial_delay=1, max_delay=1))
+    with deadline(0.5):
+        with pytest.raises(requests.HTTPError):
+            hub.get("/devices")
+    assert len(adapter_of(hub).requests) == 1
+    assert adapter_of(hub).timeouts[0] <= 0.5
+
+
+def test_deadline_propagates_through_group() -> None:
+    hub = flaky_hub([])
+    result = hub.device_group(["light-1", "light-2"]).set_on(True, timeout=2)
+    assert result.ok
+    timeouts = adapter_of(hub).timeouts
+    assert len(timeouts) == 2
+    assert all(timeout <= 2 for timeout in timeouts)
+    hub.get("/devices")
+    assert adapter_of(hub).timeouts[-1] == 10
+
+
+def test_circuit_breaker_fails_fast_and_recovers() -> None:
+    outcomes: List[Union[int, Exception]] = [requests.ConnectionError("down")] * 2
+    hub = flaky_hub(outcomes + [503, 503])
+    breaker = hub.enable_circuit_breaker(CircuitBreaker(failure_threshold=2, reset_timeout=0.01))
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            hub.get("/devices")
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        hub.get("/devices")
+    assert len(adapter_of(hub).requests) == 2
+    deadline_at = time.monotonic() + 5
+    while breaker.is_open and time.monotonic() < deadline_at:
+        time.sleep(0.01)
+    assert not breaker.is_open
+    probes = [x.path_url for x in adapter_of(hub).requests[2:]]
+    assert probes == ["/v1/hub/status"] * 3
+    assert hub.get("/devices") == {"method": "GET"}
+    hub.close()
+    assert hub.circuit_breaker is None
+
+
+def test_circuit_breaker_recovers_after_stop() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01, probe=lambda: True)
+    breaker.stop()
+    breaker.record_failure()
+    assert breaker.is_open
+    deadline_at = time.monotonic() + 5
+    while breaker.is_open and time.monotonic() < deadline_at:
+        time.sleep(0.01)
+    assert not breaker.is_open
+
+
+def test_circuit_breaker_stopped_while_open_probes_again() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05, probe=lambda: True)
+    breaker.record_failure()
+    breaker.stop()
+    time.sleep(0.1)
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    deadline_at = time.monotonic() + 5
+    while breaker.is_open and time.monotonic() < deadline_at:
+        time.sleep(0.01)
+    assert not breaker.is_open
@@ -0,0 +1,119 @@
+import json
+from typing import Any, Dict, List
+import pytest
+from src.dirigera.hub.device_cache import DeviceCache
+from src.dirigera.hub.events import HubEvent
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.resync import RESYNC_SOURCE, Backoff, diff_devices
+from .test_hub import DEVICES, CountingHub, FakeAdapter, device_dict
+
+
+def test_backoff_grows_until_maximum_and_resets() -> None:
+    backoff = Backoff(initial=1, maximum=5, factor=2, jitter=0)
+    assert [backoff.next_delay() for _ in range(5)] == [1, 2, 4, 5, 5]
+    backoff.reset()
+    assert backoff.next_delay() == 1
+
+
+def test_backoff_jitter_stays_in_range() -> None:
+    backoff = Backoff(initial=10, maximum=10, jitter=0.5)
+    assert all(5 <= backoff.next_delay() <= 10 for _ in range(100))
+
+
+def test_backoff_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        Backoff(initial=0)
+    with pytest.raises(ValueError):
+        Backoff(initial=10, maximum=5)
+    with pytest.raises(ValueError):
+        Backoff(jitter=2)
+
+
+def test_diff_devices() -> None:
+    current = [
+        {**device_dict("light-1", "light", "light", isOn=False), "lastSeen": "2023-10-29T00:00:00.000Z"},
+        DEVICES[1],
+        {**DEVICES[2], "isReachable": False},
+        device_dict("light-2", "light", "light", isOn=True),
+    ]
+    events = diff_devices(DEVICES, current)
+    assert [(x["type"], x["data"]["id"]) for x in events] == [
+        ("deviceStateChanged", "light-1"),
+        ("deviceStateChanged", "motion-1"),
+        ("deviceAdded", "light-2"),
+        ("deviceRemoved", "speaker-1"),
+    ]
+    assert events[0]["data"]["attributes"] == {"isOn": False}
+    assert "lastSeen" not in events[0]["data"]
+    assert events[1]["data"]["isReachable"] is False
+    assert events[1]["data"]["attributes"] == {}
+    assert all(x["source"] == RESYNC_SOURCE for x in events)
+    assert not diff_devices(DEVICES, DEVICES)
+
+
+class ReconnectingWebSocketApp:
+    """
+    Opens, delivers nothing and drops the connection, the given hub is stopped on the third connection
+    """
+
+    connections = 0
+
+    def __init__(self, _url: str, hub: CountingHub, **kwargs: Any) -> None:
+        self.hub = hub
+        self.on_open = kwargs["on_open"]
+
+    def run_forever(self, **kwargs: Any) -> None:
+        assert kwargs["reconnect"] == 0
+        ReconnectingWebSocketApp.connections += 1
+        if ReconnectingWebSocketApp.connections == 2:
+            self.hub.replies["/devices"] = [
+                device_dict("light-1", "light", "light", isOn=False),
+                *DEVICES[1:],
+            ]
+        self.on_open(self)
+        if ReconnectingWebSocketApp.connections == 3:
+            self.hub.stop_event_listener()
+
+    def close(self) -> None:
+        pass
+
+
+def test_reconnect_resyncs_missed_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    hub = CountingHub({"/devices": DEVICES})
+    monkeypatch.setattr(
+        "websocket.WebSocketApp",
+        lambda url, **kwargs: ReconnectingWebSocketApp(url, hub, **kwargs),
+    )
+    ReconnectingWebSocketApp.connections = 0
+    events: List[HubEvent] = []
+    messages: List[Dict[str, Any]] = []
+    opened: List[Any] = []
+    hub.events.subscribe(events.append)
+    hub.create_event_listener(
+        on_open=opened.append,
+        on_message=lambda _ws, message: messages.append(json.loads(message)),
+        backoff=Backoff(initial=0.001, maximum=0.001),
+    )
+    assert ReconnectingWebSocketApp.connections == 3
+    assert len(opened) == 3
+    assert hub.get_routes == ["/devices"] * 3
+    assert [(x.type, x.device_id, x.attributes) for x in events] == [
+        ("deviceStateChanged", "light-1", {"isOn": False})
+    ]
+    assert messages[0]["source"] == RESYNC_SOURCE
+
+
+def test_resync_bypasses_read_cache() -> None:
+    adapter = FakeAdapter({"/v1/devices": DEVICES})
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", adapter)
+    hub.enable_read_cache(ttl=60)
+    hub.get("/devices")
+    hub._known_devices = DeviceCache(max_age=None)  # pylint: disable=protected-access
+    hub._resync(None, None)  # pylint: disable=protected-access
+    adapter.replies["/v1/devices"] = [device_dict("light-1", "light", "light", isOn=False), *DEVICES[1:]]
+    messages: List[Dict[str, Any]] = []
+    hub._resync(None, lambda _ws, message: messages.append(json.loads(message)))  # pylint: disable=protected-access
+    assert len(adapter.requests) == 3
+    assert [(x["type"], x["data"]["id"]) for x in messages] == [("deviceStateChanged", "light-1")]
+    assert hub.get("/devices")[0]["attributes"]["isOn"] is False
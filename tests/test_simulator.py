@@ -0,0 +1,119 @@
+import queue
+import time
+from typing import Iterator
+import pytest
+import requests
+from src.dirigera.hub import auth
+from src.dirigera.hub.events import EventType, HubEvent
+from src.dirigera.hub import simulator as simulator_module
+from src.dirigera.hub.simulator import HubSimulator, simulator_ssl_context
+from src.dirigera.devices.scene import Action, ActionAttributes, Info, Trigger
+from .test_hub import DEVICES
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator() -> Iterator[HubSimulator]:
+    with HubSimulator(DEVICES) as simulator:
+        yield simulator
+
+
+def test_patch_changes_state_and_emits_event(simulator: HubSimulator) -> None:
+    hub = simulator.create_hub()
+    events: "queue.Queue[HubEvent]" = queue.Queue()
+    hub.events.subscribe(events.put, event_type=EventType.DEVICE_STATE_CHANGED)
+    hub.start_event_listener()
+    try:
+        deadline = time.monotonic() + 5
+        while not simulator.listeners:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        light = hub.get_light_by_id("light-1")
+        light.set_light(False)
+        assert simulator.device("light-1")["attributes"]["isOn"] is False
+        assert hub.get_light_by_id("light-1").attributes.is_on is False
+        event = events.get(timeout=5)
+        assert event.data["id"] == "light-1"
+        assert event.data["attributes"] == {"isOn": False}
+    finally:
+        hub.stop_event_listener()
+        hub.close()
+
+
+def test_rejects_unknown_device_and_attribute(simulator: HubSimulator) -> None:
+    hub = simulator.create_hub()
+    with pytest.raises(requests.HTTPError) as error:
+        hub.patch("/devices/unknown", [{"attributes": {"isOn": True}}])
+    assert error.value.response.status_code == 404
+    with pytest.raises(requests.HTTPError) as error:
+        hub.patch("/devices/light-1", [{"attributes": {"lightLevel": 10}}])
+    assert error.value.response.status_code == 400
+
+
+def test_scenes(simulator: HubSimulator) -> None:
+    hub = simulator.create_hub()
+    scene = hub.create_scene(
+        Info(name="Night", icon="scenes_moon"),
+        triggers=[Trigger(type="app", disabled=False)],
+        actions=[Action(id="outlet-1", type="device", enabled=True, attributes=ActionAttributes(is_on=True))],
+    )
+    assert [x.id for x in hub.get_scenes()] == [scene.id]
+    scene.trigger()
+    assert simulator.device("outlet-1")["attributes"]["isOn"] is True
+    hub.delete_scene(scene.id)
+    assert not hub.get_scenes()
+
+
+def test_oauth_flow(simulator: HubSimulator) -> None:
+    verifier = auth.random_code(auth.ALPHABET, auth.CODE_LENGTH)
+    code = auth.send_challenge(simulator.host, verifier, port=simulator.port)
+    assert auth.get_token(simulator.host, code, verifier, port=simulator.port) == simulator.token
+    code = auth.send_challenge(simulator.host, verifier, port=simulator.port)
+    with pytest.raises(requests.HTTPError):
+        auth.get_token(simulator.host, code, verifier[1:], port=simulator.port)
+
+
+def test_wrong_token(simulator: HubSimulator) -> None:
+    hub = simulator.create_hub()
+    hub.token = "wrong"
+    with pytest.raises(requests.HTTPError) as error:
+        hub.get_lights()
+    assert error.value.response.status_code == 401
+    assert simulator.stats.unauthorized == 1
+
+
+def test_latency_and_errors() -> None:
+    with HubSimulator(DEVICES, latency=0.05, error_rate=1) as simulator:
+        hub = simulator.create_hub()
+        started = time.monotonic()
+        with pytest.raises(requests.HTTPError) as error:
+            hub.get("/devices")
+        assert time.monotonic() - started >= 0.05
+        assert error.value.response.status_code == 503
+        assert simulator.stats.injected_errors == 1
+
+
+def test_connection_limit() -> None:
+    with HubSimulator(DEVICES, max_connections=1) as simulator:
+        first, second = simulator.create_hub(), simulator.create_hub()
+        assert len(first.get("/devices")) == len(DEVICES)
+        with pytest.raises(requests.HTTPError) as error:
+            second.get("/devices")
+        assert error.value.response.status_code == 503
+        assert simulator.stats.rejected_connections == 1
+        first.close()
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                assert len(second.get("/devices")) == len(DEVICES)
+                break
+            except requests.HTTPError:
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+
+
+def test_certificate_requires_cryptography_or_openssl(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(simulator_module, "_write_certificate_cryptography", lambda *_: False)
+    assert simulator_ssl_context("192.168.1.2") is not None
+    monkeypatch.setattr(simulator_module.shutil, "which", lambda _: None)
+    with pytest.raises(ImportError):
+        simulator_ssl_context()
@@ -0,0 +1,139 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+import pytest
+import requests
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.resilience import DeadlineExceeded, deadline
+from src.dirigera.hub.single_flight import ReadCache, SingleFlight, routes_overlap
+from .test_hub import DEVICES, FakeAdapter
+
+
+class GatedAdapter(FakeAdapter):
+    """
+    Holds GET requests until the gate is opened
+    """
+
+    def __init__(self) -> None:
+        super().__init__({"/v1/devices": DEVICES})
+        self.gate = threading.Event()
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        if request.method == "GET":
+            self.gate.wait(5)
+        return super().send(request, *args, **kwargs)
+
+
+def gated_hub() -> Hub:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", GatedAdapter())
+    return hub
+
+
+def adapter_of(hub: Hub) -> GatedAdapter:
+    adapter = hub.session.get_adapter(hub.api_base_url)
+    assert isinstance(adapter, GatedAdapter)
+    return adapter
+
+
+def get_routes(hub: Hub) -> List[str]:
+    return [x.path_url for x in adapter_of(hub).requests if x.method == "GET"]
+
+
+def test_routes_overlap() -> None:
+    assert routes_overlap("/devices", "/devices/light-1")
+    assert routes_overlap("/devices/set/group-1", "/devices/light-1")
+    assert not routes_overlap("/devices", "/scenes")
+
+
+def test_concurrent_gets_share_one_request() -> None:
+    hub = gated_hub()
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        futures = [pool.submit(hub.get_lights) for _ in range(12)]
+        time.sleep(0.1)
+        adapter_of(hub).gate.set()
+        results = [future.result(timeout=5) for future in futures]
+    assert get_routes(hub) == ["/v1/devices"]
+    assert all(len(lights) == 1 for lights in results)
+    hub.get("/devices")
+    assert len(get_routes(hub)) == 2
+
+
+def test_joining_caller_respects_deadline() -> None:
+    hub = gated_hub()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(hub.get, "/devices")
+        time.sleep(0.05)
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceeded):
+                hub.get("/devices")
+        adapter_of(hub).gate.set()
+        assert leader.result(timeout=5) == DEVICES
+
+
+def test_failure_is_shared_and_not_kept() -> None:
+    flight = SingleFlight()
+    calls: List[int] = []
+
+    def fail() -> None:
+        calls.append(1)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: 42) == 42
+    assert calls == [1]
+
+
+def test_deadline_of_leader_is_not_shared() -> None:
+    flight = SingleFlight()
+    gate = threading.Event()
+
+    def leader_call() -> None:
+        gate.wait(5)
+        raise DeadlineExceeded("Deadline exceeded")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", leader_call, None, (DeadlineExceeded,))
+        time.sleep(0.05)
+        joiner = pool.submit(flight.do, "key", lambda: 42, None, (DeadlineExceeded,))
+        time.sleep(0.05)
+        gate.set()
+        assert joiner.result(timeout=5) == 42
+        with pytest.raises(DeadlineExceeded):
+            leader.result(timeout=5)
+
+
+def test_read_cache_invalidated_by_writes() -> None:
+    hub = gated_hub()
+    adapter_of(hub).gate.set()
+    hub.enable_read_cache(ttl=60)
+    hub.get("/devices")
+    hub.get("/devices")
+    hub.get("/scenes")
+    assert get_routes(hub) == ["/v1/devices", "/v1/scenes"]
+    hub.patch("/devices/light-1", [{"attributes": {"isOn": True}}])
+    hub.get("/devices")
+    hub.get("/scenes")
+    assert get_routes(hub) == ["/v1/devices", "/v1/scenes", "/v1/devices"]
+    hub.delete("/scenes/scene-1")
+    hub.get("/scenes")
+    assert get_routes(hub) == ["/v1/devices", "/v1/scenes", "/v1/devices", "/v1/scenes"]
+    hub.disable_read_cache()
+    hub.get("/devices")
+    assert len(get_routes(hub)) == 5
+
+
+def test_read_cache_expiry_and_stale_put() -> None:
+    cache = ReadCache(ttl=0.05)
+    generation = cache.generation
+    cache.invalidate("/devices/light-1")
+    cache.put("/devices", DEVICES, generation)
+    assert cache.get("/devices") is None
+    cache.put("/devices", DEVICES, cache.generation)
+    assert cache.get("/devices") is DEVICES
+    time.sleep(0.06)
+    assert cache.get("/devices") is None
+    with pytest.raises(ValueError):
+        ReadCache(ttl=0)
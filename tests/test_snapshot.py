@@ -0,0 +1,99 @@
+import copy
+import json
+import time
+from pathlib import Path
+from typing import Any, List
+import pytest
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.snapshot import load_snapshot, save_snapshot
+from src.dirigera.devices.light import Light
+from .test_hub import DEVICES, FakeAdapter
+from .test_refresh import SCENE
+
+
+def snapshot_hub(devices: List[Any]) -> Hub:
+    hub = Hub(token="token", ip_address="127.0.0.1")
+    hub.session.mount("https://", FakeAdapter({"/v1/devices": devices, "/v1/scenes": [SCENE]}))
+    return hub
+
+
+def requested(hub: Hub) -> List[str]:
+    adapter = hub.session.get_adapter(hub.api_base_url)
+    assert isinstance(adapter, FakeAdapter)
+    return [x.path_url for x in adapter.requests if x.method == "GET"]
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    path = str(tmp_path / "snapshot.json")
+    save_snapshot(path, DEVICES, [SCENE])
+    snapshot = load_snapshot(path)
+    assert snapshot is not None
+    assert snapshot.lookup("/devices") == DEVICES
+    assert snapshot.lookup("/devices/outlet-1") == DEVICES[1]
+    assert snapshot.lookup("/scenes/scene-1") == SCENE
+    assert snapshot.lookup("/devices/unknown") is None
+    assert snapshot.lookup("/hub/status") is None
+    snapshot.invalidate("/devices/light-1")
+    assert snapshot.lookup("/devices") is None
+    assert snapshot.lookup("/scenes") == [SCENE]
+    assert [x.name for x in tmp_path.iterdir()] == ["snapshot.json"]
+
+
+def test_unusable_snapshots(tmp_path: Path) -> None:
+    assert load_snapshot(str(tmp_path / "missing.json")) is None
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+    assert load_snapshot(str(broken)) is None
+    broken.write_text(json.dumps({"version": 0}), encoding="utf-8")
+    assert load_snapshot(str(broken)) is None
+    assert snapshot_hub(DEVICES).warm_start(str(broken)) is None
+
+
+def test_warm_start_serves_snapshot_without_requests(tmp_path: Path) -> None:
+    path = str(tmp_path / "snapshot.json")
+    snapshot_hub(DEVICES).save_snapshot(path)
+    hub = snapshot_hub(DEVICES)
+    assert hub.warm_start(path, refresh=False) is None
+    light = hub.get_light_by_id("light-1")
+    assert isinstance(light, Light)
+    assert [x.info.name for x in hub.get_scenes()] == ["Night"]
+    assert hub.fleet_size == len(DEVICES)
+    assert not requested(hub)
+    hub.patch("/devices/light-1", [{"attributes": {"isOn": False}}])
+    hub.get_lights()
+    assert requested(hub) == ["/v1/devices"]
+
+
+def test_warm_start_reconciles_in_background(tmp_path: Path) -> None:
+    path = str(tmp_path / "snapshot.json")
+    save_snapshot(path, DEVICES, [SCENE])
+    current = copy.deepcopy(DEVICES[:3])
+    current[0]["attributes"]["isOn"] = False
+    hub = snapshot_hub(current)
+    received: List[Any] = []
+    hub.events.subscribe(received.append)
+    future = hub.warm_start(path)
+    assert future is not None
+    events = future.result(timeout=5)
+    assert [x["type"] for x in events] == ["deviceStateChanged", "deviceRemoved"]
+    assert len(received) == 2
+    assert hub.snapshot is None
+    snapshot = load_snapshot(path)
+    assert snapshot is not None and snapshot.lookup("/devices") == current
+
+
+def test_warm_start_max_age(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = str(tmp_path / "snapshot.json")
+    save_snapshot(path, DEVICES, [SCENE])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert load_snapshot(path, max_age=60) is None
+    assert snapshot_hub(DEVICES).warm_start(path, refresh=False, max_age=60) is None
+    hub = snapshot_hub(DEVICES)
+    assert hub.warm_start(path, refresh=False, max_age=180) is None
+    hub.get_lights()
+    assert not requested(hub)
+    monkeypatch.setattr(time, "time", lambda: now + 200)
+    hub.get_lights()
+    assert requested(hub) == ["/v1/devices"]
+    assert hub.snapshot is None
@@ -1,4 +1,4 @@
-from src.dirigera.hub.utils import camelize_dict
+from src.dirigera.hub.utils import camelize_dict, snake_case_dict
 
 
 def test_camelize_dict() -> None:
@@ -21,3 +21,33 @@ def test_camelize_dict() -> None:
     assert result["keyB"]["keyBB"]["keyBBA"] == data["key_b"]["key_b_b"]["key_b_b_a"]
     assert "keyBBB" in result["keyB"]["keyBB"]
     assert result["keyB"]["keyBB"]["keyBBB"] == data["key_b"]["key_b_b"]["key_b_b_b"]
+
+
+def test_camelize_dict_lists() -> None:
+    data = [{"key_a": [{"key_b": 1}, [{"key_c": None}], "x_y"]}, "a_b", 3]
+    assert camelize_dict(data) == [
+        {"keyA": [{"keyB": 1}, [{"keyC": None}], "x_y"]},
+        "a_b",
+        3,
+    ]
+
+
+def test_camelize_dict_does_not_mutate_input() -> None:
+    data = {"key_a": {"key_b": [1, 2]}}
+    result = camelize_dict(data)
+    assert data == {"key_a": {"key_b": [1, 2]}}
+    assert isinstance(result, dict)
+    assert result["keyA"]["keyB"] is not data["key_a"]["key_b"]
+
+
+def test_snake_case_dict_inverts_camelize_dict() -> None:
+    data = {
+        "color_temperature": 2700,
+        "current_p_m25": 3,
+        "end_trigger_event": {"trigger": {"days": ["Mon"]}},
+        "actions": [{"device_id": "1", "is_on": True}],
+    }
+    camel = camelize_dict(data)
+    assert isinstance(camel, dict)
+    assert camel["currentPM25"] == 3
+    assert snake_case_dict(camel) == data
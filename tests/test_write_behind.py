@@ -0,0 +1,119 @@
+import threading
+import time
+from typing import Any, Dict, List
+import pytest
+from src.dirigera.devices.light import dict_to_light
+from src.dirigera.hub.hub import Hub
+from src.dirigera.hub.write_behind import WriteBehind
+from .test_hub import device_dict
+
+
+class GatedHub(Hub):
+    """
+    Records PATCH requests, each one waits until the gate is open
+    """
+
+    def __init__(self) -> None:
+        super().__init__(token="token", ip_address="127.0.0.1")
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self.patches: List[Dict[str, Any]] = []
+        self.patch_times: List[float] = []
+        self.error: Exception = Exception()
+        self.fail = False
+
+    def patch(self, route: str, data: List[Dict[str, Any]]) -> None:
+        self.started.set()
+        self.gate.wait(5)
+        self.patches.append({"route": route, "attributes": data[0]["attributes"]})
+        self.patch_times.append(time.monotonic())
+        if self.fail:
+            raise self.error
+
+
+@pytest.fixture(name="hub")
+def fixture_hub() -> GatedHub:
+    return GatedHub()
+
+
+def test_coalesces_while_in_flight(hub: GatedHub) -> None:
+    write_behind = WriteBehind(hub, max_rate=1000)
+    hub.gate.clear()
+    first = write_behind.submit("light-1", {"lightLevel": 10})
+    assert hub.started.wait(5)
+    later = [write_behind.submit("light-1", {"lightLevel": level}) for level in (20, 30, 40)]
+    later.append(write_behind.submit("light-1", {"colorTemperature": 3000}))
+    assert write_behind.pending("light-1") == {"lightLevel": 40, "colorTemperature": 3000}
+    hub.gate.set()
+    assert write_behind.flush(timeout=5)
+    assert hub.patches == [
+        {"route": "/devices/light-1", "attributes": {"lightLevel": 10}},
+        {"route": "/devices/light-1", "attributes": {"lightLevel": 40, "colorTemperature": 3000}},
+    ]
+    assert first.result(timeout=5) is None
+    assert all(future.result(timeout=5) is None for future in later)
+    write_behind.close()
+
+
+def test_max_rate_per_device(hub: GatedHub) -> None:
+    write_behind = WriteBehind(hub, max_rate=20)
+    write_behind.submit("light-1", {"lightLevel": 10}).result(timeout=5)
+    write_behind.submit("light-2", {"lightLevel": 10}).result(timeout=5)
+    write_behind.submit("light-1", {"lightLevel": 20}).result(timeout=5)
+    assert hub.patch_times[1] - hub.patch_times[0] < 0.05
+    assert hub.patch_times[2] - hub.patch_times[0] >= 0.045
+    write_behind.close()
+
+
+def test_failed_write_sets_exception(hub: GatedHub) -> None:
+    hub.fail = True
+    hub.error = RuntimeError("hub unavailable")
+    write_behind = WriteBehind(hub)
+    future = write_behind.submit("light-1", {"isOn": True})
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+    write_behind.close()
+    with pytest.raises(AssertionError):
+        write_behind.submit("light-1", {"isOn": True})
+
+
+def test_light_setters_with_write_behind(hub: GatedHub) -> None:
+    light = dict_to_light(
+        device_dict("light-1", "light", "light", isOn=False, lightLevel=1),
+        hub,
+    )
+    light.capabilities.can_receive.append("lightLevel")
+    hub.enable_write_behind(max_rate=1000)
+    hub.gate.clear()
+    light.set_light(True)
+    assert hub.started.wait(5)
+    for level in range(2, 50):
+        light.set_light_level(level)
+    assert light.last_write is not None
+    assert not light.last_write.done()
+    assert light.attributes.light_level == 1
+    hub.gate.set()
+    light.last_write.result(timeout=5)
+    assert light.attributes.is_on
+    assert light.attributes.light_level == 49
+    assert len(hub.patches) == 2
+    hub.close()
+    assert hub.write_behind is None
+    light.set_light(False)
+    assert len(hub.patches) == 3
+
+
+def test_close_cancels_writes_left_after_timeout(hub: GatedHub) -> None:
+    write_behind = WriteBehind(hub, max_rate=1000)
+    hub.gate.clear()
+    first = write_behind.submit("light-1", {"lightLevel": 10})
+    assert hub.started.wait(5)
+    later = write_behind.submit("light-1", {"lightLevel": 20})
+    started = time.monotonic()
+    write_behind.close(timeout=0.05)
+    assert time.monotonic() - started < 1
+    assert later.cancelled()
+    hub.gate.set()
+    assert first.result(timeout=5) is None
+    assert hub.patches == [{"route": "/devices/light-1", "attributes": {"lightLevel": 10}}]